@@ -0,0 +1,74 @@
+# compares the former per-row timestamp_gps conversion (map_elements + datetime.fromtimestamp)
+# with the vectorized epoch_to_datetime path on a full AirUp sensor directory
+#
+# usage: python -m benchmarks.bench_airup_timestamps [--base-path .] [--dataset AIRUP_SONT_A] [--repeat 5]
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+import polars as pl
+
+from core.loaders.airup_dataset_loader import AirUpDatasetLoader
+from core.loaders.dataset_ids import DatasetId
+from core.preprocessing.airup_sensor_preprocessor import AirUpSensorPreprocessor
+from core.preprocessing.utils.time_utils import epoch_to_datetime
+
+
+def _legacy(df: pl.DataFrame) -> pl.Series:
+    return df.select(
+        pl.col("timestamp_gps")
+        .cast(pl.Float64)
+        .map_elements(datetime.fromtimestamp, return_dtype=pl.Datetime("us"))
+    ).to_series()
+
+
+def _vectorized(df: pl.DataFrame, timezone) -> pl.Series:
+    return df.select(epoch_to_datetime(pl.col("timestamp_gps"), "s", timezone)).to_series()
+
+
+def _best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AirUp timestamp_gps conversion benchmark")
+    parser.add_argument("--base-path", type=Path, default=Path("."))
+    parser.add_argument(
+        "--dataset",
+        default=DatasetId.AIRUP_SONT_A.name,
+        choices=[DatasetId.AIRUP_SONT_A.name, DatasetId.AIRUP_SONT_C.name],
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    dataset_id = DatasetId[args.dataset]
+    loader = AirUpDatasetLoader(
+        args.base_path,
+        columns=AirUpSensorPreprocessor().input_columns(),
+    )
+    df = loader.load_dataset(dataset_id).select("timestamp_gps")
+    print(
+        f"{dataset_id.value}: rows={df.height} "
+        f"non-null timestamp_gps={df.height - df['timestamp_gps'].null_count()}"
+    )
+
+    legacy = _legacy(df)
+    assert _vectorized(df, None).equals(legacy), "vectorized local time differs from fromtimestamp"
+
+    rows = [("map_elements (legacy)", _best_of(lambda: _legacy(df), args.repeat))]
+    for timezone in (None, "UTC", "Europe/Berlin"):
+        label = f"epoch_to_datetime tz={timezone or 'local'}"
+        rows.append((label, _best_of(lambda: _vectorized(df, timezone), args.repeat)))
+
+    baseline = rows[0][1]
+    for label, seconds in rows:
+        print(f"{label:<36} {seconds * 1000:9.1f} ms  x{baseline / seconds:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# compares the former ZScoreDetector.score (clone + z columns + concat_list().list.mean())
+# with the horizontal-reduction path, with and without the z_<col> columns
+#
+# every variant runs in its own process so the reported peak RSS is its own
+# usage: python -m benchmarks.bench_zscore_scoring [--rows 1000000] [--features 10]
+import argparse
+import subprocess
+import sys
+import time
+import numpy as np
+import polars as pl
+
+from core.anomalies.ZScoreDetector import ZScoreDetector
+
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None
+
+VARIANTS = ("concat_list", "horizontal", "horizontal_no_z")
+
+
+def _legacy_score(detector: ZScoreDetector, df: pl.DataFrame) -> pl.DataFrame:
+    working = df.clone()
+    working = working.with_columns([
+        ((pl.col(col) - mean).cast(pl.Float64).truediv(std)).alias(f"z_{col}")
+        for col, (mean, std) in detector._stats.items()
+    ])
+    return working.with_columns(
+        pl.concat_list([pl.col(f"z_{c}").abs() for c in detector._stats])
+        .list.mean()
+        .alias("anomaly_score")
+    )
+
+
+def _frame(rows: int, features: int) -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    return pl.DataFrame({f"f{i}": rng.normal(size=rows) for i in range(features)})
+
+
+def _run_variant(variant: str, rows: int, features: int, repeat: int) -> None:
+    df = _frame(rows, features)
+    detector = ZScoreDetector(keep_z_columns=variant != "horizontal_no_z")
+    detector.fit(df, df.columns)
+
+    if variant == "concat_list":
+        score = lambda: _legacy_score(detector, df)
+    else:
+        score = lambda: detector.score(df)
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = score()
+        timings.append(time.perf_counter() - start)
+
+    peak = ""
+    if resource:
+        grown = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+        peak = f"  peak RSS +{grown / 1024:7.1f} MB"
+
+    print(
+        f"{variant:<18} {min(timings) * 1000:8.1f} ms  "
+        f"output {out.estimated_size('mb'):7.1f} MB{peak}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ZScoreDetector.score benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--variant", choices=VARIANTS)
+    args = parser.parse_args()
+
+    if args.variant:
+        _run_variant(args.variant, args.rows, args.features, args.repeat)
+        return
+
+    print(f"rows={args.rows} features={args.features}")
+    for variant in VARIANTS:
+        subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.bench_zscore_scoring",
+                "--rows", str(args.rows),
+                "--features", str(args.features),
+                "--repeat", str(args.repeat),
+                "--variant", variant,
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+# benchmark suite for loaders, preprocessors, feature engineers and detectors on
+# synthetic data (core.synthetic.heilbronn_generator) at several scales
+#
+# scale 1 is about today's volume: 3 stations x 3 years hourly for the CSV datasets
+# and the 83 day AirUp/LUBW minute campaign; scale k multiplies stations and
+# campaign days by k; generated data is kept per scale and seed in --data-dir
+# every (case, scale) runs in its own process so its peak RSS is its own; the
+# reported time is the best of --repeat calls after one warm-up call
+#
+# usage: python -m benchmarks.suite run [--scales 1,2,4] [--repeat 3] [--case loader.csv ...]
+#                                      [--output benchmarks/results/latest.json]
+#        python -m benchmarks.suite compare [BASELINE] [CURRENT] [--tolerance 0.2]
+#        refresh the baseline: python -m benchmarks.suite run --output benchmarks/baselines/baseline.json
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import polars as pl
+
+from core.anomalies.IsolationForestDetector import IsolationForestDetector
+from core.anomalies.ZScoreDetector import ZScoreDetector
+from core.features.RollingFeatureEngineer import RollingFeatureEngineer
+from core.features.TimeFeatureEngineer import TimeFeatureEngineer
+from core.loaders.airup_dataset_loader import AirUpDatasetLoader
+from core.loaders.csv_dataset_loader import CsvDatasetLoader
+from core.loaders.dataset_config import DATASET_REGISTRY
+from core.loaders.dataset_ids import DatasetId
+from core.persistence import library_versions
+from core.preprocessing.preprocessing_config import PREPROCESSOR_REGISTRY
+from core.synthetic.heilbronn_generator import AIRUP_SENSORS, HeilbronnDataGenerator, SyntheticScale
+
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None
+
+# bump when the result layout changes, compare refuses mismatching files
+RESULT_FORMAT_VERSION = 1
+
+DEFAULT_OUTPUT = Path("benchmarks/results/latest.json")
+DEFAULT_BASELINE = Path("benchmarks/baselines/baseline.json")
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_CAMPAIGN_DAYS = 83
+_FEATURES = ["no2", "o3", "pm10", "pm25"]
+
+# setup(base_path) -> (timed call, input rows); setup itself is not timed
+Setup = Callable[[Path], Tuple[Callable[[], Any], int]]
+
+
+def _load(base_path: Path, dataset_id: DatasetId) -> pl.DataFrame:
+    if dataset_id in AIRUP_SENSORS:
+        return AirUpDatasetLoader(base_path).load_dataset(dataset_id)
+    return CsvDatasetLoader(base_path).load_dataset(dataset_id)
+
+
+def _loader_case(dataset_id: DatasetId) -> Setup:
+    def setup(base_path: Path):
+        loader = AirUpDatasetLoader(base_path) if dataset_id in AIRUP_SENSORS else CsvDatasetLoader(base_path)
+        return lambda: loader.load_dataset(dataset_id), loader.load_dataset(dataset_id).height
+    return setup
+
+
+def _preprocess_case(dataset_id: DatasetId) -> Setup:
+    def setup(base_path: Path):
+        raw = _load(base_path, dataset_id)
+        preprocessor = PREPROCESSOR_REGISTRY[dataset_id]
+        return lambda: preprocessor.preprocess(raw), raw.height
+    return setup
+
+
+def _reference(base_path: Path) -> pl.DataFrame:
+    # calibrated air quality, sorted by station and time like a preprocessed frame
+    df = _load(base_path, DatasetId.AIR_QUALITY_CALIBRATED)
+    return df.sort("station_id", "timestamp")
+
+
+def _rolling(base_path: Path):
+    df = _reference(base_path)
+    engineer = RollingFeatureEngineer()
+    return lambda: engineer.add_rolling_features(df, _FEATURES, ["3h", "24h"], group_by="station_id"), df.height
+
+
+def _time_features(base_path: Path):
+    df = _reference(base_path)
+    return lambda: TimeFeatureEngineer().add_time_features(df), df.height
+
+
+def _fit(detector_factory: Callable[[], Any]) -> Setup:
+    def setup(base_path: Path):
+        df = _reference(base_path)
+        return lambda: detector_factory().fit(df, _FEATURES), df.height
+    return setup
+
+
+def _detect(detector_factory: Callable[[], Any], threshold: float) -> Setup:
+    def setup(base_path: Path):
+        df = _reference(base_path)
+        detector = detector_factory()
+        detector.fit(df, _FEATURES)
+        return lambda: detector.detect(df, threshold), df.height
+    return setup
+
+
+CASES: Dict[str, Setup] = {
+    "loader.csv": _loader_case(DatasetId.AIR_QUALITY_RAW),
+    "loader.airup": _loader_case(DatasetId.AIRUP_SONT_A),
+    **{f"preprocess.{dataset_id.value}": _preprocess_case(dataset_id) for dataset_id in PREPROCESSOR_REGISTRY},
+    "features.rolling": _rolling,
+    "features.time": _time_features,
+    "detector.zscore.fit": _fit(ZScoreDetector),
+    "detector.zscore.detect": _detect(ZScoreDetector, 3.0),
+    "detector.iforest.fit": _fit(IsolationForestDetector),
+    "detector.iforest.detect": _detect(IsolationForestDetector, 0.5),
+}
+
+
+# ---------------------------------------------------------
+#                        DATA
+# ---------------------------------------------------------
+def _scale(factor: int, seed: int) -> SyntheticScale:
+    default = SyntheticScale()
+    return SyntheticScale(
+        stations=default.stations * factor,
+        campaign_end=default.campaign_start + timedelta(days=_CAMPAIGN_DAYS * factor),
+        seed=seed,
+    )
+
+
+def _data(data_dir: Path, factor: int, seed: int) -> Path:
+    # generated once per scale and seed, the marker is written last
+    base_path = data_dir / f"scale-{factor}-seed-{seed}"
+    if (base_path / ".complete").exists():
+        return base_path
+
+    shutil.rmtree(base_path, ignore_errors=True)
+    started = time.perf_counter()
+    HeilbronnDataGenerator(_scale(factor, seed)).write(base_path)
+
+    # the reference value table is real data, copied if the checkout has it
+    reference = DATASET_REGISTRY[DatasetId.AIR_QUALITY_REFERENCE].relative_path
+    if (_PROJECT_ROOT / reference).exists():
+        shutil.copyfile(_PROJECT_ROOT / reference, base_path / reference)
+
+    (base_path / ".complete").touch()
+    print(f"generated scale {factor} data in {time.perf_counter() - started:.1f}s at {base_path}", file=sys.stderr)
+    return base_path
+
+
+# ---------------------------------------------------------
+#                       MEASURING
+# ---------------------------------------------------------
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(case: str, base_path: Path, repeat: int) -> Dict[str, Any]:
+    # runs inside the per-case process, returns one result record
+    try:
+        call, rows = CASES[case](base_path)
+    except FileNotFoundError as exc:
+        return {"skipped": str(exc)}
+
+    before = _peak_rss_mb()
+    call()  # warm-up: imports, timestamp format detection, allocator growth
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+
+    peak = _peak_rss_mb()
+    best = min(timings)
+    return {
+        "rows": rows,
+        "seconds": best,
+        "median_seconds": sorted(timings)[len(timings) // 2],
+        "rows_per_s": rows / best if best > 0 else None,
+        "peak_rss_mb": peak,
+        "rss_growth_mb": None if peak is None else peak - before,
+    }
+
+
+def _run_case(case: str, base_path: Path, repeat: int) -> Dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "measure", case, str(base_path), "--repeat", str(repeat)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _scaling(results: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    # log-log slope of time over rows between the smallest and largest scale,
+    # ~1 is linear, above 1 grows faster than the data
+    slopes: Dict[str, Optional[float]] = {}
+    for case in dict.fromkeys(r["case"] for r in results):
+        points = sorted((r["rows"], r["seconds"]) for r in results if r["case"] == case and "seconds" in r)
+        if len(points) < 2 or points[0][0] == points[-1][0] or points[0][1] <= 0:
+            slopes[case] = None
+            continue
+        (r0, t0), (r1, t1) = points[0], points[-1]
+        slopes[case] = math.log(t1 / t0) / math.log(r1 / r0)
+    return slopes
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be >= 1")
+    cases = args.case or list(CASES)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise SystemExit(f"Unknown cases: {sorted(unknown)}, available: {sorted(CASES)}")
+    scales = [int(s) for s in args.scales.split(",")]
+
+    results = []
+    for factor in scales:
+        base_path = _data(args.data_dir, factor, args.seed)
+        for case in cases:
+            record = {"case": case, "scale": factor, **_run_case(case, base_path, args.repeat)}
+            results.append(record)
+            if "skipped" in record:
+                print(f"{case:<40} x{factor:<3} skipped: {record['skipped']}")
+                continue
+            print(
+                f"{case:<40} x{factor:<3} {record['rows']:>10} rows  {record['seconds'] * 1000:10.1f} ms  "
+                f"{record['rows_per_s'] or 0:12.0f} rows/s  peak {record['peak_rss_mb'] or 0:8.1f} MB"
+            )
+
+    scaling = _scaling(results)
+    if len(scales) > 1:
+        print("\nscaling exponent (time ~ rows^k):")
+        for case, slope in scaling.items():
+            print(f"  {case:<40} {'-' if slope is None else f'{slope:.2f}'}")
+
+    payload = {
+        "format_version": RESULT_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": _cpu_count(),
+            "libraries": library_versions(),
+        },
+        "config": {"scales": scales, "repeat": args.repeat, "seed": args.seed},
+        "results": results,
+        "scaling": scaling,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf8")
+    print(f"\nwrote {args.output}")
+
+
+def _cpu_count() -> Optional[int]:
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+
+
+# ---------------------------------------------------------
+#                      COMPARING
+# ---------------------------------------------------------
+def _read(path: Path) -> Dict[str, Any]:
+    payload = json.loads(path.read_text(encoding="utf8"))
+    if payload.get("format_version") != RESULT_FORMAT_VERSION:
+        raise SystemExit(f"{path} has format version {payload.get('format_version')}, expected {RESULT_FORMAT_VERSION}")
+    return payload
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float,
+    memory_tolerance: float,
+    min_delta_ms: float,
+    min_delta_mb: float,
+) -> Tuple[List[str], List[str]]:
+    # (report lines, regressions); a case regresses when it is slower than the
+    # baseline by more than tolerance (relative) and min_delta_ms (absolute), or
+    # its peak RSS grew by more than memory_tolerance and min_delta_mb
+    before = {(r["case"], r["scale"]): r for r in baseline["results"] if "seconds" in r}
+    lines, regressions = [], []
+
+    for r in current["results"]:
+        key = (r["case"], r["scale"])
+        label = f"{r['case']:<40} x{r['scale']:<3}"
+        if "seconds" not in r:
+            continue
+        if key not in before:
+            lines.append(f"{label} new, no baseline")
+            continue
+
+        b = before[key]
+        ratio = r["seconds"] / b["seconds"] if b["seconds"] > 0 else math.inf
+        slower = ratio > 1 + tolerance and (r["seconds"] - b["seconds"]) * 1000 > min_delta_ms
+
+        bigger = False
+        if r.get("peak_rss_mb") and b.get("peak_rss_mb"):
+            grown = r["peak_rss_mb"] - b["peak_rss_mb"]
+            bigger = r["peak_rss_mb"] > b["peak_rss_mb"] * (1 + memory_tolerance) and grown > min_delta_mb
+
+        flags = [name for name, hit in (("SLOWER", slower), ("MEMORY", bigger)) if hit]
+        line = (
+            f"{label} {b['seconds'] * 1000:9.1f} -> {r['seconds'] * 1000:9.1f} ms  x{ratio:5.2f}  "
+            f"peak {b.get('peak_rss_mb') or 0:7.1f} -> {r.get('peak_rss_mb') or 0:7.1f} MB  {' '.join(flags)}"
+        )
+        lines.append(line.rstrip())
+        if flags:
+            regressions.append(line.rstrip())
+
+    missing = set(before) - {(r["case"], r["scale"]) for r in current["results"]}
+    lines.extend(f"{case:<40} x{scale:<3} missing in current run" for case, scale in sorted(missing))
+    return lines, regressions
+
+
+def compare(args: argparse.Namespace) -> None:
+    baseline, current = _read(args.baseline), _read(args.current)
+    if baseline["environment"].get("platform") != current["environment"].get("platform"):
+        print("warning: results come from different platforms, timings may not be comparable")
+
+    lines, regressions = compare_results(
+        baseline, current, args.tolerance, args.memory_tolerance, args.min_delta_ms, args.min_delta_mb
+    )
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond tolerance")
+        raise SystemExit(1)
+    print("\nno regressions beyond tolerance")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CalibraFlow benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and write a result JSON")
+    run_parser.add_argument("--scales", default="1,2,4", help="comma separated scale factors")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--case", action="append", help=f"repeatable, default all of: {', '.join(CASES)}")
+    run_parser.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "calibraflow-bench")
+    run_parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions of CURRENT against BASELINE")
+    compare_parser.add_argument("baseline", type=Path, nargs="?", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("current", type=Path, nargs="?", default=DEFAULT_OUTPUT)
+    compare_parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    compare_parser.add_argument("--memory-tolerance", type=float, default=0.2, help="allowed relative peak RSS growth")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore slowdowns below this")
+    compare_parser.add_argument("--min-delta-mb", type=float, default=16.0, help="ignore RSS growth below this")
+
+    # internal: one case in a fresh process, prints a JSON record
+    measure_parser = commands.add_parser("measure")
+    measure_parser.add_argument("case", choices=list(CASES))
+    measure_parser.add_argument("base_path", type=Path)
+    measure_parser.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    elif args.command == "compare":
+        compare(args)
+    else:
+        logging.disable(logging.WARNING)
+        print(json.dumps(_measure(args.case, args.base_path, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
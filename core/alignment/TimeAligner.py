@@ -0,0 +1,143 @@
+import logging
+from typing import List, Mapping, Optional, Sequence, Union
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+_STRATEGIES = ("backward", "forward", "nearest")
+
+
+class TimeAligner:
+    # matches sensor rows to the reference row closest in time with a sorted
+    # join_asof (O(n log n) for the sorts, linear merge), instead of a per row search
+    #
+    # several sensors are stacked with a sensor column and joined against the
+    # reference in one pass; with grid ("1m", "10m", "1h") both sides are first
+    # averaged onto the common grid, labelled by window start
+    #
+    # reference value columns get reference_suffix (PM10 -> PM10_ref) and the matched
+    # reference timestamp is kept as <timestamp><suffix>; sensor rows without a
+    # reference row within tolerance keep nulls there; rows with a null timestamp
+    # cannot be aligned and are dropped; both sides must use the same time basis
+    # (e.g. naive local wall clock)
+
+    def __init__(
+        self,
+        tolerance: Optional[str] = "1m",
+        strategy: str = "nearest",
+        grid: Optional[str] = None,
+        timestamp: str = "timestamp",
+        sensor_column: str = "sensor",
+        reference_suffix: str = "_ref",
+    ) -> None:
+        if strategy not in _STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {list(_STRATEGIES)}")
+
+        self._tolerance = tolerance
+        self._strategy = strategy
+        self._grid = grid
+        self._timestamp = timestamp
+        self._sensor_column = sensor_column
+        self._suffix = reference_suffix
+
+    def align(
+        self,
+        sensors: Union[Frame, Mapping[str, Frame]],
+        reference: Frame,
+        reference_columns: Optional[Sequence[str]] = None,
+    ) -> Frame:
+        # sensors: one frame, or sensor name -> frame (adds the sensor column)
+        # reference_columns: reference values to attach, default all but the timestamp
+        # returns a LazyFrame if any input is lazy, a DataFrame otherwise
+        frames = list(sensors.values()) if isinstance(sensors, Mapping) else [sensors]
+        eager = all(isinstance(f, pl.DataFrame) for f in [*frames, reference])
+
+        left = self._stack(sensors)
+        by = [self._sensor_column] if isinstance(sensors, Mapping) else []
+        right = self._prepare_reference(reference, reference_columns)
+
+        if self._grid is not None:
+            left = self._resample(left, by)
+            right = self._resample(right, [])
+
+        # join_asof needs matching datetime dtypes (time unit, zone)
+        ts_dtype = left.collect_schema()[self._timestamp]
+        right = right.with_columns(
+            pl.col(self._timestamp).cast(ts_dtype),
+            pl.col(f"{self._timestamp}{self._suffix}").cast(ts_dtype),
+        )
+
+        aligned = left.sort(self._timestamp, maintain_order=True).join_asof(
+            right.sort(self._timestamp),
+            on=self._timestamp,
+            strategy=self._strategy,
+            tolerance=self._tolerance,
+        )
+        if by:
+            aligned = aligned.sort([*by, self._timestamp], maintain_order=True)
+
+        return aligned.collect() if eager else aligned
+
+    def _check_timestamp(self, schema: pl.Schema, side: str) -> None:
+        if self._timestamp not in schema:
+            raise ValueError(f"{side} frame must contain a '{self._timestamp}' column")
+        if not schema[self._timestamp].is_temporal():
+            raise TypeError(f"{side} column '{self._timestamp}' must be a datetime, got {schema[self._timestamp]}")
+
+    def _stack(self, sensors: Union[Frame, Mapping[str, Frame]]) -> pl.LazyFrame:
+        if not isinstance(sensors, Mapping):
+            self._check_timestamp(sensors.collect_schema(), "Sensor")
+            return sensors.lazy().filter(pl.col(self._timestamp).is_not_null())
+
+        if not sensors:
+            raise ValueError("At least one sensor frame is required")
+
+        parts = []
+        for name, frame in sensors.items():
+            schema = frame.collect_schema()
+            self._check_timestamp(schema, f"Sensor '{name}'")
+            if self._sensor_column in schema:
+                raise ValueError(f"Sensor '{name}' already has a '{self._sensor_column}' column")
+            parts.append(frame.lazy().with_columns(pl.lit(name).alias(self._sensor_column)))
+
+        # diagonal: sensors may report different column sets
+        stacked = pl.concat(parts, how="diagonal_relaxed")
+        return stacked.filter(pl.col(self._timestamp).is_not_null())
+
+    def _prepare_reference(self, reference: Frame, columns: Optional[Sequence[str]]) -> pl.LazyFrame:
+        schema = reference.collect_schema()
+        self._check_timestamp(schema, "Reference")
+
+        if columns is None:
+            columns = [c for c in schema.names() if c != self._timestamp]
+        for col in columns:
+            if col not in schema:
+                raise ValueError(f"Reference column '{col}' not in reference frame")
+
+        ts = pl.col(self._timestamp)
+        return (
+            reference.lazy()
+            .filter(ts.is_not_null())
+            .select(
+                ts,
+                ts.alias(f"{self._timestamp}{self._suffix}"),
+                *[pl.col(c).alias(f"{c}{self._suffix}") for c in columns],
+            )
+        )
+
+    def _resample(self, lf: pl.LazyFrame, by: List[str]) -> pl.LazyFrame:
+        # mean of numeric columns per grid window, first value of the others
+        schema = lf.collect_schema()
+        keys = {self._timestamp, *by}
+        aggs = [
+            pl.col(name).mean() if dtype.is_numeric() else pl.col(name).first()
+            for name, dtype in schema.items()
+            if name not in keys
+        ]
+        return (
+            lf.with_columns(pl.col(self._timestamp).dt.truncate(self._grid))
+            .group_by([*by, self._timestamp])
+            .agg(aggs)
+        )
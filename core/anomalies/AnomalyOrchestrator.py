@@ -1,16 +1,99 @@
+import copy
 import logging
-from typing import Sequence
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import polars as pl
+from core import instrumentation
+from core.anomalies.DetectorRegistry import DetectorRegistry
 from core.interfaces.IAnomalyDetector import IAnomalyDetector
 
 logger = logging.getLogger(__name__)
 
+# "thread": detectors whose fit releases the GIL or is cheap (z-score)
+# "process": CPU bound Python fits, e.g. IsolationForest with many estimators
+_EXECUTORS = ("thread", "process")
+
+# prefix of the temporary row index column, extended until it is unique in the input
+_ROW_INDEX = "__row_nr"
+
+PartitionKey = Tuple
+
+
+def _fit_partition(
+    detector: IAnomalyDetector,
+    df: pl.DataFrame,
+    feature_columns: Sequence[str],
+) -> IAnomalyDetector:
+    # module level so a process pool can pickle it, the fitted copy is sent back
+    detector.fit(df, feature_columns)
+    return detector
+
+
 class AnomalyOrchestrator:
     # orchestrates anomaly detection on preprocessed datasets
+    #
+    # with partition_by (e.g. "sensor_id") one copy of the detector is fitted per
+    # partition key and every target row is scored by the model of its own key;
+    # rows whose key had no reference data get null scores
+
+    def __init__(
+        self,
+        detector: IAnomalyDetector,
+        partition_by: Optional[Union[str, Sequence[str]]] = None,
+        n_jobs: int = 1,
+        executor: str = "thread",
+    ) -> None:
+        # dependency injected detector implementation, the prototype when partitioned
+        # n_jobs: partitions fitted in parallel, executor: "thread" or "process"
+        if executor not in _EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {list(_EXECUTORS)}")
+        if n_jobs < 1:
+            raise ValueError("n_jobs must be >= 1")
 
-    def __init__(self, detector: IAnomalyDetector) -> None:
-        # dependency injected detector implementation
         self._detector = detector
+        self._partition_by: List[str] = (
+            [partition_by] if isinstance(partition_by, str) else list(partition_by or [])
+        )
+        self._n_jobs = n_jobs
+        self._executor = executor
+        self._partition_detectors: Dict[PartitionKey, IAnomalyDetector] = {}
+
+    @classmethod
+    def from_registry(
+        cls,
+        registry: DetectorRegistry,
+        name: str,
+        version: Optional[int] = None,
+    ) -> "AnomalyOrchestrator":
+        # start with an already fitted detector, no fit_on_reference needed
+        detector = registry.load(name, version)
+        logger.info(
+            "Loaded detector '%s' from registry (fitted on %s rows at %s)",
+            name,
+            detector.fit_metadata.get("n_samples"),
+            detector.fit_metadata.get("fitted_at"),
+        )
+        return cls(detector)
+
+    @property
+    def detector(self) -> IAnomalyDetector:
+        return self._detector
+
+    @property
+    def partitioned(self) -> bool:
+        return bool(self._partition_by)
+
+    @property
+    def partition_detectors(self) -> Dict[PartitionKey, IAnomalyDetector]:
+        # fitted detector per partition key tuple, empty when not partitioned
+        return dict(self._partition_detectors)
+
+    def save_to_registry(self, registry: DetectorRegistry, name: str) -> int:
+        # store the fitted detector as a new version, returns the version number
+        if self.partitioned:
+            raise ValueError("Partitioned orchestrators cannot be saved to a registry")
+        return registry.register(name, self._detector)
 
     def fit_on_reference(
         self,
@@ -18,8 +101,48 @@ class AnomalyOrchestrator:
         feature_columns: Sequence[str],
     ) -> None:
         # train anomaly detector on (assumed) mostly normal reference data
-        logger.info("Fitting anomaly detector on reference dataset")
-        self._detector.fit(df_reference, feature_columns)
+        if not self.partitioned:
+            logger.info("Fitting anomaly detector on reference dataset")
+            with instrumentation.span(f"{type(self._detector).__name__}.fit", "detect", df_reference):
+                self._detector.fit(df_reference, feature_columns)
+            return
+
+        self._check_partition_columns(df_reference)
+        partitions = df_reference.partition_by(self._partition_by, as_dict=True)
+        logger.info(
+            "Fitting %s anomaly detectors partitioned by %s (n_jobs=%s, executor=%s)",
+            len(partitions),
+            self._partition_by,
+            self._n_jobs,
+            self._executor,
+        )
+
+        jobs = [
+            (key, copy.deepcopy(self._detector), part, feature_columns)
+            for key, part in partitions.items()
+        ]
+
+        # one span for all partitions, spans opened in worker processes would be lost
+        with instrumentation.span(f"{type(self._detector).__name__}.fit[partitioned]", "detect", df_reference):
+            if self._n_jobs == 1 or len(jobs) == 1:
+                fitted = [_fit_partition(det, part, cols) for _, det, part, cols in jobs]
+            else:
+                with self._pool(min(self._n_jobs, len(jobs))) as pool:
+                    futures = [pool.submit(_fit_partition, det, part, cols) for _, det, part, cols in jobs]
+                    fitted = [future.result() for future in futures]
+
+        self._partition_detectors = {job[0]: det for job, det in zip(jobs, fitted)}
+
+    def _pool(self, workers: int) -> Executor:
+        if self._executor == "thread":
+            return ThreadPoolExecutor(max_workers=workers)
+        # spawn: forking a process that already runs polars/sklearn threads can deadlock
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _check_partition_columns(self, df: pl.DataFrame) -> None:
+        for col in self._partition_by:
+            if col not in df.columns:
+                raise ValueError(f"Partition column '{col}' not in dataframe")
 
     def run_detection(
         self,
@@ -31,5 +154,39 @@ class AnomalyOrchestrator:
             "Running anomaly detection (threshold=%s) on target dataset",
             threshold,
         )
-        result = self._detector.detect(df_target, threshold)
-        return result
+        if not self.partitioned:
+            with instrumentation.span(f"{type(self._detector).__name__}.detect", "detect", df_target) as span:
+                result = self._detector.detect(df_target, threshold)
+                span.output(result)
+            return result
+
+        if not self._partition_detectors:
+            raise RuntimeError("Partitioned AnomalyOrchestrator must be fitted before 'run_detection'")
+        self._check_partition_columns(df_target)
+
+        # the row index restores the input order after the per partition detection
+        row_index = _ROW_INDEX
+        while row_index in df_target.columns:
+            row_index += "_"
+        indexed = df_target.with_row_index(row_index)
+        unscored = [
+            pl.lit(None, dtype=pl.Float64).alias("anomaly_score"),
+            pl.lit(None, dtype=pl.Boolean).alias("is_anomaly"),
+        ]
+        results = [indexed.clear().with_columns(unscored)]
+        for key, part in indexed.partition_by(self._partition_by, as_dict=True).items():
+            detector = self._partition_detectors.get(key)
+            if detector is None:
+                logger.warning("No detector fitted for partition %s, %s rows left unscored", key, part.height)
+                results.append(part.with_columns(unscored))
+            else:
+                with instrumentation.span(f"{type(detector).__name__}.detect:{key}", "detect", part) as span:
+                    results.append(detector.detect(part, threshold))
+                    span.output(results[-1])
+
+        # diagonal: partitions may add different columns, unscored ones lack z_<col>
+        return (
+            pl.concat(results, how="diagonal_relaxed")
+            .sort(row_index)
+            .drop(row_index)
+        )
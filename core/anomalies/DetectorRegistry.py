@@ -0,0 +1,73 @@
+import logging
+import re
+from pathlib import Path
+from typing import List, Optional, Type
+from core.interfaces.IAnomalyDetector import IAnomalyDetector
+
+logger = logging.getLogger(__name__)
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+_SUFFIX = ".pkl"
+
+
+class DetectorRegistry:
+    # directory of saved detectors, one sub directory per name and one file per version
+    #
+    #   <root>/<name>/0001.pkl, 0002.pkl, ...
+    #
+    # versions only ever grow, load() without a version returns the latest one
+
+    def __init__(self, root: Path) -> None:
+        self._root = Path(root)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _dir(self, name: str) -> Path:
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid detector name '{name}'")
+        return self._root / name
+
+    def names(self) -> List[str]:
+        if not self._root.is_dir():
+            return []
+        return sorted(p.name for p in self._root.iterdir() if p.is_dir() and self.versions(p.name))
+
+    def versions(self, name: str) -> List[int]:
+        directory = self._dir(name)
+        if not directory.is_dir():
+            return []
+        return sorted(
+            int(p.stem) for p in directory.glob(f"*{_SUFFIX}") if p.stem.isdigit()
+        )
+
+    def path(self, name: str, version: int) -> Path:
+        return self._dir(name) / f"{version:04d}{_SUFFIX}"
+
+    def register(self, name: str, detector: IAnomalyDetector) -> int:
+        # save a fitted detector as the next version of name and return that version
+        existing = self.versions(name)
+        version = existing[-1] + 1 if existing else 1
+        detector.save(self.path(name, version))
+        logger.info("Registered detector '%s' version %s", name, version)
+        return version
+
+    def load(
+        self,
+        name: str,
+        version: Optional[int] = None,
+        detector_class: Type[IAnomalyDetector] = IAnomalyDetector,
+    ) -> IAnomalyDetector:
+        # version None -> latest; detector_class narrows the accepted type
+        if version is None:
+            existing = self.versions(name)
+            if not existing:
+                raise FileNotFoundError(f"No detector registered under '{name}' in '{self._root}'")
+            version = existing[-1]
+
+        path = self.path(name, version)
+        if not path.is_file():
+            raise FileNotFoundError(f"Detector '{name}' has no version {version} in '{self._root}'")
+
+        return detector_class.load(path)
@@ -1,12 +1,21 @@
 import logging
-from typing import Sequence
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Tuple, Union
 import polars as pl
 import numpy as np
 from sklearn.ensemble import IsolationForest
+from core.features.FeatureMatrix import FeatureMatrix, NULL_POLICIES
 from core.interfaces.IAnomalyDetector import IAnomalyDetector
 
 logger = logging.getLogger(__name__)
 
+# "fit": min-max bounds of the training scores, a row scores the same in any batch
+# "batch": min-max over the scored frame itself (previous behaviour)
+_NORMALIZATIONS = ("fit", "batch")
+
 # numeric dtype set for polars
 _NUMERIC_DTYPES = {
     pl.Int8, pl.Int16, pl.Int32, pl.Int64,
@@ -26,13 +35,43 @@ class IsolationForestDetector(IAnomalyDetector):
         n_estimators: int = 100,
         contamination: float | None = 0.01,
         random_state: int | None = 42,
+        chunk_size: Optional[int] = None,
+        n_jobs: int = 1,
+        normalization: str = "fit",
+        nulls: str = "raise",
+        spill_dir: Optional[Path] = None,
     ) -> None:
+        # chunk_size: score at most this many rows per feature matrix, bounds the
+        # float64 copy of the features; None scores the whole frame at once
+        # n_jobs: threads scoring chunks in parallel
+        # normalization: "fit" (default) or "batch", see _NORMALIZATIONS
+        # nulls: "raise", "drop" or "fill" (with 0.0) for null/NaN features, dropped
+        # rows get a null anomaly_score
+        # spill_dir: build the training matrix as a memory-mapped .npy in this directory
+        if normalization not in _NORMALIZATIONS:
+            raise ValueError(
+                f"Unknown normalization '{normalization}', expected one of {list(_NORMALIZATIONS)}"
+            )
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        if n_jobs < 1:
+            raise ValueError("n_jobs must be >= 1")
+        if nulls not in NULL_POLICIES:
+            raise ValueError(f"Unknown null policy '{nulls}', expected one of {list(NULL_POLICIES)}")
+
         self._model = IsolationForest(
             n_estimators=n_estimators,
             contamination=contamination,
             random_state=random_state,
         )
         self._feature_columns: Sequence[str] = []
+        self._chunk_size = chunk_size
+        self._n_jobs = n_jobs
+        self._normalization = normalization
+        self._nulls = nulls
+        self._spill_dir = spill_dir
+        # raw score bounds on the training data, learned in fit
+        self._score_bounds: Optional[Tuple[float, float]] = None
 
     def fit(self, df: pl.DataFrame, feature_columns: Sequence[str]) -> None:
         if df.is_empty():
@@ -47,41 +86,162 @@ class IsolationForestDetector(IAnomalyDetector):
             if not _is_numeric_dtype(df[col].dtype):
                 raise TypeError(f"Feature column '{col}' must be numeric")
 
-        X = df.select(self._feature_columns).to_numpy()
-        self._model.fit(X)
+        features = df.select(self._feature_columns)
+        self._fit_model(features)
+
+        train_scores = self._raw_scores(features)
+        self._score_bounds = (float(np.nanmin(train_scores)), float(np.nanmax(train_scores)))
+        self._record_fit(df, self._feature_columns)
 
         logger.info(
-            "Fitted IsolationForest on columns: %s (n_samples=%s)",
+            "Fitted IsolationForest on columns: %s (n_samples=%s, score_bounds=%s)",
             self._feature_columns,
-            X.shape[0],
+            features.height,
+            self._score_bounds,
+        )
+
+    def _matrix(self, features: pl.DataFrame, spill_path: Optional[Path] = None) -> FeatureMatrix:
+        # float32 is what the sklearn trees work in, so sklearn does not copy again
+        return FeatureMatrix.from_frame(
+            features, self._feature_columns, dtype=np.float32, nulls=self._nulls, spill_path=spill_path
+        )
+
+    def _fit_model(self, features: pl.DataFrame) -> None:
+        if self._spill_dir is None:
+            self._model.fit(self._matrix(features).values)
+            return
+
+        Path(self._spill_dir).mkdir(parents=True, exist_ok=True)
+        handle, path = tempfile.mkstemp(suffix=".npy", dir=self._spill_dir)
+        os.close(handle)
+        try:
+            matrix = self._matrix(features, spill_path=Path(path))
+            self._model.fit(matrix.values)
+            del matrix
+        finally:
+            os.remove(path)
+
+    def _score_matrix(self, features: pl.DataFrame) -> np.ndarray:
+        # raw scores of one frame, NaN for rows dropped by the null policy
+        matrix = self._matrix(features)
+        if matrix.n_rows == 0:
+            return np.full(features.height, np.nan)
+        scores = -self._model.score_samples(matrix.values)
+        if matrix.row_mask is None:
+            return scores
+        raw = np.full(features.height, np.nan)
+        raw[matrix.row_mask] = scores
+        return raw
+
+    def _raw_scores(self, features: pl.DataFrame) -> np.ndarray:
+        # sklearn: more negative = more anomalous
+        n_rows = features.height
+        chunk = self._chunk_size or n_rows
+
+        if n_rows <= chunk:
+            return self._score_matrix(features)
+
+        raw = np.empty(n_rows, dtype=np.float64)
+
+        def score_chunk(offset: int) -> None:
+            # only this chunk is copied into a feature matrix, results go straight into raw
+            part = features.slice(offset, chunk)
+            raw[offset:offset + part.height] = self._score_matrix(part)
+
+        offsets = range(0, n_rows, chunk)
+        if self._n_jobs == 1:
+            for offset in offsets:
+                score_chunk(offset)
+        else:
+            with ThreadPoolExecutor(max_workers=self._n_jobs) as pool:
+                list(pool.map(score_chunk, offsets))
+
+        logger.debug(
+            "Scored %s rows in %s chunks (chunk_size=%s, n_jobs=%s)",
+            n_rows,
+            len(offsets),
+            chunk,
+            self._n_jobs,
         )
 
-    def score(self, df: pl.DataFrame) -> pl.DataFrame:
+        return raw
+
+    def _check_scoring(self, columns: Sequence[str]) -> None:
         if not self._feature_columns:
             raise RuntimeError("IsolationForestDetector must be fitted before 'score'")
 
         for col in self._feature_columns:
-            if col not in df.columns:
+            if col not in columns:
                 raise ValueError(f"Feature column '{col}' not present at scoring time")
 
-        X = df.select(self._feature_columns).to_numpy()
-
-        # sklearn: more negative = more anomalous
-        raw_scores = self._model.score_samples(X)
-        anomaly_score = -raw_scores
-
-        anomaly_score = anomaly_score - float(np.min(anomaly_score))
-        max_val = float(np.max(anomaly_score))
-        if max_val > 0:
-            anomaly_score = anomaly_score / max_val
-
-        scored = df.with_columns(
-            pl.Series("anomaly_score", anomaly_score.tolist())
+    def _normalize(self, raw: np.ndarray, low: float, high: float) -> np.ndarray:
+        # raw scores mapped to [0, 1] with the given bounds
+        anomaly_score = raw - low
+        if high > low:
+            anomaly_score = anomaly_score / (high - low)
+        return np.clip(anomaly_score, 0.0, 1.0)
+
+    def _with_scores(self, df: pl.DataFrame, anomaly_score: np.ndarray) -> pl.DataFrame:
+        # numpy backed series, no python list round trip
+        return df.with_columns(
+            pl.Series("anomaly_score", anomaly_score, nan_to_null=True)
         )
 
-        return scored
-
-    def detect(self, df: pl.DataFrame, threshold: float) -> pl.DataFrame:
+    def score_batches(self, lf: pl.LazyFrame) -> Iterator[pl.DataFrame]:
+        # scored frames of at most chunk_size rows, the plan runs once on the
+        # streaming engine and is never collected as a whole; requires chunk_size
+        # and normalization="fit" ("batch" needs the min/max over all rows)
+        if self._chunk_size is None:
+            raise ValueError("score_batches requires a chunk_size")
+        if self._normalization != "fit":
+            raise ValueError("score_batches requires normalization='fit'")
+        self._check_scoring(lf.collect_schema().names())
+
+        low, high = self._score_bounds
+        for batch in lf.collect_batches(chunk_size=self._chunk_size):
+            raw = self._raw_scores(batch.select(self._feature_columns))
+            yield self._with_scores(batch, self._normalize(raw, low, high))
+
+    def score(self, df: Union[pl.DataFrame, pl.LazyFrame]) -> pl.DataFrame:
+        # a lazy plan is read in chunk_size batches, without a chunk_size it is collected at once
+        if isinstance(df, pl.LazyFrame):
+            if self._chunk_size is not None:
+                return self._score_lazy(df)
+            df = df.collect()
+
+        self._check_scoring(df.columns)
+        raw = self._raw_scores(df.select(self._feature_columns))
+
+        if self._normalization == "fit":
+            # per-row mapping with the training bounds, clipped to [0, 1]
+            anomaly_score = self._normalize(raw, *self._score_bounds)
+        else:
+            # min-max over all chunks, so chunked and unchunked scoring agree
+            anomaly_score = self._normalize(raw, float(np.nanmin(raw)), float(np.nanmax(raw)))
+
+        return self._with_scores(df, anomaly_score)
+
+    def _score_lazy(self, lf: pl.LazyFrame) -> pl.DataFrame:
+        # only the scored result is held as a whole; with "batch" normalization the
+        # min/max over all raw scores is only known after the last batch
+        if self._normalization == "fit":
+            scored = list(self.score_batches(lf))
+            return pl.concat(scored) if scored else self._with_scores(lf.clear().collect(), np.empty(0))
+
+        self._check_scoring(lf.collect_schema().names())
+        batches, raws = [], []
+        for batch in lf.collect_batches(chunk_size=self._chunk_size):
+            batches.append(batch)
+            raws.append(self._raw_scores(batch.select(self._feature_columns)))
+
+        if not batches:
+            return self._with_scores(lf.clear().collect(), np.empty(0))
+
+        raw = np.concatenate(raws)
+        anomaly_score = self._normalize(raw, float(np.nanmin(raw)), float(np.nanmax(raw)))
+        return self._with_scores(pl.concat(batches), anomaly_score)
+
+    def detect(self, df: Union[pl.DataFrame, pl.LazyFrame], threshold: float) -> pl.DataFrame:
         scored = self.score(df)
 
         scored = scored.with_columns(
@@ -0,0 +1,189 @@
+import logging
+import math
+from datetime import timedelta
+from typing import Dict, Optional, Sequence, Tuple
+import polars as pl
+from core.anomalies.ZScoreDetector import ZScoreDetector
+
+logger = logging.getLogger(__name__)
+
+_MODES = ("cumulative", "ewm", "window")
+
+
+class OnlineZScoreDetector(ZScoreDetector):
+    # z-score detector whose statistics are updated batch by batch instead of refitted
+    #
+    # mode "cumulative": exact mean/variance over everything seen (Chan et al. merge
+    #   of per-batch count/mean/M2, each batch is scanned once)
+    # mode "ewm": exponentially weighted mean/variance with smoothing factor alpha,
+    #   recent minutes dominate
+    # mode "window": mean/std over the rows of the last `window` (e.g. "7d") by
+    #   timestamp; only that window is kept in memory
+    #
+    # score() uses the current state, score_and_update() scores a batch and then
+    # folds it into the state
+
+    def __init__(
+        self,
+        mode: str = "cumulative",
+        alpha: Optional[float] = None,
+        window: Optional[str] = None,
+        timestamp_column: str = "timestamp",
+        keep_z_columns: bool = True,
+    ) -> None:
+        super().__init__(keep_z_columns)
+
+        if mode not in _MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected one of {list(_MODES)}")
+        if mode == "ewm" and (alpha is None or not 0.0 < alpha <= 1.0):
+            raise ValueError("mode 'ewm' requires 0 < alpha <= 1")
+        if mode == "window" and window is None:
+            raise ValueError("mode 'window' requires a window such as '7d'")
+
+        self._mode = mode
+        self._alpha = alpha
+        self._window = None if window is None else timedelta(**_parse_window(window))
+        self._timestamp_column = timestamp_column
+
+        # per column (count, mean, M2) for "cumulative", (count, mean, variance) for "ewm"
+        self._state: Dict[str, Tuple[int, float, float]] = {}
+        # rows inside the window for "window"
+        self._buffer: Optional[pl.DataFrame] = None
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def fit(self, df: pl.DataFrame, feature_columns: Sequence[str]) -> None:
+        # reset the state and initialise it from df
+        if df.is_empty():
+            raise ValueError("Cannot fit OnlineZScoreDetector on empty dataframe")
+
+        self._feature_columns = list(feature_columns)
+        self._validate(df)
+        self._state = {}
+        self._buffer = None
+        self.update(df)
+        self._record_fit(df, self._feature_columns)
+
+        logger.info(
+            "Fitted OnlineZScoreDetector (mode=%s) on columns: %s",
+            self._mode,
+            self._feature_columns,
+        )
+
+    def update(self, df: pl.DataFrame) -> None:
+        # fold a new batch into the statistics
+        if not self._feature_columns:
+            raise RuntimeError("OnlineZScoreDetector must be fitted before 'update'")
+        if df.is_empty():
+            return
+
+        self._validate(df)
+
+        if self._mode == "cumulative":
+            self._update_cumulative(df)
+        elif self._mode == "ewm":
+            self._update_ewm(df)
+        else:
+            self._update_window(df)
+
+        self._refresh_stats()
+
+    def score_and_update(self, df: pl.DataFrame) -> pl.DataFrame:
+        # score against the state before this batch, then learn from it
+        scored = self.score(df)
+        self.update(df)
+        return scored
+
+    def _validate(self, df: pl.DataFrame) -> None:
+        for col in self._feature_columns:
+            if col not in df.columns:
+                raise ValueError(f"Feature column '{col}' not in dataframe")
+            if not df.schema[col].is_numeric():
+                raise TypeError(f"Feature column '{col}' must be numeric, got {df.schema[col]}")
+
+        if self._mode == "window":
+            if self._timestamp_column not in df.columns:
+                raise ValueError(f"mode 'window' requires column '{self._timestamp_column}'")
+            if not df.schema[self._timestamp_column].is_temporal():
+                raise TypeError(f"Column '{self._timestamp_column}' must be a datetime")
+
+    def _batch_moments(self, df: pl.DataFrame) -> Dict[str, Tuple[int, float, float]]:
+        # one scan for count, mean and M2 of every feature column (nulls are skipped)
+        exprs = []
+        for col in self._feature_columns:
+            values = pl.col(col).cast(pl.Float64)
+            exprs += [
+                values.count().alias(f"{col}__n"),
+                values.mean().alias(f"{col}__mean"),
+                ((values - values.mean()) ** 2).sum().alias(f"{col}__m2"),
+            ]
+        row = df.select(exprs).row(0, named=True)
+        return {
+            col: (row[f"{col}__n"], row[f"{col}__mean"] or 0.0, row[f"{col}__m2"] or 0.0)
+            for col in self._feature_columns
+        }
+
+    def _update_cumulative(self, df: pl.DataFrame) -> None:
+        for col, (n_b, mean_b, m2_b) in self._batch_moments(df).items():
+            if n_b == 0:
+                continue
+            n_a, mean_a, m2_a = self._state.get(col, (0, 0.0, 0.0))
+            n = n_a + n_b
+            delta = mean_b - mean_a
+            mean = mean_a + delta * n_b / n
+            m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+            self._state[col] = (n, mean, m2)
+
+    def _update_ewm(self, df: pl.DataFrame) -> None:
+        # per row: mean_t = mean_{t-1} + a * d_t, var_t = (1 - a) * (var_{t-1} + a * d_t^2)
+        # with d_t = x_t - mean_{t-1}; both recursions run as ewm_mean(adjust=False)
+        # over the batch prefixed with the previous state
+        a = self._alpha
+        for col in self._feature_columns:
+            values = df.get_column(col).cast(pl.Float64).drop_nulls()
+            if values.len() == 0:
+                continue
+
+            count, mean, var = self._state.get(col, (0, values[0], 0.0))
+
+            means = pl.concat([pl.Series([mean]), values]).ewm_mean(alpha=a, adjust=False)
+            previous = means.slice(0, values.len())
+            squared = (1.0 - a) * (values - previous) ** 2
+            variances = pl.concat([pl.Series([var]), squared]).ewm_mean(alpha=a, adjust=False)
+
+            self._state[col] = (count + values.len(), means[-1], variances[-1])
+
+    def _update_window(self, df: pl.DataFrame) -> None:
+        columns = [self._timestamp_column, *self._feature_columns]
+        batch = df.select(columns)
+        buffer = batch if self._buffer is None else pl.concat([self._buffer, batch], how="vertical_relaxed")
+
+        latest = buffer.get_column(self._timestamp_column).max()
+        # (latest - window, latest], like the rolling windows of the feature engineers
+        self._buffer = buffer.filter(pl.col(self._timestamp_column) > latest - self._window)
+
+        self._state = self._batch_moments(self._buffer)
+
+    def _refresh_stats(self) -> None:
+        # derive the (mean, std) pairs ZScoreDetector.score works with
+        stats = {}
+        for col in self._feature_columns:
+            count, mean, spread = self._state.get(col, (0, 0.0, 0.0))
+            if self._mode == "ewm":
+                std = math.sqrt(spread)
+            else:
+                std = math.sqrt(spread / (count - 1)) if count > 1 else float("nan")
+            stats[col] = (float(mean), self._stable_std(count, std))
+        self._stats = stats
+
+
+def _parse_window(window: str) -> Dict[str, int]:
+    # "7d" / "12h" / "30m" / "90s" -> timedelta keyword arguments
+    units = {"d": "days", "h": "hours", "m": "minutes", "s": "seconds"}
+    unit = window[-1:]
+    amount = window[:-1]
+    if unit not in units or not amount.isdigit():
+        raise ValueError(f"Unsupported window '{window}', expected e.g. '7d', '12h', '30m' or '90s'")
+    return {units[unit]: int(amount)}
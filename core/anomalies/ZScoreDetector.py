@@ -17,9 +17,21 @@ def _is_numeric_dtype(dtype) -> bool:
 
 class ZScoreDetector(IAnomalyDetector):
 
-    def __init__(self) -> None:
+    def __init__(self, keep_z_columns: bool = True) -> None:
+        # keep_z_columns=False only adds anomaly_score, without one z_<col> column per feature
         self._stats: Dict[str, Tuple[float, float]] = {}
         self._feature_columns: Sequence[str] = []
+        self._keep_z_columns = keep_z_columns
+
+    @staticmethod
+    def _stable_std(n: int, std_val: float) -> float:
+        # stabilization for small sample sizes
+        if n < 3:
+            # minimal variance assumption → treat extreme values as anomalous
+            return 1.0
+        if std_val == 0.0 or std_val != std_val:
+            return 1.0
+        return std_val
 
     def fit(self, df: pl.DataFrame, feature_columns: Sequence[str]) -> None:
         if df.is_empty():
@@ -38,50 +50,41 @@ class ZScoreDetector(IAnomalyDetector):
                 raise TypeError(f"Feature column '{col}' must be numeric, got {series.dtype}")
 
             mean_val = float(series.mean())
-
-            # stabilization for small sample sizes
-            if n < 3:
-                # minimal variance assumption → treat extreme values as anomalous
-                std_val = 1.0
-            else:
-                std_val = float(series.std())
-                if std_val == 0.0 or std_val != std_val:
-                    std_val = 1.0
+            std_val = self._stable_std(n, float(series.std()) if n >= 3 else 1.0)
 
             self._stats[col] = (mean_val, std_val)
 
+        self._record_fit(df, self._feature_columns)
         logger.info("Fitted ZScoreDetector on columns: %s", self._feature_columns)
 
     def score(self, df: pl.DataFrame) -> pl.DataFrame:
         if not self._stats:
             raise RuntimeError("ZScoreDetector must be fitted before calling 'score'")
 
-        working = df.clone()
         z_expressions = []
 
         for col in self._feature_columns:
             mean_val, std_val = self._stats[col]
 
             z_expr = (
-                (pl.col(col) - mean_val)
-                .cast(pl.Float64)
+                (pl.col(col).cast(pl.Float64) - mean_val)
                 .truediv(std_val)
                 .alias(f"z_{col}")
             )
             z_expressions.append(z_expr)
 
-        working = working.with_columns(z_expressions)
+        # mean of |z| over the features, nulls are skipped like in the former list mean
+        if not self._keep_z_columns:
+            return df.with_columns(
+                pl.mean_horizontal([z.abs() for z in z_expressions]).alias("anomaly_score")
+            )
 
-        abs_cols = [f"z_{c}" for c in self._feature_columns]
+        z_cols = [f"z_{c}" for c in self._feature_columns]
 
-        working = working.with_columns(
-            pl.concat_list([pl.col(c).abs() for c in abs_cols])
-            .list.mean()
-            .alias("anomaly_score")
+        return df.with_columns(z_expressions).with_columns(
+            pl.mean_horizontal([pl.col(c).abs() for c in z_cols]).alias("anomaly_score")
         )
 
-        return working
-
     def detect(self, df: pl.DataFrame, threshold: float) -> pl.DataFrame:
         scored = self.score(df)
         scored = scored.with_columns(
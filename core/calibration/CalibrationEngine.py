@@ -0,0 +1,167 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Type, Union
+import numpy as np
+import polars as pl
+from core import instrumentation
+from core.calibration.GradientBoostingCalibrationModel import GradientBoostingCalibrationModel
+from core.calibration.LinearCalibrationModel import LinearCalibrationModel
+from core.calibration.RobustCalibrationModel import RobustCalibrationModel
+from core.interfaces.ICalibrationModel import ICalibrationModel
+from core.persistence import load_model, save_model
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+# bump when the saved payload layout changes
+CALIBRATION_FORMAT_VERSION = 1
+
+# model name -> implementation, CalibrationSpec.model refers to these names
+CALIBRATION_MODELS: Dict[str, Type[ICalibrationModel]] = {
+    "linear": LinearCalibrationModel,
+    "robust": RobustCalibrationModel,
+    "gbm": GradientBoostingCalibrationModel,
+}
+
+
+@dataclass(frozen=True)
+class CalibrationSpec:
+    # one pollutant: sensor_column is mapped onto reference_column, optionally
+    # corrected with covariates such as ("temperature", "humidity")
+    sensor_column: str
+    reference_column: str
+    covariates: Sequence[str] = ()
+    model: str = "linear"
+    model_params: Mapping[str, Any] = field(default_factory=dict)
+    # defaults to <sensor_column>_calibrated
+    output_column: Optional[str] = None
+
+    @property
+    def output(self) -> str:
+        return self.output_column or f"{self.sensor_column}_calibrated"
+
+    @property
+    def feature_columns(self) -> List[str]:
+        return [self.sensor_column, *self.covariates]
+
+
+class CalibrationEngine:
+    # fits one calibration model per pollutant on time-aligned sensor/reference pairs
+    # and applies all of them to sensor histories in a single with_columns pass
+    #
+    # linear and robust models become plain polars arithmetic, gradient boosting
+    # runs batch-wise through map_batches; apply() works on lazy frames as well
+
+    def __init__(self, specs: Sequence[CalibrationSpec]) -> None:
+        outputs = [spec.output for spec in specs]
+        if len(set(outputs)) != len(outputs):
+            raise ValueError(f"Calibration output columns must be unique, got {outputs}")
+        for spec in specs:
+            if spec.model not in CALIBRATION_MODELS:
+                raise ValueError(
+                    f"Unknown calibration model '{spec.model}', expected one of {list(CALIBRATION_MODELS)}"
+                )
+
+        self._specs = list(specs)
+        self._models: Dict[str, ICalibrationModel] = {}
+        self._fit_metadata: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def specs(self) -> List[CalibrationSpec]:
+        return list(self._specs)
+
+    @property
+    def fitted(self) -> bool:
+        return len(self._models) == len(self._specs)
+
+    @property
+    def models(self) -> Dict[str, ICalibrationModel]:
+        # fitted model per output column
+        return dict(self._models)
+
+    @property
+    def fit_metadata(self) -> Dict[str, Dict[str, Any]]:
+        # per output column: model, n_samples, rmse and r2 on the training pairs
+        return {out: dict(meta) for out, meta in self._fit_metadata.items()}
+
+    def fit(self, pairs: pl.DataFrame) -> None:
+        # pairs: one row per aligned timestamp with sensor, covariate and reference columns
+        if pairs.is_empty():
+            raise ValueError("Cannot fit CalibrationEngine on empty dataframe")
+
+        models = {}
+        metadata = {}
+        for spec in self._specs:
+            for col in [*spec.feature_columns, spec.reference_column]:
+                if col not in pairs.columns:
+                    raise ValueError(f"Calibration column '{col}' not in dataframe")
+
+            model = CALIBRATION_MODELS[spec.model](**spec.model_params)
+            with instrumentation.span(f"{type(model).__name__}.fit:{spec.output}", "calibrate", pairs):
+                model.fit(pairs, spec.reference_column, spec.feature_columns)
+            models[spec.output] = model
+            metadata[spec.output] = {"model": spec.model, **_fit_quality(model, pairs, spec.reference_column)}
+
+            logger.info(
+                "Calibrated '%s' against '%s' with %s model (n=%s, rmse=%.4g, r2=%.4g)",
+                spec.sensor_column,
+                spec.reference_column,
+                spec.model,
+                metadata[spec.output]["n_samples"],
+                metadata[spec.output]["rmse"],
+                metadata[spec.output]["r2"],
+            )
+
+        self._models = models
+        self._fit_metadata = metadata
+
+    def expressions(self) -> List[pl.Expr]:
+        if not self.fitted:
+            raise RuntimeError("CalibrationEngine must be fitted before 'apply'")
+        return [self._models[spec.output].expression().alias(spec.output) for spec in self._specs]
+
+    def apply(self, df: Frame) -> Frame:
+        # adds one calibrated column per spec, reference columns are not needed
+        exprs = self.expressions()
+        columns = df.collect_schema().names()
+        for spec in self._specs:
+            for col in spec.feature_columns:
+                if col not in columns:
+                    raise ValueError(f"Calibration feature column '{col}' not in dataframe")
+        with instrumentation.span("CalibrationEngine.apply", "calibrate", df) as span:
+            out = df.with_columns(exprs)
+            span.output(out)
+        return out
+
+    def save(self, path: Path) -> None:
+        # pickles execute code on load, only load files from trusted locations
+        if not self.fitted:
+            raise RuntimeError("CalibrationEngine must be fitted before 'save'")
+        save_model(path, self, CALIBRATION_FORMAT_VERSION, self.fit_metadata)
+
+    @classmethod
+    def load(cls, path: Path) -> "CalibrationEngine":
+        engine, _ = load_model(path, CALIBRATION_FORMAT_VERSION, cls)
+        return engine
+
+
+def _fit_quality(model: ICalibrationModel, pairs: pl.DataFrame, target_column: str) -> Dict[str, Any]:
+    # in-sample rmse and r2 over rows with both a prediction and a reference value
+    predicted = model.predict(pairs)
+    target = pairs.get_column(target_column).cast(pl.Float64).to_numpy()
+    valid = np.isfinite(predicted) & np.isfinite(target)
+
+    n = int(valid.sum())
+    if n == 0:
+        return {"n_samples": 0, "rmse": float("nan"), "r2": float("nan")}
+
+    residual = target[valid] - predicted[valid]
+    total = target[valid] - target[valid].mean()
+    ss_tot = float(total @ total)
+    return {
+        "n_samples": n,
+        "rmse": float(np.sqrt(residual @ residual / n)),
+        "r2": 1.0 - float(residual @ residual) / ss_tot if ss_tot > 0 else float("nan"),
+    }
@@ -0,0 +1,55 @@
+import logging
+from typing import List, Sequence
+import numpy as np
+import polars as pl
+from sklearn.ensemble import HistGradientBoostingRegressor
+from core.features.FeatureMatrix import FeatureMatrix
+from core.interfaces.ICalibrationModel import ICalibrationModel
+
+logger = logging.getLogger(__name__)
+
+
+class GradientBoostingCalibrationModel(ICalibrationModel):
+    # histogram gradient boosting for non-linear sensor responses (e.g. humidity
+    # growth of optical PM readings); kwargs go to HistGradientBoostingRegressor
+
+    def __init__(self, random_state: int | None = 42, **params) -> None:
+        self._model = HistGradientBoostingRegressor(random_state=random_state, **params)
+        self._feature_columns: List[str] = []
+
+    @property
+    def feature_columns(self) -> Sequence[str]:
+        return list(self._feature_columns)
+
+    def fit(self, df: pl.DataFrame, target_column: str, feature_columns: Sequence[str]) -> None:
+        self._feature_columns = list(feature_columns)
+        if target_column in self._feature_columns:
+            raise ValueError(f"Target column '{target_column}' cannot be a feature")
+
+        matrix = FeatureMatrix.from_frame(df, [*self._feature_columns, target_column], nulls="drop")
+        if matrix.n_rows == 0:
+            raise ValueError(f"Cannot fit {type(self).__name__} without complete rows")
+
+        self._model.fit(matrix.values[:, :-1], matrix.values[:, -1])
+
+        logger.info(
+            "Fitted %s for '%s' on %s rows (%s iterations)",
+            type(self).__name__,
+            target_column,
+            matrix.n_rows,
+            self._model.n_iter_,
+        )
+
+    def predict(self, df: pl.DataFrame) -> np.ndarray:
+        if not self._feature_columns:
+            raise RuntimeError(f"{type(self).__name__} must be fitted before 'predict'")
+
+        matrix = FeatureMatrix.from_frame(df, self._feature_columns, nulls="drop")
+        predicted = np.full(df.height, np.nan)
+        if matrix.n_rows:
+            values = self._model.predict(matrix.values)
+            if matrix.row_mask is None:
+                predicted[:] = values
+            else:
+                predicted[matrix.row_mask] = values
+        return predicted
@@ -0,0 +1,80 @@
+import logging
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+import polars as pl
+from core.features.FeatureMatrix import FeatureMatrix
+from core.interfaces.ICalibrationModel import ICalibrationModel
+
+logger = logging.getLogger(__name__)
+
+
+class LinearCalibrationModel(ICalibrationModel):
+    # ordinary least squares: target = intercept + sum(coef_i * feature_i)
+    # a single feature is the classic slope/offset correction, temperature and
+    # humidity covariates make it multilinear; applying it is plain polars arithmetic
+
+    def __init__(self, fit_intercept: bool = True) -> None:
+        self._fit_intercept = fit_intercept
+        self._feature_columns: List[str] = []
+        self._coef: np.ndarray = np.empty(0)
+        self._intercept: float = 0.0
+
+    @property
+    def feature_columns(self) -> Sequence[str]:
+        return list(self._feature_columns)
+
+    @property
+    def coefficients(self) -> Dict[str, float]:
+        return dict(zip(self._feature_columns, self._coef.tolist()))
+
+    @property
+    def intercept(self) -> float:
+        return self._intercept
+
+    def fit(self, df: pl.DataFrame, target_column: str, feature_columns: Sequence[str]) -> None:
+        self._feature_columns = list(feature_columns)
+        if target_column in self._feature_columns:
+            raise ValueError(f"Target column '{target_column}' cannot be a feature")
+
+        # one matrix for features and target, so rows missing either are dropped together
+        matrix = FeatureMatrix.from_frame(df, [*self._feature_columns, target_column], nulls="drop")
+        if matrix.n_rows <= len(self._feature_columns):
+            raise ValueError(
+                f"Cannot fit {type(self).__name__} on {matrix.n_rows} complete rows "
+                f"for {len(self._feature_columns)} features"
+            )
+
+        X = matrix.values[:, :-1]
+        y = matrix.values[:, -1]
+        self._coef, self._intercept = self._solve(X, y)
+
+        logger.info(
+            "Fitted %s for '%s' on %s rows (coef=%s, intercept=%.4g)",
+            type(self).__name__,
+            target_column,
+            matrix.n_rows,
+            self.coefficients,
+            self._intercept,
+        )
+
+    def _solve(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, float]:
+        if not self._fit_intercept:
+            coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+            return coef, 0.0
+
+        # centring instead of an intercept column keeps X unchanged and well conditioned
+        x_mean = X.mean(axis=0)
+        y_mean = float(y.mean())
+        coef, *_ = np.linalg.lstsq(X - x_mean, y - y_mean, rcond=None)
+        return coef, y_mean - float(x_mean @ coef)
+
+    def expression(self) -> pl.Expr:
+        if not self._feature_columns:
+            raise RuntimeError(f"{type(self).__name__} must be fitted before 'expression'")
+        expr = pl.lit(self._intercept, dtype=pl.Float64)
+        for col, coef in zip(self._feature_columns, self._coef):
+            expr = expr + pl.col(col).cast(pl.Float64) * float(coef)
+        return expr
+
+    def predict(self, df: pl.DataFrame) -> np.ndarray:
+        return df.select(self.expression()).to_series().to_numpy()
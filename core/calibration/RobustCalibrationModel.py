@@ -0,0 +1,27 @@
+from typing import Tuple
+import numpy as np
+from sklearn.linear_model import HuberRegressor
+from core.calibration.LinearCalibrationModel import LinearCalibrationModel
+
+
+class RobustCalibrationModel(LinearCalibrationModel):
+    # linear model fitted with the Huber loss, so spikes in the sensor or reference
+    # series pull the fit less than with least squares; applied like the linear model
+
+    def __init__(self, epsilon: float = 1.35, max_iter: int = 200) -> None:
+        super().__init__(fit_intercept=True)
+        self._epsilon = epsilon
+        self._max_iter = max_iter
+
+    def _solve(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, float]:
+        # lbfgs converges badly on raw µg/m³, °C and % scales, so fit on standardised
+        # features and map the coefficients back
+        mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0.0] = 1.0
+
+        huber = HuberRegressor(epsilon=self._epsilon, max_iter=self._max_iter, alpha=0.0)
+        huber.fit((X - mean) / scale, y)
+
+        coef = huber.coef_ / scale
+        return coef, float(huber.intercept_ - mean @ coef)
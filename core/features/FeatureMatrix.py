@@ -0,0 +1,116 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# "raise": refuse rows with null/NaN features (sklearn would fail later on them)
+# "drop": leave such rows out, row_mask tells which source rows were kept
+# "fill": replace null/NaN by fill_value
+NULL_POLICIES = ("raise", "drop", "fill")
+
+
+@dataclass(frozen=True)
+class FeatureMatrix:
+    # 2d numeric matrix of feature columns handed from polars to numpy/sklearn
+    #
+    # a single column without nulls in the requested dtype is a view on the polars
+    # buffer; otherwise every column is written once, straight from its Arrow
+    # buffer, into a Fortran ordered matrix of the requested dtype (no intermediate
+    # upcast copy); with spill_path that matrix is a memory-mapped .npy file
+    values: np.ndarray
+    columns: Tuple[str, ...]
+    # boolean mask over the source rows that made it into values, None when all did
+    row_mask: Optional[np.ndarray] = None
+
+    @property
+    def n_rows(self) -> int:
+        return self.values.shape[0]
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pl.DataFrame,
+        columns: Sequence[str],
+        dtype: Union[type, np.dtype] = np.float64,
+        nulls: str = "raise",
+        fill_value: float = 0.0,
+        spill_path: Optional[Path] = None,
+    ) -> "FeatureMatrix":
+        if nulls not in NULL_POLICIES:
+            raise ValueError(f"Unknown null policy '{nulls}', expected one of {list(NULL_POLICIES)}")
+
+        dtype = np.dtype(dtype)
+        if dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+            raise TypeError(f"Feature matrix dtype must be float32 or float64, got {dtype}")
+
+        columns = tuple(columns)
+        for col in columns:
+            if col not in df.columns:
+                raise ValueError(f"Feature column '{col}' not in dataframe")
+            if not df.schema[col].is_numeric():
+                raise TypeError(f"Feature column '{col}' must be numeric, got {df.schema[col]}")
+
+        features = df.select(columns)
+        missing = [_missing(col, features.schema[col]) for col in columns]
+        counts = features.select(m.sum().alias(c) for m, c in zip(missing, columns)).row(0)
+        row_mask = None
+
+        if any(counts):
+            per_column = {c: n for c, n in zip(columns, counts) if n}
+            if nulls == "raise":
+                raise ValueError(f"Feature columns contain null/NaN values: {per_column}")
+            if nulls == "drop":
+                row_mask = features.select(~pl.any_horizontal(missing)).to_series().to_numpy()
+                features = features.filter(row_mask)
+                logger.debug("Dropped %s rows with null/NaN features: %s", len(row_mask) - features.height, per_column)
+            else:
+                features = features.with_columns(
+                    pl.when(m).then(fill_value).otherwise(pl.col(c)).alias(c)
+                    for m, c in zip(missing, columns)
+                )
+
+        return cls(_to_numpy(features, dtype, spill_path), columns, row_mask)
+
+
+def _missing(col: str, dtype: pl.DataType) -> pl.Expr:
+    # null, and NaN for float columns
+    expr = pl.col(col).is_null()
+    if dtype.is_float():
+        expr = expr | pl.col(col).is_nan()
+    return expr
+
+
+def _to_numpy(features: pl.DataFrame, dtype: np.dtype, spill_path: Optional[Path]) -> np.ndarray:
+    n_rows, n_cols = features.shape
+
+    if spill_path is None and n_cols == 1:
+        series = features.to_series()
+        if series.n_chunks() > 1:
+            series = series.rechunk()
+        values = series.to_numpy()
+        if values.dtype == dtype:
+            # zero copy, read only view on the polars buffer
+            return values.reshape(-1, 1)
+        return values.astype(dtype).reshape(-1, 1)
+
+    if spill_path is not None:
+        spill_path = Path(spill_path)
+        spill_path.parent.mkdir(parents=True, exist_ok=True)
+        out = np.lib.format.open_memmap(
+            spill_path, mode="w+", dtype=dtype, shape=(n_rows, n_cols), fortran_order=True
+        )
+        logger.info("Spilling %sx%s %s feature matrix to '%s'", n_rows, n_cols, dtype, spill_path)
+    else:
+        out = np.empty((n_rows, n_cols), dtype=dtype, order="F")
+
+    # column by column: the source view is zero copy, the cast happens on assignment
+    for j, series in enumerate(features.iter_columns()):
+        out[:, j] = series.to_numpy()
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Union
+import polars as pl
+from core import instrumentation
+from core.preprocessing.utils.time_utils import parse_timestamp_column
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+
+def _season(month: pl.Expr) -> pl.Expr:
+    return (
+        pl.when(month.is_in([12, 1, 2])).then(0)  # winter
+        .when(month.is_in([3, 4, 5])).then(1)     # spring
+        .when(month.is_in([6, 7, 8])).then(2)     # summer
+        .otherwise(3)                             # fall
+    )
+
+
+# time part name -> expression over the parsed timestamp
+# day_of_week uses the Python convention Monday=0 .. Sunday=6
+TIME_PARTS: Dict[str, Callable[[pl.Expr], pl.Expr]] = {
+    "hour": lambda ts: ts.dt.hour(),
+    "day_of_week": lambda ts: ts.dt.weekday() - 1,
+    "month": lambda ts: ts.dt.month(),
+    "year": lambda ts: ts.dt.year(),
+    "is_weekend": lambda ts: ts.dt.weekday() >= 6,  # Saturday, Sunday
+    "season": lambda ts: _season(ts.dt.month()),
+}
+
+ROLLING_STATS = ("mean", "std")
+
+
+@dataclass(frozen=True)
+class TimeParts:
+    # calendar features derived from the timestamp
+    parts: Sequence[str] = tuple(TIME_PARTS)
+
+
+@dataclass(frozen=True)
+class Rolling:
+    # time based rolling statistics over (t - window, t], named <col>_roll_<stat>_<window>
+    columns: Sequence[str]
+    windows: Sequence[str]
+    stats: Sequence[str] = ROLLING_STATS
+    min_samples: int = 1
+
+
+@dataclass(frozen=True)
+class Lag:
+    # value periods rows earlier, named <col>_lag_<period>
+    columns: Sequence[str]
+    periods: Sequence[int] = (1,)
+
+
+@dataclass(frozen=True)
+class Diff:
+    # difference to the value periods rows earlier, named <col>_diff_<period>
+    columns: Sequence[str]
+    periods: Sequence[int] = (1,)
+
+
+FeatureSpec = Union[TimeParts, Rolling, Lag, Diff]
+
+
+class FeaturePlan:
+    # declarative feature set compiled into a single with_columns pass
+    #
+    # a string timestamp is parsed once up front (format detected from a sample and
+    # kept on the plan, values outside it are parsed by inference), a Datetime one is used as is; inlining the parse would re-run it inside every
+    # rolling/time expression; row order matters for Lag/Diff only, so the sorted
+    # check runs once and only when such features are planned
+
+    def __init__(
+        self,
+        features: Sequence[FeatureSpec],
+        timestamp: str = "timestamp",
+        group_by: Optional[Union[str, Sequence[str]]] = None,
+        timestamp_formats: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        # timestamp_formats: detected format cache, pass one dict to share it between plans
+        self._features = list(features)
+        self._timestamp_formats = {} if timestamp_formats is None else timestamp_formats
+        self._timestamp = timestamp
+        self._group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+
+        for spec in self._features:
+            if isinstance(spec, TimeParts):
+                unknown = set(spec.parts) - set(TIME_PARTS)
+                if unknown:
+                    raise ValueError(f"Unknown time parts: {sorted(unknown)}")
+            elif isinstance(spec, Rolling):
+                unknown = set(spec.stats) - set(ROLLING_STATS)
+                if unknown:
+                    raise ValueError(f"Unknown rolling stats: {sorted(unknown)}")
+            elif not isinstance(spec, (Lag, Diff)):
+                raise TypeError(f"Unsupported feature spec: {type(spec).__name__}")
+
+    @property
+    def order_dependent(self) -> bool:
+        return any(isinstance(spec, (Lag, Diff)) for spec in self._features)
+
+    def _over(self, expr: pl.Expr) -> pl.Expr:
+        return expr.over(self._group_by) if self._group_by else expr
+
+    def _check_columns(self, schema: pl.Schema) -> None:
+        if self._timestamp not in schema:
+            raise ValueError(f"DataFrame must contain a '{self._timestamp}' column")
+
+        for group_col in self._group_by:
+            if group_col not in schema:
+                raise ValueError(f"Group column '{group_col}' not in DataFrame")
+
+        for spec in self._features:
+            for col in getattr(spec, "columns", ()):
+                if col not in schema:
+                    raise ValueError(f"Feature column '{col}' not in DataFrame")
+                # require numeric dtype
+                if not schema[col].is_numeric():
+                    raise TypeError(f"Feature '{col}' must be numeric")
+
+    def _check_sorted(self, df: pl.DataFrame) -> None:
+        # sorted by timestamp, within each group when grouped
+        step = pl.col(self._timestamp).diff()
+        if self._group_by:
+            step = step.over(self._group_by)
+        unsorted = df.select((step < pl.duration(microseconds=0)).any()).item()
+        if unsorted:
+            raise ValueError(
+                f"Lag/Diff features require rows sorted by '{self._timestamp}'"
+                + (f" within {self._group_by}" if self._group_by else "")
+            )
+
+    def expressions(self, schema: pl.Schema) -> List[pl.Expr]:
+        # all feature expressions for one with_columns, the timestamp must be parsed already
+        self._check_columns(schema)
+        if not schema[self._timestamp].is_temporal():
+            raise TypeError(f"Column '{self._timestamp}' must be a datetime, use apply() to parse it")
+
+        ts = pl.col(self._timestamp)
+        exprs: List[pl.Expr] = []
+
+        for spec in self._features:
+            if isinstance(spec, TimeParts):
+                exprs.extend(TIME_PARTS[part](ts).alias(part) for part in spec.parts)
+
+            elif isinstance(spec, Rolling):
+                for col in spec.columns:
+                    for win in spec.windows:
+                        for stat in spec.stats:
+                            rolling = getattr(pl.col(col), f"rolling_{stat}_by")(
+                                ts, window_size=win, min_samples=spec.min_samples, closed="right"
+                            )
+                            exprs.append(self._over(rolling).alias(f"{col}_roll_{stat}_{win}"))
+
+            elif isinstance(spec, Lag):
+                for col in spec.columns:
+                    for period in spec.periods:
+                        exprs.append(self._over(pl.col(col).shift(period)).alias(f"{col}_lag_{period}"))
+
+            elif isinstance(spec, Diff):
+                for col in spec.columns:
+                    for period in spec.periods:
+                        exprs.append(self._over(pl.col(col).diff(period)).alias(f"{col}_diff_{period}"))
+
+        return exprs
+
+    def apply(self, df: Frame) -> Frame:
+        # lazy frames are not checked for order, the caller guarantees it
+        if not instrumentation.enabled():
+            return self._apply(df)
+
+        names = "+".join(type(spec).__name__ for spec in self._features)
+        with instrumentation.span(f"FeaturePlan[{names}]", "features", df) as span:
+            out = self._apply(df)
+            span.output(out)
+        return out
+
+    def _apply(self, df: Frame) -> Frame:
+        schema = df.collect_schema()
+        self._check_columns(schema)
+
+        if schema[self._timestamp] == pl.String:
+            parsed = parse_timestamp_column(df, self._timestamp, self._timestamp_formats)
+            df = df.with_columns(parsed.alias(self._timestamp))
+            schema = df.collect_schema()
+
+        if self.order_dependent and isinstance(df, pl.DataFrame):
+            self._check_sorted(df)
+
+        return df.with_columns(self.expressions(schema))
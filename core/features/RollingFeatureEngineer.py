@@ -1,50 +1,34 @@
 import polars as pl
-from typing import Sequence, List
+from typing import Dict, Optional, Sequence, Union
+from core.features.FeaturePlan import FeaturePlan, Rolling
 
 
 class RollingFeatureEngineer:
     # Robust time-based rolling windows (Polars >= 1.20)
+    # native rolling_*_by kernels keep a sliding accumulator, O(n) per column and window
+
+    def __init__(self) -> None:
+        # timestamp format detected on the first string input, reused by later calls
+        self._timestamp_formats: Dict[str, Optional[str]] = {}
 
     def add_rolling_features(
         self,
-        df: pl.DataFrame,
+        df: Union[pl.DataFrame, pl.LazyFrame],
         feature_columns: Sequence[str],
         windows: Sequence[str],
-    ) -> pl.DataFrame:
-
-        if df.is_empty():
+        group_by: Optional[Union[str, Sequence[str]]] = None,
+        min_samples: int = 1,
+    ) -> Union[pl.DataFrame, pl.LazyFrame]:
+        # all feature_columns x windows are computed in one with_columns pass, each
+        # window is (t - win, t]; group_by (e.g. "station_id") restricts every window
+        # to rows of the same group
+
+        if isinstance(df, pl.DataFrame) and df.is_empty():
             return df
 
-        if "timestamp" not in df.columns:
-            raise ValueError("DataFrame must contain a 'timestamp' column")
-
-        # ensure timestamp is datetime
-        working = df.with_columns(
-            pl.col("timestamp").str.strptime(pl.Datetime, strict=False)
+        plan = FeaturePlan(
+            [Rolling(feature_columns, windows, min_samples=min_samples)],
+            group_by=group_by,
+            timestamp_formats=self._timestamp_formats,
         )
-
-        exprs: List[pl.Expr] = []
-
-        for col in feature_columns:
-            if col not in working.columns:
-                raise ValueError(f"Feature column '{col}' not in DataFrame")
-
-            # require numeric dtype
-            if working[col].dtype not in pl.NUMERIC_DTYPES:
-                raise TypeError(f"Feature '{col}' must be numeric")
-
-            for win in windows:
-                # rolling returns list -> use .list.mean() / .list.std()
-                roll = (
-                    pl.col(col)
-                    .rolling(index_column="timestamp", period=win, closed="right")
-                )
-
-                exprs.append(
-                    roll.list.mean().alias(f"{col}_roll_mean_{win}")
-                )
-                exprs.append(
-                    roll.list.std().alias(f"{col}_roll_std_{win}")
-                )
-
-        return working.with_columns(exprs)
+        return plan.apply(df)
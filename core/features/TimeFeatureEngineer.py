@@ -1,39 +1,18 @@
 import polars as pl
+from typing import Dict, Optional
+from core.features.FeaturePlan import FeaturePlan, TimeParts
 
 class TimeFeatureEngineer:
     # add derived time-based features to a dataframe containing a datetime column 'timestamp'
 
+    def __init__(self) -> None:
+        # timestamp format detected on the first string input, reused by later calls
+        self._timestamp_formats: Dict[str, Optional[str]] = {}
+
     def add_time_features(self, df: pl.DataFrame) -> pl.DataFrame:
-        if "timestamp" not in df.columns:
+        if "timestamp" not in df.collect_schema():
             raise ValueError("Expected column 'timestamp' in dataframe")
 
-        # robust timestamp parsing
-        working = df.with_columns(
-            pl.col("timestamp")
-            .str.strptime(pl.Datetime, strict=False)
-            .alias("timestamp")
-        )
-
-        # season mapping helper
-        def season_expr(col):
-            return (
-                pl.when(col.is_in([12, 1, 2])).then(0)  # winter
-                .when(col.is_in([3, 4, 5])).then(1)     # spring
-                .when(col.is_in([6, 7, 8])).then(2)     # summer
-                .otherwise(3)                           # fall
-            )
-
-        # compute weekday in Python convention:
-        # Monday=0, Sunday=6
-        weekday_expr = (pl.col("timestamp").dt.weekday() - 1)
-
-        working = working.with_columns([
-            pl.col("timestamp").dt.hour().alias("hour"),
-            weekday_expr.alias("day_of_week"),
-            pl.col("timestamp").dt.month().alias("month"),
-            pl.col("timestamp").dt.year().alias("year"),
-            (weekday_expr >= 5).alias("is_weekend"),  # Saturday(5), Sunday(6)
-            season_expr(pl.col("timestamp").dt.month()).alias("season"),
-        ])
-
-        return working
+        # hour, day_of_week (Monday=0), month, year, is_weekend, season (winter=0 .. fall=3)
+        # the timestamp is only parsed when it still is a string
+        return FeaturePlan([TimeParts()], timestamp_formats=self._timestamp_formats).apply(df)
@@ -0,0 +1,232 @@
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+import json
+import logging
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# ru_maxrss is reported in KiB on Linux
+_RSS_UNIT = 1024
+
+
+@dataclass
+class Span:
+    # one measured call: a loader load, a preprocessing step, a detector fit, ...
+    name: str
+    category: str
+    parent: Optional[str]
+    depth: int
+    started_at: float  # unix time
+    wall_s: float = 0.0
+    # process CPU time (all threads), overlaps when spans run concurrently
+    cpu_s: float = 0.0
+    # growth of the process peak RSS during the span, None without `resource`
+    peak_rss_delta_bytes: Optional[int] = None
+    # None for lazy frames, which are not materialized at that point
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    bytes_in: Optional[int] = None
+    bytes_out: Optional[int] = None
+    error: Optional[str] = None
+
+
+def _peak_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+def _frame_size(frame: Any) -> "tuple[Optional[int], Optional[int]]":
+    # (rows, bytes) of an eager frame, (None, None) for anything else
+    height = getattr(frame, "height", None)
+    if height is None or not hasattr(frame, "estimated_size"):
+        return None, None
+    return height, frame.estimated_size()
+
+
+class RunReport:
+    # spans recorded while instrumentation was enabled, oldest first
+
+    def __init__(self, max_spans: int) -> None:
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"spans": [asdict(span) for span in self.spans]}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def table(self) -> str:
+        # fixed width text table in start order, nested spans are indented under
+        # their parent, failed spans are marked with "!"
+        header = ("span", "wall ms", "cpu ms", "rss +MiB", "rows in", "rows out", "MiB in", "MiB out")
+        rows = [header]
+
+        for span in sorted(self.spans, key=lambda s: s.started_at):
+            rows.append((
+                "  " * span.depth + f"{span.category}:{span.name}" + (" !" if span.error else ""),
+                f"{span.wall_s * 1000:.1f}",
+                f"{span.cpu_s * 1000:.1f}",
+                _mib(span.peak_rss_delta_bytes),
+                _count(span.rows_in),
+                _count(span.rows_out),
+                _mib(span.bytes_in),
+                _mib(span.bytes_out),
+            ))
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = [
+            "  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+            for row in rows
+        ]
+        lines.insert(1, "-" * len(lines[0]))
+        return "\n".join(lines)
+
+
+def _mib(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value / 2**20:.1f}"
+
+
+def _count(value: Optional[int]) -> str:
+    return "-" if value is None else str(value)
+
+
+class _ActiveSpan:
+    def __init__(self, recorder: "_Recorder", name: str, category: str, frame_in: Any) -> None:
+        self._recorder = recorder
+        self._span = Span(name=name, category=category, parent=None, depth=0, started_at=0.0)
+        self._span.rows_in, self._span.bytes_in = _frame_size(frame_in)
+
+    def output(self, frame: Any) -> None:
+        # record rows/bytes of the produced frame
+        self._span.rows_out, self._span.bytes_out = _frame_size(frame)
+
+    def inputs(self, rows: Optional[int] = None, nbytes: Optional[int] = None) -> None:
+        # input size for inputs that are not frames, e.g. source files of a loader
+        self._span.rows_in, self._span.bytes_in = rows, nbytes
+
+    def __enter__(self) -> "_ActiveSpan":
+        stack = self._recorder.stack()
+        self._span.parent = stack[-1] if stack else None
+        self._span.depth = len(stack)
+        stack.append(f"{self._span.category}:{self._span.name}")
+        self._rss = _peak_rss()
+        self._span.started_at = time.time()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._span.wall_s = time.perf_counter() - self._wall
+        self._span.cpu_s = time.process_time() - self._cpu
+        rss = _peak_rss()
+        if rss is not None and self._rss is not None:
+            self._span.peak_rss_delta_bytes = rss - self._rss
+        if exc_type is not None:
+            self._span.error = f"{exc_type.__name__}: {exc}"
+        self._recorder.stack().pop()
+        self._recorder.finish(self._span)
+
+
+class _NoopSpan:
+    # returned while instrumentation is disabled, every call is a no-op
+    def output(self, frame: Any) -> None:
+        pass
+
+    def inputs(self, rows: Optional[int] = None, nbytes: Optional[int] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Recorder:
+    def __init__(self, export_path: Optional[Path], max_spans: int) -> None:
+        self.report = RunReport(max_spans)
+        self._export_path = None if export_path is None else Path(export_path)
+        self._export_lock = threading.Lock()
+        # parent chain per thread, spans of pool workers start at top level
+        self._local = threading.local()
+
+    def stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def finish(self, span: Span) -> None:
+        self.report.add(span)
+        if self._export_path is not None:
+            # one JSON line per span as soon as it closes, a crashed run keeps its spans
+            line = json.dumps(asdict(span))
+            with self._export_lock, self._export_path.open("a", encoding="utf8") as handle:
+                handle.write(line + "\n")
+
+
+_recorder: Optional[_Recorder] = None
+
+
+def span(name: str, category: str, frame_in: Any = None) -> Any:
+    # context manager measuring the enclosed block; call .output(frame) with the
+    # result to record rows/bytes out; costs one global lookup when disabled
+    recorder = _recorder
+    if recorder is None:
+        return _NOOP
+    return _ActiveSpan(recorder, name, category, frame_in)
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+def enable(export_path: Optional[Path] = None, max_spans: int = 100_000) -> RunReport:
+    # start recording process wide; export_path appends every span as a JSON line;
+    # the report keeps the latest max_spans spans
+    global _recorder
+    _recorder = _Recorder(export_path, max_spans)
+    logger.info("Instrumentation enabled (export_path=%s)", export_path)
+    return _recorder.report
+
+
+def disable() -> None:
+    global _recorder
+    _recorder = None
+
+
+@contextmanager
+def recording(export_path: Optional[Path] = None, max_spans: int = 100_000) -> Iterator[RunReport]:
+    # with recording() as report: pipeline.run(...); print(report.table())
+    # the previously active recorder (if any) is restored afterwards
+    global _recorder
+    previous = _recorder
+    report = enable(export_path, max_spans)
+    try:
+        yield report
+    finally:
+        _recorder = previous
@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Sequence
 import polars as pl
+from core.persistence import load_model, save_model
+
+# bump when the saved payload layout changes
+MODEL_FORMAT_VERSION = 1
+
 
 class IAnomalyDetector(ABC):
     # contract for all anomaly detectors in the system
@@ -19,3 +26,30 @@ class IAnomalyDetector(ABC):
     def detect(self, df: pl.DataFrame, threshold: float) -> pl.DataFrame:
         # apply a threshold to 'anomaly_score' and return df with extra boolean column 'is_anomaly'
         pass
+
+    @property
+    def fit_metadata(self) -> Dict[str, Any]:
+        # n_samples, feature_schema and fitted_at of the last fit, empty if never fitted
+        return dict(getattr(self, "_fit_metadata", {}))
+
+    def _record_fit(self, df: pl.DataFrame, feature_columns: Sequence[str]) -> None:
+        # called by implementations at the end of fit
+        self._fit_metadata = {
+            "n_samples": df.height,
+            "feature_schema": {col: str(df.schema[col]) for col in feature_columns},
+            "fitted_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def save(self, path: Path) -> None:
+        # persist the fitted detector as a versioned pickle with its fit metadata
+        # pickles execute code on load, only load files from trusted locations
+        metadata = self.fit_metadata
+        if not metadata:
+            raise RuntimeError(f"{type(self).__name__} must be fitted before 'save'")
+        save_model(path, self, MODEL_FORMAT_VERSION, metadata)
+
+    @classmethod
+    def load(cls, path: Path) -> "IAnomalyDetector":
+        # load a detector written by save(), it must be an instance of cls
+        detector, _ = load_model(path, MODEL_FORMAT_VERSION, cls)
+        return detector
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+import numpy as np
+import polars as pl
+
+
+class ICalibrationModel(ABC):
+    # contract for models mapping low-cost sensor readings (plus covariates such as
+    # temperature/humidity) onto reference values
+
+    @abstractmethod
+    def fit(self, df: pl.DataFrame, target_column: str, feature_columns: Sequence[str]) -> None:
+        # train on time-aligned sensor/reference pairs, rows with nulls are ignored
+        pass
+
+    @abstractmethod
+    def predict(self, df: pl.DataFrame) -> np.ndarray:
+        # calibrated values for every row of df, NaN where a feature is missing
+        pass
+
+    @property
+    @abstractmethod
+    def feature_columns(self) -> Sequence[str]:
+        pass
+
+    def expression(self) -> pl.Expr:
+        # calibrated values as an expression, usable on lazy frames and in one
+        # with_columns together with other pollutants; the default runs predict()
+        # batch-wise, closed form models override it with native arithmetic
+        columns = list(self.feature_columns)
+
+        def run(batch: pl.Series) -> pl.Series:
+            return pl.Series(self.predict(batch.struct.unnest()), nan_to_null=True)
+
+        return pl.struct(columns).map_batches(run, return_dtype=pl.Float64, is_elementwise=True)
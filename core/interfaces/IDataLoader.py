@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import List, Optional
 import polars as pl
+from core.loaders.dataset_cache import fingerprint_sources
 from core.loaders.dataset_ids import DatasetId
 
 class IDataLoader(ABC):
@@ -8,3 +10,19 @@ class IDataLoader(ABC):
     @abstractmethod
     def load_dataset(self, dataset_id: DatasetId) -> pl.DataFrame:
         pass
+
+    def scan_dataset(self, dataset_id: DatasetId) -> pl.LazyFrame:
+        # lazy variant used by the lazy pipeline mode; loaders that can build a
+        # query plan without reading the data override this
+        return self.load_dataset(dataset_id).lazy()
+
+    def source_files(self, dataset_id: DatasetId) -> List[Path]:
+        # raw files the dataset is read from, used to key derived caches such as
+        # rollups; empty means unknown, derived results are then not cached
+        return []
+
+    def source_fingerprint(self, dataset_id: DatasetId) -> Optional[str]:
+        # content identity of what load_dataset would return: source file
+        # fingerprints, loaders add their config; None if the sources are unknown
+        files = self.source_files(dataset_id)
+        return fingerprint_sources(files) if files else None
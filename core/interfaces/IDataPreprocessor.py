@@ -3,6 +3,7 @@ import polars as pl
 
 class IDataPreprocessor(ABC):
     # contract for all preprocessing components
+    # a LazyFrame input must yield a LazyFrame, so steps extend the plan instead of collecting
     @abstractmethod
-    def preprocess(self, df: pl.DataFrame) -> pl.DataFrame:
+    def preprocess(self, df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
         pass
@@ -1,11 +1,13 @@
+from functools import partial
 from pathlib import Path
 import logging
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 import polars as pl
 
 from core.interfaces.IDataLoader import IDataLoader
 from .dataset_ids import DatasetId
 from .dataset_config import DatasetConfig, DATASET_REGISTRY
+from .dataset_cache import DatasetCache, config_key, fingerprint_sources
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +18,19 @@ class AirUpDatasetLoader(IDataLoader):
     def __init__(
         self,
         base_path: Path,
-        registry: Dict[DatasetId, DatasetConfig] = DATASET_REGISTRY
+        registry: Dict[DatasetId, DatasetConfig] = DATASET_REGISTRY,
+        columns: Optional[Iterable[str]] = None,
+        cache: Optional[DatasetCache] = None,
     ) -> None:
         # store base path and injected registry
         self._base_path = base_path
         self._registry = registry
+        # optional raw column projection (names before rename), None = read all columns
+        # not derived automatically: whoever builds the loader passes e.g.
+        # AirUpSensorPreprocessor().input_columns() to project to the preprocessor keep-set
+        self._columns = None if columns is None else frozenset(columns)
+        # optional columnar cache, parsed log files are cached one by one
+        self._cache = cache
 
     def _get_config(self, dataset_id: DatasetId) -> DatasetConfig:
         # retrieve dataset config from injected registry
@@ -38,9 +48,34 @@ class AirUpDatasetLoader(IDataLoader):
             return "airup_sont_c_avg_every_minute_data.log.*"
         raise ValueError(f"AirUpDatasetLoader does not support dataset_id={dataset_id.value}")
 
-    def load_dataset(self, dataset_id: DatasetId) -> pl.DataFrame:
-        # load and concatenate all AirUp log files for dataset id
-        config = self._get_config(dataset_id)
+    def _project(
+        self,
+        lf: pl.LazyFrame,
+        projection: Optional[frozenset],
+    ) -> pl.LazyFrame:
+        # push column projection into the csv scan, keeping the file's column order
+        if projection is None:
+            return lf
+        names = lf.collect_schema().names()
+        return lf.select([c for c in names if c in projection])
+
+    def _scan_file(
+        self,
+        file_path: Path,
+        config: DatasetConfig,
+        projection: Optional[frozenset],
+    ) -> pl.LazyFrame:
+        lf = pl.scan_csv(
+            file_path,
+            has_header=config.has_header,
+            separator=config.delimiter,
+            encoding=config.encoding,
+            null_values=config.null_values,
+        )
+        return self._project(lf, projection)
+
+    def _resolve_files(self, dataset_id: DatasetId, config: DatasetConfig) -> List[Path]:
+        # validate dataset directory and return its log files in chronological order
         directory = self._base_path / config.relative_path
 
         logger.debug(
@@ -72,35 +107,28 @@ class AirUpDatasetLoader(IDataLoader):
                 f"with pattern '{pattern}'"
             )
 
-        lazy_frames: List[pl.LazyFrame] = []
-
-        for file_path in files:
-            logger.debug(
-                "Scanning AirUp log file '%s' for dataset '%s'",
-                file_path,
-                dataset_id.value
-            )
-            lf = pl.scan_csv(
-                file_path,
-                has_header=config.has_header,
-                separator=config.delimiter,
-                encoding=config.encoding,
-                null_values=config.null_values,
-            )
-            lazy_frames.append(lf)
-
-        scan = lazy_frames[0] if len(lazy_frames) == 1 else pl.concat(lazy_frames)
-        df = scan.collect()
+        return files
 
+    def _normalize(
+        self,
+        df: pl.DataFrame | pl.LazyFrame,
+        dataset_id: DatasetId,
+        config: DatasetConfig,
+    ) -> pl.DataFrame | pl.LazyFrame:
+        # apply config renames, required column check and dtype casts
+        # works on eager frames and on lazy plans (only the schema is resolved)
         if config.rename_columns:
-            df = df.rename(config.rename_columns)
+            # projected-away columns cannot be renamed, the required check below reports them
+            df = df.rename(config.rename_columns, strict=False)
             logger.debug(
                 "Applied column renames for AirUp dataset '%s': %s",
                 dataset_id.value,
                 config.rename_columns,
             )
 
-        missing = set(config.required_columns) - set(df.columns)
+        columns = set(df.collect_schema().names())
+
+        missing = set(config.required_columns) - columns
         if missing:
             logger.error(
                 "Missing required columns for AirUp dataset '%s': %s",
@@ -113,9 +141,10 @@ class AirUpDatasetLoader(IDataLoader):
             )
 
         if config.dtypes:
+            casts = []
             for col_name, dtype in config.dtypes.items():
-                if col_name in df.columns:
-                    df = df.with_columns(pl.col(col_name).cast(dtype))
+                if col_name in columns:
+                    casts.append(pl.col(col_name).cast(dtype))
                     logger.debug(
                         "Cast column '%s' to dtype '%s' for AirUp dataset '%s'",
                         col_name,
@@ -128,11 +157,85 @@ class AirUpDatasetLoader(IDataLoader):
                         col_name,
                         dataset_id.value,
                     )
+            if casts:
+                df = df.with_columns(casts)
 
-        logger.info(
-            "Loaded AirUp dataset '%s' (files=%s, rows=%s, cols=%s)",
+        return df
+
+    def source_files(self, dataset_id: DatasetId) -> List[Path]:
+        return self._resolve_files(dataset_id, self._get_config(dataset_id))
+
+    def source_fingerprint(self, dataset_id: DatasetId) -> Optional[str]:
+        config = self._get_config(dataset_id)
+        variant = () if self._columns is None else sorted(self._columns)
+        return fingerprint_sources(
+            self._resolve_files(dataset_id, config), extra=[config_key(config, variant)]
+        )
+
+    def scan_dataset(
+        self,
+        dataset_id: DatasetId,
+        columns: Optional[Iterable[str]] = None,
+    ) -> pl.LazyFrame:
+        # lazy plan over all AirUp log files for dataset id
+        # columns overrides the projection given at construction time
+        config = self._get_config(dataset_id)
+        projection = self._columns if columns is None else frozenset(columns)
+        files = self._resolve_files(dataset_id, config)
+
+        variant = () if projection is None else sorted(projection)
+        if self._cache is not None:
+            self._cache.prune(dataset_id, config, files, variant=variant)
+
+        lazy_frames: List[pl.LazyFrame] = []
+
+        for file_path in files:
+            logger.debug(
+                "Scanning AirUp log file '%s' for dataset '%s'",
+                file_path,
+                dataset_id.value
+            )
+
+            if self._cache is not None:
+                lf = self._cache.scan(
+                    dataset_id,
+                    config,
+                    file_path,
+                    partial(self._scan_file, file_path, config, projection),
+                    variant=variant,
+                )
+            else:
+                lf = self._scan_file(file_path, config, projection)
+
+            lazy_frames.append(lf)
+
+        # relaxed concat: per-file inference may type an all-null column as String
+        scan = (
+            lazy_frames[0]
+            if len(lazy_frames) == 1
+            else pl.concat(lazy_frames, how="vertical_relaxed")
+        )
+
+        logger.debug(
+            "Built AirUp scan for dataset '%s' (files=%s, projected=%s)",
             dataset_id.value,
             len(files),
+            projection is not None,
+        )
+
+        return self._normalize(scan, dataset_id, config)
+
+    def load_dataset(
+        self,
+        dataset_id: DatasetId,
+        columns: Optional[Iterable[str]] = None,
+    ) -> pl.DataFrame:
+        # load and concatenate all AirUp log files for dataset id
+        df = self.scan_dataset(dataset_id, columns).collect()
+
+        logger.info(
+            "Loaded AirUp dataset '%s' (rows=%s, cols=%s)",
+            dataset_id.value,
             df.height,
             df.width,
         )
@@ -0,0 +1,370 @@
+from pathlib import Path
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional
+import polars as pl
+
+from .airup_dataset_loader import AirUpDatasetLoader
+from .dataset_ids import DatasetId
+from .dataset_config import DatasetConfig, DATASET_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# bump when the store layout or the state file format changes
+STORE_FORMAT_VERSION = 1
+
+# leading bytes of every log file that are fingerprinted to detect rewritten files
+_HEAD_BYTES = 4096
+
+# dtypes csv inference can produce, used to restore the pinned schema from state.json
+_CSV_DTYPES = {
+    "Int64": pl.Int64,
+    "Float64": pl.Float64,
+    "String": pl.String,
+    "Boolean": pl.Boolean,
+}
+
+
+class IncrementalAirUpDatasetLoader(AirUpDatasetLoader):
+    # append-only ingestion of AirUp daily log files into a persisted store
+    #
+    # per dataset the store keeps a state file with the byte offset up to which
+    # every log file has been ingested, plus one Arrow IPC part per ingest run:
+    #   <store_path>/<dataset_id>/state.json
+    #   <store_path>/<dataset_id>/part-00000.arrow, part-00001.arrow, ...
+    # only complete lines are ingested, a partially written last line of the
+    # still-growing current-day file is picked up by the next ingest
+    #
+    # the state also pins the store schema: every column gets the supertype of all
+    # dtypes inferred so far, columns that were null in every delta stay unresolved
+    # (stored as Null), so dtypes do not depend on how a file was split into ingest runs
+
+    def __init__(
+        self,
+        base_path: Path,
+        store_path: Path,
+        registry: Dict[DatasetId, DatasetConfig] = DATASET_REGISTRY,
+        columns: Optional[Iterable[str]] = None,
+    ) -> None:
+        super().__init__(base_path, registry=registry, columns=columns)
+        self._store_path = Path(store_path)
+
+    def _dataset_dir(self, dataset_id: DatasetId) -> Path:
+        return self._store_path / dataset_id.value
+
+    def _projection_key(self) -> Optional[List[str]]:
+        return None if self._columns is None else sorted(self._columns)
+
+    def _read_state(self, dataset_id: DatasetId) -> Dict[str, Any]:
+        state_file = self._dataset_dir(dataset_id) / "state.json"
+        empty = {
+            "version": STORE_FORMAT_VERSION,
+            "projection": self._projection_key(),
+            "parts": 0,
+            "files": {},
+            "schema": [],
+        }
+
+        if not state_file.exists():
+            return empty
+
+        state = json.loads(state_file.read_text(encoding="utf8"))
+
+        if state.get("version") != STORE_FORMAT_VERSION:
+            raise RuntimeError(
+                f"Incremental store for {dataset_id.value} has format version "
+                f"{state.get('version')}, expected {STORE_FORMAT_VERSION}; call reset()"
+            )
+
+        if state.get("projection") != self._projection_key():
+            raise RuntimeError(
+                f"Incremental store for {dataset_id.value} was built with a different "
+                "column projection; call reset()"
+            )
+
+        return state
+
+    def _write_state(self, dataset_id: DatasetId, state: Dict[str, Any]) -> None:
+        # write-then-rename so an interrupted run never leaves a truncated state file
+        state_file = self._dataset_dir(dataset_id) / "state.json"
+        tmp = state_file.with_name(f"state.json.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf8")
+        os.replace(tmp, state_file)
+
+    def _head_digest(self, file_path: Path, length: int) -> str:
+        with file_path.open("rb") as handle:
+            return hashlib.sha256(handle.read(length)).hexdigest()
+
+    def _delta_columns(self, header: bytes, config: DatasetConfig) -> Optional[List[str]]:
+        # push the projection into read_csv, needs column names from the header line
+        if self._columns is None or not config.has_header:
+            return None
+        names = pl.read_csv(
+            io.BytesIO(header),
+            separator=config.delimiter,
+            encoding=config.encoding,
+            n_rows=0,
+        ).columns
+        return [c for c in names if c in self._columns]
+
+    def _read_delta(
+        self,
+        file_path: Path,
+        config: DatasetConfig,
+        entry: Optional[Dict[str, Any]],
+    ) -> tuple[Optional[pl.DataFrame], Optional[Dict[str, Any]]]:
+        # read the complete lines appended to file_path since the last ingest
+        size = file_path.stat().st_size
+        offset = 0 if entry is None else entry["offset"]
+        header = b"" if entry is None else entry["header"].encode("utf8")
+
+        if size < offset:
+            raise RuntimeError(
+                f"AirUp log file '{file_path}' shrank below its ingested offset "
+                f"({size} < {offset}); the store is not append-only anymore, call reset()"
+            )
+
+        if entry is not None and self._head_digest(file_path, entry["head_len"]) != entry["head_sha256"]:
+            raise RuntimeError(
+                f"AirUp log file '{file_path}' was rewritten since it was ingested; "
+                "the store is not append-only anymore, call reset()"
+            )
+
+        if size == offset:
+            return None, entry
+
+        with file_path.open("rb") as handle:
+            handle.seek(offset)
+            chunk = handle.read(size - offset)
+
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            # no complete line yet
+            return None, entry
+
+        complete = chunk[:end + 1]
+        new_offset = offset + len(complete)
+
+        if offset == 0 and config.has_header:
+            header = complete[:complete.find(b"\n") + 1]
+
+        head_len = min(new_offset, _HEAD_BYTES)
+        new_entry = {
+            "offset": new_offset,
+            "header": header.decode("utf8"),
+            "head_len": head_len,
+            "head_sha256": self._head_digest(file_path, head_len),
+        }
+
+        payload = complete if offset == 0 else header + complete
+
+        if payload == header:
+            # header line only
+            return None, new_entry
+
+        df = pl.read_csv(
+            io.BytesIO(payload),
+            has_header=config.has_header,
+            separator=config.delimiter,
+            encoding=config.encoding,
+            null_values=config.null_values,
+            columns=self._delta_columns(header, config),
+            # infer from every new line, a short sample could miss the first value
+            infer_schema_length=None,
+        )
+
+        if self._columns is not None and not config.has_header:
+            df = self._project(df.lazy(), self._columns).collect()
+
+        # all-null columns carry no type information, keep them unresolved
+        df = df.with_columns(
+            pl.col(c).cast(pl.Null) for c in df.columns if df[c].null_count() == df.height
+        )
+
+        return df, new_entry
+
+    def _pinned_schema(self, state: Dict[str, Any]) -> Dict[str, pl.DataType]:
+        schema: Dict[str, pl.DataType] = {}
+        for name, dtype_name in state["schema"]:
+            if dtype_name not in _CSV_DTYPES:
+                raise RuntimeError(f"Unsupported dtype '{dtype_name}' in incremental store state")
+            schema[name] = _CSV_DTYPES[dtype_name]
+        return schema
+
+    def _merge_schema(
+        self,
+        pinned: Dict[str, pl.DataType],
+        delta: pl.DataFrame,
+    ) -> Dict[str, pl.DataType]:
+        # widen the pinned schema to the supertype of pinned and delta dtypes
+        observed = {c: dt for c, dt in delta.schema.items() if dt != pl.Null}
+        if not observed:
+            return pinned
+        merged = pl.concat(
+            [pl.DataFrame(schema=pinned), pl.DataFrame(schema=observed)],
+            how="diagonal_relaxed",
+        ).schema
+        return dict(merged)
+
+    def _apply_schema(
+        self,
+        frame: pl.LazyFrame | pl.DataFrame,
+        schema: Dict[str, pl.DataType],
+        resolve_nulls: bool,
+    ) -> pl.LazyFrame | pl.DataFrame:
+        # cast to the pinned schema; resolve_nulls types still-unresolved columns as
+        # String like csv inference does for all-null columns
+        present = frame.collect_schema() if isinstance(frame, pl.LazyFrame) else frame.schema
+        casts = []
+        for name, dtype in present.items():
+            if name in schema:
+                casts.append(pl.col(name).cast(schema[name]))
+            elif resolve_nulls and dtype == pl.Null:
+                casts.append(pl.col(name).cast(pl.String))
+        return frame.with_columns(casts) if casts else frame
+
+    def ingest(self, dataset_id: DatasetId) -> pl.DataFrame:
+        # read only new files and appended lines, persist them as a new part
+        # and return the newly ingested rows (normalized like load_dataset)
+        config = self._get_config(dataset_id)
+        files = self._resolve_files(dataset_id, config)
+        state = self._read_state(dataset_id)
+
+        frames: List[pl.DataFrame] = []
+        updated: Dict[str, Any] = dict(state["files"])
+
+        for file_path in files:
+            delta, entry = self._read_delta(file_path, config, state["files"].get(file_path.name))
+
+            if entry is not None:
+                updated[file_path.name] = entry
+
+            if delta is not None and delta.height > 0:
+                logger.debug(
+                    "Ingested %s new rows from '%s' for dataset '%s'",
+                    delta.height,
+                    file_path.name,
+                    dataset_id.value,
+                )
+                frames.append(delta)
+
+        if not frames:
+            logger.info("No new AirUp rows to ingest for dataset '%s'", dataset_id.value)
+            state["files"] = updated
+            self._dataset_dir(dataset_id).mkdir(parents=True, exist_ok=True)
+            self._write_state(dataset_id, state)
+            return self._empty_like(dataset_id, config)
+
+        delta = frames[0] if len(frames) == 1 else pl.concat(frames, how="vertical_relaxed")
+
+        schema = self._merge_schema(self._pinned_schema(state), delta)
+        delta = self._apply_schema(delta, schema, resolve_nulls=False)
+
+        dataset_dir = self._dataset_dir(dataset_id)
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+
+        # part is written before the state, a crash in between only leaves an
+        # orphan part that the next run overwrites
+        part = dataset_dir / f"part-{state['parts']:05d}.arrow"
+        delta.write_ipc(part, compression="uncompressed")
+
+        state["parts"] += 1
+        state["files"] = updated
+        state["schema"] = [[name, str(dtype)] for name, dtype in schema.items()]
+        self._write_state(dataset_id, state)
+
+        logger.info(
+            "Ingested AirUp dataset '%s' incrementally (files=%s, new_rows=%s, parts=%s)",
+            dataset_id.value,
+            len(frames),
+            delta.height,
+            state["parts"],
+        )
+
+        return self._normalize(
+            self._apply_schema(delta, schema, resolve_nulls=True),
+            dataset_id,
+            config,
+        )
+
+    def _empty_like(self, dataset_id: DatasetId, config: DatasetConfig) -> pl.DataFrame:
+        # zero-row frame with the store schema, used when nothing new was ingested
+        parts = self._part_files(dataset_id)
+        if not parts:
+            return pl.DataFrame()
+        schema = self._pinned_schema(self._read_state(dataset_id))
+        empty = self._apply_schema(pl.read_ipc(parts[0]).clear(), schema, resolve_nulls=True)
+        return self._normalize(empty, dataset_id, config)
+
+    def _part_files(self, dataset_id: DatasetId) -> List[Path]:
+        state = self._read_state(dataset_id)
+        directory = self._dataset_dir(dataset_id)
+        return [directory / f"part-{i:05d}.arrow" for i in range(state["parts"])]
+
+    def scan_dataset(
+        self,
+        dataset_id: DatasetId,
+        columns: Optional[Iterable[str]] = None,
+    ) -> pl.LazyFrame:
+        # ingest pending deltas, then return a lazy plan over the full store
+        # columns selects a subset of the stored raw columns
+        config = self._get_config(dataset_id)
+        self.ingest(dataset_id)
+
+        parts = self._part_files(dataset_id)
+        if not parts:
+            raise FileNotFoundError(
+                f"Incremental store for {dataset_id.value} is empty, "
+                "no complete AirUp log lines have been ingested yet"
+            )
+
+        # older parts were written before later deltas widened the schema
+        schema = self._pinned_schema(self._read_state(dataset_id))
+        scans = [
+            self._apply_schema(pl.scan_ipc(part), schema, resolve_nulls=True)
+            for part in parts
+        ]
+        scan = scans[0] if len(scans) == 1 else pl.concat(scans, how="vertical_relaxed")
+
+        if columns is not None:
+            scan = self._project(scan, frozenset(columns))
+
+        logger.debug(
+            "Built incremental store scan for dataset '%s' (parts=%s)",
+            dataset_id.value,
+            len(parts),
+        )
+
+        return self._normalize(scan, dataset_id, config)
+
+    def load_dataset(
+        self,
+        dataset_id: DatasetId,
+        columns: Optional[Iterable[str]] = None,
+    ) -> pl.DataFrame:
+        # ingest pending deltas, then return the full store
+        df = self.scan_dataset(dataset_id, columns).collect()
+
+        logger.info(
+            "Loaded AirUp dataset '%s' from incremental store (rows=%s, cols=%s)",
+            dataset_id.value,
+            df.height,
+            df.width,
+        )
+
+        return df
+
+    def reset(self, dataset_id: DatasetId) -> None:
+        # drop the persisted store, the next ingest starts from scratch
+        directory = self._dataset_dir(dataset_id)
+        if not directory.exists():
+            return
+
+        for path in directory.iterdir():
+            path.unlink()
+        directory.rmdir()
+
+        logger.info("Reset incremental store for dataset '%s'", dataset_id.value)
@@ -1,11 +1,13 @@
+from functools import partial
 from pathlib import Path
 import logging
-from typing import Set, Dict
+from typing import Set, Dict, List, Optional
 import polars as pl
 
 from core.interfaces.IDataLoader import IDataLoader
 from .dataset_ids import DatasetId
 from .dataset_config import DatasetConfig, DATASET_REGISTRY
+from .dataset_cache import DatasetCache, config_key, fingerprint_sources
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +18,13 @@ class CsvDatasetLoader(IDataLoader):
     def __init__(
         self,
         base_path: Path,
-        registry: Dict[DatasetId, DatasetConfig] = DATASET_REGISTRY
+        registry: Dict[DatasetId, DatasetConfig] = DATASET_REGISTRY,
+        cache: Optional[DatasetCache] = None,
     ) -> None:
         self._base_path = base_path
         self._registry = registry
+        # optional columnar cache for the parsed csv
+        self._cache = cache
 
     def _get_config(self, dataset_id: DatasetId) -> DatasetConfig:
         try:
@@ -28,16 +33,13 @@ class CsvDatasetLoader(IDataLoader):
             logger.error("No DatasetConfig registered for id=%s", dataset_id.value)
             raise KeyError(f"No DatasetConfig registered for id={dataset_id.value}") from exc
 
-    def load_dataset(self, dataset_id: DatasetId) -> pl.DataFrame:
-        config = self._get_config(dataset_id)
-        file_path = self._base_path / config.relative_path
-
-        logger.debug("Loading dataset '%s' from '%s'", dataset_id.value, file_path)
-
-        if not file_path.exists():
-            logger.error("Dataset file not found: %s", file_path)
-            raise FileNotFoundError(f"Dataset file not found: {file_path}")
-
+    def _build_scan(
+        self,
+        file_path: Path,
+        config: DatasetConfig,
+        dataset_id: DatasetId,
+    ) -> pl.LazyFrame:
+        # csv scan with configured datetime columns parsed
         scan = pl.scan_csv(
             file_path,
             has_header=config.has_header,
@@ -62,17 +64,50 @@ class CsvDatasetLoader(IDataLoader):
                     dataset_id.value,
                 )
 
-        df = scan.collect()
+        return scan
+
+    def source_files(self, dataset_id: DatasetId) -> List[Path]:
+        file_path = self._base_path / self._get_config(dataset_id).relative_path
+        if not file_path.exists():
+            raise FileNotFoundError(f"Dataset file not found: {file_path}")
+        return [file_path]
+
+    def source_fingerprint(self, dataset_id: DatasetId) -> Optional[str]:
+        config = self._get_config(dataset_id)
+        return fingerprint_sources(self.source_files(dataset_id), extra=[config_key(config)])
+
+    def scan_dataset(self, dataset_id: DatasetId) -> pl.LazyFrame:
+        # lazy plan with renames, required column check and dtype casts applied
+        config = self._get_config(dataset_id)
+        file_path = self._base_path / config.relative_path
+
+        logger.debug("Loading dataset '%s' from '%s'", dataset_id.value, file_path)
+
+        if not file_path.exists():
+            logger.error("Dataset file not found: %s", file_path)
+            raise FileNotFoundError(f"Dataset file not found: {file_path}")
+
+        if self._cache is not None:
+            scan = self._cache.scan(
+                dataset_id,
+                config,
+                file_path,
+                partial(self._build_scan, file_path, config, dataset_id),
+            )
+        else:
+            scan = self._build_scan(file_path, config, dataset_id)
 
         if config.rename_columns:
-            df = df.rename(config.rename_columns)
+            scan = scan.rename(config.rename_columns)
             logger.debug(
                 "Applied column renames for dataset '%s': %s",
                 dataset_id.value,
                 config.rename_columns
             )
 
-        missing = set(config.required_columns) - set(df.columns)
+        columns = set(scan.collect_schema().names())
+
+        missing = set(config.required_columns) - columns
         if missing:
             logger.error(
                 "Missing required columns for dataset '%s': %s",
@@ -84,9 +119,10 @@ class CsvDatasetLoader(IDataLoader):
             )
 
         if config.dtypes:
+            casts = []
             for col_name, dtype in config.dtypes.items():
-                if col_name in df.columns:
-                    df = df.with_columns(pl.col(col_name).cast(dtype))
+                if col_name in columns:
+                    casts.append(pl.col(col_name).cast(dtype))
                     logger.debug(
                         "Cast column '%s' to dtype '%s' for dataset '%s'",
                         col_name, dtype, dataset_id.value
@@ -96,6 +132,13 @@ class CsvDatasetLoader(IDataLoader):
                         "Configured dtype for column '%s', but column not present in dataset '%s'",
                         col_name, dataset_id.value
                     )
+            if casts:
+                scan = scan.with_columns(casts)
+
+        return scan
+
+    def load_dataset(self, dataset_id: DatasetId) -> pl.DataFrame:
+        df = self.scan_dataset(dataset_id).collect()
 
         logger.info(
             "Loaded dataset '%s' (rows=%s, cols=%s)",
@@ -0,0 +1,150 @@
+from dataclasses import fields
+from pathlib import Path
+import hashlib
+import logging
+import os
+from typing import Callable, Iterable, Optional
+import polars as pl
+
+from .dataset_ids import DatasetId
+from .dataset_config import DatasetConfig
+
+logger = logging.getLogger(__name__)
+
+# bump when the on-disk layout or the cached frame semantics change
+CACHE_FORMAT_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def fingerprint_file(path: Path, hash_contents: bool = False) -> str:
+    # identity of a source file: size + mtime, optionally a sha256 of its contents
+    stat = path.stat()
+    parts = [str(stat.st_size), str(stat.st_mtime_ns)]
+
+    if hash_contents:
+        digest = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        parts.append(digest.hexdigest())
+
+    return hashlib.sha256("|".join(parts).encode("utf8")).hexdigest()
+
+
+def fingerprint_sources(paths: Iterable[Path], extra: Iterable[str] = (), hash_contents: bool = False) -> str:
+    # identity of a set of source files plus loader settings that shape the frame
+    files = sorted((path.name, fingerprint_file(path, hash_contents)) for path in paths)
+    payload = repr((CACHE_FORMAT_VERSION, files, tuple(extra)))
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+def config_key(config: DatasetConfig, variant: Iterable[str] = ()) -> str:
+    # stable key over all config fields that take part in equality
+    items = [
+        (f.name, repr(getattr(config, f.name)))
+        for f in fields(config)
+        if f.compare
+    ]
+    payload = repr((CACHE_FORMAT_VERSION, items, tuple(variant)))
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+class DatasetCache:
+    # on-disk Arrow IPC cache for parsed source files
+    #
+    # layout: <root>/<dataset_id>/<config key>/<source file name>.<fingerprint>.arrow
+    # every source file is cached on its own, so a changed or newly added file
+    # only invalidates its own entry
+    # prune() drops entries of deleted source files within one config key;
+    # directories of outdated config keys are only removed by clear()
+
+    def __init__(self, root: Path, hash_contents: bool = False) -> None:
+        self._root = Path(root)
+        self._hash_contents = hash_contents
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def entry_dir(
+        self,
+        dataset_id: DatasetId,
+        config: DatasetConfig,
+        variant: Iterable[str] = (),
+    ) -> Path:
+        return self._root / dataset_id.value / config_key(config, variant)[:16]
+
+    def scan(
+        self,
+        dataset_id: DatasetId,
+        config: DatasetConfig,
+        source: Path,
+        build: Callable[[], pl.LazyFrame],
+        variant: Iterable[str] = (),
+    ) -> pl.LazyFrame:
+        # return a memory-mapped scan of the cached frame for source; build is only
+        # called on a miss, so a hit never opens or infers the raw source file
+        directory = self.entry_dir(dataset_id, config, variant)
+        fingerprint = fingerprint_file(source, self._hash_contents)[:16]
+        entry = directory / f"{source.name}.{fingerprint}.arrow"
+
+        if entry.exists():
+            logger.debug("Dataset cache hit for '%s' (%s)", source.name, dataset_id.value)
+            return pl.scan_ipc(entry)
+
+        logger.debug("Dataset cache miss for '%s' (%s)", source.name, dataset_id.value)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # drop entries of older versions of the same source file
+        for stale in directory.glob(f"{source.name}.*.arrow"):
+            stale.unlink(missing_ok=True)
+
+        df = build().collect()
+
+        # write-then-rename so concurrent readers never see a partial file
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        df.write_ipc(tmp, compression="uncompressed")
+        os.replace(tmp, entry)
+
+        return pl.scan_ipc(entry)
+
+    def prune(
+        self,
+        dataset_id: DatasetId,
+        config: DatasetConfig,
+        sources: Iterable[Path],
+        variant: Iterable[str] = (),
+    ) -> None:
+        # remove entries whose source file is not among sources anymore
+        directory = self.entry_dir(dataset_id, config, variant)
+        if not directory.exists():
+            return
+
+        names = {source.name for source in sources}
+        for entry in directory.glob("*.arrow"):
+            source_name = entry.name.rsplit(".", 2)[0]
+            if source_name not in names:
+                entry.unlink(missing_ok=True)
+                logger.debug(
+                    "Pruned dataset cache entry '%s' (%s), source file is gone",
+                    entry.name,
+                    dataset_id.value,
+                )
+
+    def clear(self, dataset_id: Optional[DatasetId] = None) -> None:
+        # remove all cached entries, or only those of one dataset
+        target = self._root if dataset_id is None else self._root / dataset_id.value
+        if not target.exists():
+            return
+
+        for path in sorted(target.rglob("*"), reverse=True):
+            if path.is_dir():
+                path.rmdir()
+            else:
+                path.unlink()
+
+        if dataset_id is not None:
+            target.rmdir()
+
+        logger.info("Cleared dataset cache at '%s'", target)
@@ -191,6 +191,7 @@ DATASET_REGISTRY: Dict[DatasetId, DatasetConfig] = {
             "temperature",
         ],
         dtypes=None,
+        null_values=["unknown"],  # timestamp_gps without gps fix
     ),
 
     # real data: AirUp sensor SONT C (directory with multiple daily log files)
@@ -216,5 +217,6 @@ DATASET_REGISTRY: Dict[DatasetId, DatasetConfig] = {
             "temperature",
         ],
         dtypes=None,
+        null_values=["unknown"],
     ),
 }
@@ -1,12 +1,37 @@
-from typing import Dict, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional
+import multiprocessing
 import logging
 import polars as pl
 
+from core import instrumentation
 from core.interfaces.IDataLoader import IDataLoader
 from .dataset_ids import DatasetId
 
 logger = logging.getLogger(__name__)
 
+# executor backends for concurrent load_all
+# processes are spawned, forking a process that already runs polars' thread pool can deadlock
+_EXECUTORS = {
+    "thread": ThreadPoolExecutor,
+    "process": partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")),
+}
+
+
+def _load_with(loader: IDataLoader, dataset_id: DatasetId) -> pl.DataFrame:
+    # module level so it can be pickled for the process backend
+    return loader.load_dataset(dataset_id)
+
+
+def _source_bytes(loader: IDataLoader, dataset_id: DatasetId) -> Optional[int]:
+    # on-disk size of the raw inputs, None if the loader does not list them
+    files = loader.source_files(dataset_id)
+    if not files:
+        return None
+    return sum(path.stat().st_size for path in files if path.exists())
+
 
 class LoaderOrchestrator:
     # coordinates loading of all datasets with override capability
@@ -35,6 +60,9 @@ class LoaderOrchestrator:
                     )
                 self._loader_overrides[ds_id] = loader
 
+        # failures of the most recent load_all call, in both raise_on_error modes
+        self.last_errors: Dict[DatasetId, Exception] = {}
+
     def register_loader(self, dataset_id: DatasetId, loader: IDataLoader) -> None:
         if not isinstance(loader, IDataLoader):
             raise TypeError(
@@ -59,7 +87,11 @@ class LoaderOrchestrator:
             type(loader).__name__,
         )
 
-        df = loader.load_dataset(dataset_id)
+        with instrumentation.span(f"{type(loader).__name__}.load:{dataset_id.value}", "load") as span:
+            if instrumentation.enabled():
+                span.inputs(nbytes=_source_bytes(loader, dataset_id))
+            df = loader.load_dataset(dataset_id)
+            span.output(df)
 
         logger.debug(
             "Dataset '%s' loaded (rows=%s, cols=%s)",
@@ -70,10 +102,122 @@ class LoaderOrchestrator:
 
         return df
 
-    def load_all(self, dataset_ids: list[DatasetId]) -> Dict[DatasetId, pl.DataFrame]:
+    def scan(self, dataset_id: DatasetId) -> pl.LazyFrame:
+        # lazy counterpart of load(), nothing is read until the plan is collected
+        loader = self.get_loader(dataset_id)
+
+        logger.info(
+            "Scanning dataset '%s' via loader '%s'",
+            dataset_id.value,
+            type(loader).__name__,
+        )
+
+        return loader.scan_dataset(dataset_id)
+
+    def source_files(self, dataset_id: DatasetId) -> List[Path]:
+        # raw source files of dataset_id, empty if its loader cannot tell
+        return self.get_loader(dataset_id).source_files(dataset_id)
+
+    def source_fingerprint(self, dataset_id: DatasetId) -> Optional[str]:
+        # content identity of dataset_id's inputs, None if its loader cannot tell
+        return self.get_loader(dataset_id).source_fingerprint(dataset_id)
+
+    def load_all(
+        self,
+        dataset_ids: list[DatasetId],
+        max_workers: int = 1,
+        backend: str = "thread",
+        raise_on_error: bool = True,
+    ) -> Dict[DatasetId, pl.DataFrame]:
+        # max_workers > 1 loads datasets concurrently; "thread" suits polars csv parsing
+        # (releases the GIL), "process" requires picklable loaders
+        # raise_on_error: sequential loading (one worker) stops at the first failure
+        # and re-raises it, as it always did; concurrent loading lets the running
+        # loads finish and then re-raises the first failure in dataset_ids order
+        # without raise_on_error failed datasets are skipped
+        # either way failures are logged and kept in last_errors
+        # the result dict always follows the order of dataset_ids
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+
+        if backend not in _EXECUTORS:
+            raise ValueError(
+                f"Unknown load_all backend '{backend}', expected one of {sorted(_EXECUTORS)}"
+            )
+
+        workers = min(max_workers, max(len(dataset_ids), 1))
+        self.last_errors = {}
+
+        if workers == 1:
+            outcomes: Dict[DatasetId, pl.DataFrame | Exception] = {}
+            for ds_id in dataset_ids:
+                try:
+                    outcomes[ds_id] = self.load(ds_id)
+                except Exception as exc:
+                    if raise_on_error:
+                        # fail fast, the remaining datasets are not loaded
+                        self.last_errors = {ds_id: exc}
+                        logger.error("Loading dataset '%s' failed: %s", ds_id.value, exc)
+                        raise
+                    outcomes[ds_id] = exc
+        else:
+            outcomes = self._load_concurrently(dataset_ids, workers, backend)
+
         result: Dict[DatasetId, pl.DataFrame] = {}
+        errors: Dict[DatasetId, Exception] = {}
+
         for ds_id in dataset_ids:
-            result[ds_id] = self.load(ds_id)
+            outcome = outcomes[ds_id]
+            if isinstance(outcome, Exception):
+                errors[ds_id] = outcome
+            else:
+                result[ds_id] = outcome
+
+        self.last_errors = errors
+
+        for ds_id, exc in errors.items():
+            logger.error("Loading dataset '%s' failed: %s", ds_id.value, exc)
+
+        if errors and raise_on_error:
+            raise next(iter(errors.values()))
 
-        logger.info("Loaded %s datasets via LoaderOrchestrator", len(result))
+        logger.info(
+            "Loaded %s datasets via LoaderOrchestrator (failed=%s, workers=%s)",
+            len(result),
+            len(errors),
+            workers,
+        )
         return result
+
+    def _load_concurrently(
+        self,
+        dataset_ids: list[DatasetId],
+        max_workers: int,
+        backend: str,
+    ) -> Dict[DatasetId, pl.DataFrame | Exception]:
+        executor: Executor = _EXECUTORS[backend](max_workers=max_workers)
+
+        logger.info(
+            "Loading %s datasets concurrently (backend=%s, workers=%s)",
+            len(dataset_ids),
+            backend,
+            max_workers,
+        )
+
+        with executor:
+            if backend == "thread":
+                futures = {ds_id: executor.submit(self.load, ds_id) for ds_id in dataset_ids}
+            else:
+                futures = {
+                    ds_id: executor.submit(_load_with, self.get_loader(ds_id), ds_id)
+                    for ds_id in dataset_ids
+                }
+
+            outcomes: Dict[DatasetId, pl.DataFrame | Exception] = {}
+            for ds_id, future in futures.items():
+                try:
+                    outcomes[ds_id] = future.result()
+                except Exception as exc:
+                    outcomes[ds_id] = exc
+
+        return outcomes
@@ -0,0 +1,79 @@
+from pathlib import Path
+from typing import Any, Dict, Tuple
+import importlib.metadata
+import logging
+import os
+import pickle
+
+logger = logging.getLogger(__name__)
+
+# libraries whose version is stored with a saved model
+_TRACKED_LIBRARIES = ("polars", "numpy", "scikit-learn")
+
+
+def library_versions() -> Dict[str, str]:
+    versions = {}
+    for name in _TRACKED_LIBRARIES:
+        try:
+            versions[name] = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    return versions
+
+
+def save_model(path: Path, obj: Any, format_version: int, metadata: Dict[str, Any]) -> None:
+    # versioned pickle payload with metadata and library versions
+    # pickles execute code on load, only load files from trusted locations
+    payload = {
+        "format_version": format_version,
+        "model_class": f"{type(obj).__module__}.{type(obj).__qualname__}",
+        "fit_metadata": metadata,
+        "library_versions": library_versions(),
+        "model": obj,
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # write-then-rename so a loading worker never sees a partial file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as handle:
+        pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+    logger.info("Saved %s to '%s'", type(obj).__name__, path)
+
+
+def load_model(path: Path, format_version: int, expected_type: type) -> Tuple[Any, Dict[str, Any]]:
+    # load a payload written by save_model, returns (object, metadata)
+    with Path(path).open("rb") as handle:
+        payload = pickle.load(handle)
+
+    if not isinstance(payload, dict) or "format_version" not in payload:
+        raise ValueError(f"'{path}' is not a saved model")
+
+    if payload["format_version"] != format_version:
+        raise ValueError(
+            f"Unsupported model format version {payload['format_version']} in '{path}', "
+            f"expected {format_version}"
+        )
+
+    obj = payload["model"]
+    if not isinstance(obj, expected_type):
+        raise TypeError(
+            f"'{path}' contains a {payload['model_class']}, expected {expected_type.__name__}"
+        )
+
+    current = library_versions()
+    for name, version in payload["library_versions"].items():
+        if current.get(name) != version:
+            logger.warning(
+                "Model in '%s' was saved with %s %s, running %s",
+                path,
+                name,
+                version,
+                current.get(name),
+            )
+
+    logger.info("Loaded %s from '%s'", type(obj).__name__, path)
+    return obj, payload["fit_metadata"]
@@ -0,0 +1,163 @@
+from pathlib import Path
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from typing import Any, Optional, Tuple
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# bump when the key derivation or stored frame semantics change
+PHASE_CACHE_FORMAT_VERSION = 1
+
+_DEFAULT_MAX_BYTES = 2 << 30
+
+# preprocessor attributes that are caches rather than configuration
+_VOLATILE_ATTRIBUTES = frozenset({"_steps", "_timestamp_formats"})
+
+
+def phase_key(*parts: Any) -> str:
+    # content address of a phase result, parts must have a stable repr
+    payload = repr((PHASE_CACHE_FORMAT_VERSION, parts))
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+def _qualified_name(obj: Any) -> str:
+    return f"{obj.__module__}.{obj.__qualname__}"
+
+
+def _canonical(value: Any) -> Any:
+    # run independent stand-in for a configuration value: containers are sorted,
+    # objects without their own __repr__ (whose default repr holds the memory
+    # address) are replaced by their class and attributes
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((repr(_canonical(k)), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(_canonical(v)) for v in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, type) or (callable(value) and hasattr(value, "__qualname__")):
+        return _qualified_name(value)
+    if type(value).__repr__ is object.__repr__ and hasattr(value, "__dict__"):
+        return (_qualified_name(type(value)), _canonical(vars(value)))
+    return repr(value)
+
+
+def _system_timezone() -> Tuple[Any, ...]:
+    # the zone epoch_to_datetime(timezone=None) converts to
+    return (os.environ.get("TZ"), time.tzname, time.timezone, time.altzone)
+
+
+def preprocessor_fingerprint(preprocessor: Any) -> str:
+    # class, step list and configuration attributes of a preprocessor, plus the
+    # system time zone that timezone=None conversions depend on
+    steps = [step.__name__ for step in getattr(preprocessor, "get_steps", lambda: [])()]
+    settings = _canonical({
+        name: value
+        for name, value in getattr(preprocessor, "__dict__", {}).items()
+        if name not in _VOLATILE_ATTRIBUTES
+    })
+    return phase_key(_qualified_name(type(preprocessor)), steps, settings, _system_timezone())
+
+
+def object_fingerprint(obj: Any) -> str:
+    # fitted models (calibration engine, detectors) are identified by their pickled state
+    return hashlib.sha256(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+class PhaseCache:
+    # content-addressed store of phase results as uncompressed Arrow IPC files
+    #
+    # layout: <root>/<key>.arrow; a hit reads the file and touches its mtime,
+    # so mtime order is the LRU order; after every put the least recently used
+    # entries are deleted until the directory fits max_bytes
+
+    def __init__(self, root: Path, max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self._root = Path(root)
+        self._max_bytes = max_bytes
+        # get() runs on pool threads under PipelineOrchestrator.run_many
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _entry(self, key: str) -> Path:
+        return self._root / f"{key}.arrow"
+
+    def get(self, key: str) -> Optional[pl.DataFrame]:
+        entry = self._entry(key)
+        try:
+            os.utime(entry)
+            df = pl.scan_ipc(entry).collect()
+        except FileNotFoundError:
+            # never stored, or evicted by another process in between
+            with self._stats_lock:
+                self.misses += 1
+            return None
+
+        with self._stats_lock:
+            self.hits += 1
+        logger.debug("Phase cache hit %s", key[:16])
+        return df
+
+    def put(self, key: str, df: pl.DataFrame) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(key)
+
+        # write-then-rename so concurrent readers never see a partial file
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        df.write_ipc(tmp, compression="uncompressed")
+
+        size = tmp.stat().st_size
+        if size > self._max_bytes:
+            tmp.unlink()
+            logger.warning(
+                "Phase result of %s bytes exceeds the cache limit of %s bytes, not cached",
+                size,
+                self._max_bytes,
+            )
+            return
+
+        os.replace(tmp, entry)
+        self._evict(keep=entry)
+
+    def size_bytes(self) -> int:
+        if not self._root.exists():
+            return 0
+        return sum(path.stat().st_size for path in self._root.glob("*.arrow"))
+
+    def _evict(self, keep: Path) -> None:
+        entries = []
+        for path in self._root.glob("*.arrow"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self._max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug("Evicted phase cache entry '%s' (%s bytes)", path.name, size)
+
+    def clear(self) -> None:
+        if not self._root.exists():
+            return
+        for path in self._root.glob("*.arrow"):
+            path.unlink(missing_ok=True)
+        logger.info("Cleared phase cache at '%s'", self._root)
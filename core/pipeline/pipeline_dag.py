@@ -0,0 +1,133 @@
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DagTask:
+    # one node: fn is called with the results of depends_on, in that order
+    name: str
+    fn: Callable[..., Any]
+    depends_on: Tuple[str, ...] = ()
+
+
+class UpstreamFailedError(RuntimeError):
+    # recorded for tasks that were skipped because a dependency failed
+    pass
+
+
+class PipelineDag:
+    # dependency graph of pipeline work, executed on a thread pool
+    #
+    # a task starts as soon as all its dependencies finished, so independent
+    # branches run concurrently and every task runs exactly once, however many
+    # tasks depend on it; polars releases the GIL in its kernels, so threads are
+    # enough for load/preprocess work
+    # a failing task never cancels independent branches, its dependents are
+    # skipped; failures are kept in last_errors like LoaderOrchestrator.load_all
+
+    def __init__(self, tasks: Sequence[DagTask] = ()) -> None:
+        self._tasks: Dict[str, DagTask] = {}
+        self.last_errors: Dict[str, Exception] = {}
+        for task in tasks:
+            self.add(task)
+
+    @property
+    def tasks(self) -> Dict[str, DagTask]:
+        return dict(self._tasks)
+
+    def add(self, task: DagTask) -> None:
+        if task.name in self._tasks:
+            raise ValueError(f"Duplicate task name '{task.name}'")
+        self._tasks[task.name] = task
+
+    def order(self) -> List[str]:
+        # topological order (Kahn), ties keep insertion order
+        for task in self._tasks.values():
+            for dep in task.depends_on:
+                if dep not in self._tasks:
+                    raise ValueError(f"Task '{task.name}' depends on unknown task '{dep}'")
+
+        remaining = {name: len(set(task.depends_on)) for name, task in self._tasks.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        ordered: List[str] = []
+
+        while ready:
+            name = ready.pop(0)
+            ordered.append(name)
+            for other, task in self._tasks.items():
+                if name in task.depends_on:
+                    remaining[other] -= 1
+                    if remaining[other] == 0:
+                        ready.append(other)
+
+        if len(ordered) != len(self._tasks):
+            cyclic = sorted(set(self._tasks) - set(ordered))
+            raise ValueError(f"Task graph has a cycle through {cyclic}")
+
+        return ordered
+
+    def execute(self, max_workers: int = 1, raise_on_error: bool = True) -> Dict[str, Any]:
+        # results per task name, in topological order; with raise_on_error the first
+        # failure in that order is re-raised once every runnable task finished
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+
+        order = self.order()
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+        pending = {name: set(self._tasks[name].depends_on) for name in order}
+        running: Dict[Future, str] = {}
+        started = time.perf_counter()
+
+        def finished(name: str) -> None:
+            # release dependents, skip those whose upstream failed
+            for other in order:
+                if other in pending and name in pending[other]:
+                    pending[other].discard(name)
+                    if name in errors:
+                        errors[other] = UpstreamFailedError(f"Task '{other}' skipped, '{name}' failed")
+                        del pending[other]
+                        finished(other)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                for name in [n for n in order if n in pending and not pending[n]]:
+                    task = self._tasks[name]
+                    del pending[name]
+                    args = [results[dep] for dep in task.depends_on]
+                    logger.debug("Starting task '%s'", name)
+                    running[pool.submit(task.fn, *args)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as exc:
+                        errors[name] = exc
+                        logger.error("Task '%s' failed: %s", name, exc)
+                    finished(name)
+
+        self.last_errors = {name: errors[name] for name in order if name in errors}
+
+        logger.info(
+            "Executed task graph (tasks=%s, failed=%s, workers=%s, %.2fs)",
+            len(order),
+            len(self.last_errors),
+            max_workers,
+            time.perf_counter() - started,
+        )
+
+        if self.last_errors and raise_on_error:
+            raise next(iter(self.last_errors.values()))
+
+        return {name: results[name] for name in order if name in results}
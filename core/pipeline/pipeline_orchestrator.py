@@ -1,13 +1,20 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, Dict
+from functools import partial
+from typing import Any, Callable, Optional, Dict, Sequence, Union
 import logging
 import polars as pl
 
+from core import instrumentation
+from core.calibration.CalibrationEngine import CalibrationEngine
 from core.loaders.loader_orchestrator import LoaderOrchestrator
 from core.loaders.dataset_ids import DatasetId
+from core.pipeline.pipeline_dag import DagTask, PipelineDag
+from core.pipeline.phase_cache import PhaseCache, object_fingerprint, phase_key, preprocessor_fingerprint
 from core.preprocessing.preprocessing_orchestrator import PreprocessingOrchestrator
 from core.preprocessing.preprocessing_config import PREPROCESSOR_REGISTRY
+from core.preprocessing.resampler import Resampler
+from core.preprocessing.rollup_store import RollupStore
 
 logger = logging.getLogger(__name__)
 
@@ -44,11 +51,65 @@ class PipelineOrchestrator:
     def __init__(
         self,
         loader_orchestrator: LoaderOrchestrator,
-        preprocessor_registry: Dict[DatasetId, object] = PREPROCESSOR_REGISTRY
+        preprocessor_registry: Dict[DatasetId, object] = PREPROCESSOR_REGISTRY,
+        calibration_engine: Optional[CalibrationEngine] = None,
+        rollup_store: Optional[RollupStore] = None,
+        phase_cache: Optional[PhaseCache] = None,
     ) -> None:
         # dependency injection
+        # calibration_engine: fitted engine applied in the CALIBRATION phase
+        # rollup_store: persisted rollups served by rollups()
+        # phase_cache: memoizes LOADING/PREPROCESSING/CALIBRATION results
         self._loader = loader_orchestrator
+        self._preprocessor_registry = preprocessor_registry
         self._preprocessors = PreprocessingOrchestrator(preprocessor_registry)
+        self._calibration = calibration_engine
+        self._rollups = rollup_store
+        self._phase_cache = phase_cache
+        # failures of the last run_many, per DatasetId or task name
+        self.last_errors: Dict[Union[DatasetId, str], Exception] = {}
+
+    # ---------------------------------------------------------
+    #                     PHASE CACHE
+    # ---------------------------------------------------------
+    def _phase_keys(self, dataset_id: DatasetId) -> Dict[str, str]:
+        # content address per phase, each key chains the key of the phase before it:
+        # source fingerprint (files + DatasetConfig) -> preprocessor class, steps and
+        # settings -> fitted calibration engine; empty when nothing can be cached
+        if self._phase_cache is None:
+            return {}
+
+        source = self._loader.source_fingerprint(dataset_id)
+        if source is None:
+            logger.debug("No source fingerprint for dataset '%s', phase cache bypassed", dataset_id.value)
+            return {}
+
+        keys = {PipelinePhase.LOADING: phase_key(PipelinePhase.LOADING, dataset_id.value, source)}
+        keys[PipelinePhase.PREPROCESSING] = phase_key(
+            PipelinePhase.PREPROCESSING,
+            keys[PipelinePhase.LOADING],
+            preprocessor_fingerprint(self._preprocessor_registry.get(dataset_id)),
+        )
+        if self._calibration is not None and self._calibration.fitted:
+            keys[PipelinePhase.CALIBRATION] = phase_key(
+                PipelinePhase.CALIBRATION,
+                keys[PipelinePhase.PREPROCESSING],
+                object_fingerprint(self._calibration),
+            )
+        return keys
+
+    def _cached(self, phase: str, key: Optional[str], compute: Callable[[], pl.DataFrame]) -> pl.DataFrame:
+        # phase spans include cache reads, a hit has no nested load/preprocess spans
+        with instrumentation.span(phase, "phase") as span:
+            if key is None:
+                df = compute()
+            else:
+                df = self._phase_cache.get(key)
+                if df is None:
+                    df = compute()
+                    self._phase_cache.put(key, df)
+            span.output(df)
+        return df
 
     # ---------------------------------------------------------
     #                     LOADING PHASE
@@ -84,40 +145,172 @@ class PipelineOrchestrator:
         )
         return pre
 
+    # ---------------------------------------------------------
+    #                   CALIBRATION PHASE
+    # ---------------------------------------------------------
+    def _execute_calibration(
+        self,
+        dataset_id: DatasetId,
+        df: pl.DataFrame
+    ) -> pl.DataFrame:
+        # calibrated <sensor>_calibrated columns next to the preprocessed ones
+        logger.info("Pipeline phase: CALIBRATION dataset '%s'", dataset_id.value)
+        calibrated = self._calibration.apply(df)
+        logger.debug(
+            "Calibration phase complete for dataset '%s' (outputs=%s)",
+            dataset_id.value,
+            [spec.output for spec in self._calibration.specs],
+        )
+        return calibrated
+
+    # ---------------------------------------------------------
+    #                    LAZY EXECUTION
+    # ---------------------------------------------------------
+    def _run_lazy(
+        self,
+        dataset_id: DatasetId,
+        phases: list[str],
+        streaming: bool,
+        result: PipelineResult,
+        keys: Dict[str, str],
+    ) -> None:
+        # build one plan over loading and preprocessing and collect it once,
+        # so polars can fuse selects/casts/filters and push them into the scan
+        preprocess = PipelinePhase.PREPROCESSING in phases
+
+        def collect() -> pl.DataFrame:
+            logger.info("Pipeline phase: LOADING dataset '%s' (lazy)", dataset_id.value)
+            plan = self._loader.scan(dataset_id)
+
+            if preprocess:
+                logger.info("Pipeline phase: PREPROCESSING dataset '%s' (lazy)", dataset_id.value)
+                plan = self._preprocessors.preprocess(dataset_id, plan)
+
+            df = plan.collect(engine="streaming") if streaming else plan.collect()
+
+            logger.debug(
+                "Collected lazy plan for dataset '%s' (rows=%s, cols=%s, streaming=%s)",
+                dataset_id.value,
+                df.height,
+                df.width,
+                streaming,
+            )
+            return df
+
+        last = PipelinePhase.PREPROCESSING if preprocess else PipelinePhase.LOADING
+        df = self._cached(f"{last}:{dataset_id.value} (lazy)", keys.get(last), collect)
+
+        # the raw frame is never materialized when preprocessing is part of the plan
+        if preprocess:
+            result.preprocessed = df
+        else:
+            result.raw_loaded = df
+
+    # ---------------------------------------------------------
+    #                  RESAMPLING / ROLLUPS
+    # ---------------------------------------------------------
+    def rollups(
+        self,
+        dataset_id: DatasetId,
+        resamplers: Sequence[Resampler],
+    ) -> Dict[str, pl.DataFrame]:
+        # preprocessed dataset downsampled per resampler, keyed by resampler.every
+        # stored rollups are read directly; the minute data is loaded and
+        # preprocessed (one lazy plan) at most once, and only if a rollup is missing
+        minute: Optional[pl.DataFrame] = None
+
+        def build(resampler: Resampler) -> pl.DataFrame:
+            nonlocal minute
+            if minute is None:
+                logger.info("Pipeline phase: RESAMPLING dataset '%s' from minute data", dataset_id.value)
+                plan = self._preprocessors.preprocess(dataset_id, self._loader.scan(dataset_id))
+                minute = plan.collect()
+            with instrumentation.span(f"resample:{dataset_id.value}@{resampler.every}", "phase", minute) as span:
+                df = resampler.resample(minute)
+                span.output(df)
+            return df
+
+        source = self._loader.source_fingerprint(dataset_id) if self._rollups is not None else None
+        if self._rollups is not None and source is None:
+            logger.warning(
+                "Loader for dataset '%s' reports no source fingerprint, rollups are not stored",
+                dataset_id.value,
+            )
+
+        variant = (preprocessor_fingerprint(self._preprocessor_registry.get(dataset_id)),)
+        result = {}
+        for resampler in resamplers:
+            if source is not None:
+                result[resampler.every] = self._rollups.scan(
+                    dataset_id, resampler, source, lambda r=resampler: build(r), variant
+                ).collect()
+            else:
+                result[resampler.every] = build(resampler)
+
+        return result
+
     # ---------------------------------------------------------
     #                 MAIN PIPELINE ENTRYPOINT
     # ---------------------------------------------------------
     def run(
         self,
         dataset_id: DatasetId,
-        phases: Optional[list[str]] = None
+        phases: Optional[list[str]] = None,
+        lazy: bool = False,
+        streaming: bool = False,
     ) -> PipelineResult:
+        # lazy=True runs loading and preprocessing as a single query plan,
+        # raw_loaded then stays None if PREPROCESSING is selected
+        # streaming=True collects that plan with the polars streaming engine
         # default to only loading
         if phases is None:
             phases = [PipelinePhase.LOADING]
 
-        result = PipelineResult()
+        if streaming and not lazy:
+            raise ValueError("streaming=True requires lazy=True")
 
-        # LOADING
-        if PipelinePhase.LOADING in phases:
-            result.raw_loaded = self._execute_loading(dataset_id)
+        result = PipelineResult()
+        keys = self._phase_keys(dataset_id)
 
-        # PREPROCESSING
-        if PipelinePhase.PREPROCESSING in phases:
-            if result.raw_loaded is None:
+        if lazy:
+            if PipelinePhase.PREPROCESSING in phases and PipelinePhase.LOADING not in phases:
                 raise RuntimeError("PREPROCESSING requires LOADING to run first")
-            result.preprocessed = self._execute_preprocessing(
-                dataset_id,
-                result.raw_loaded
-            )
+            if PipelinePhase.LOADING in phases:
+                self._run_lazy(dataset_id, phases, streaming, result, keys)
+        else:
+            # LOADING
+            if PipelinePhase.LOADING in phases:
+                result.raw_loaded = self._cached(
+                    f"{PipelinePhase.LOADING}:{dataset_id.value}",
+                    keys.get(PipelinePhase.LOADING),
+                    lambda: self._execute_loading(dataset_id),
+                )
+
+            # PREPROCESSING
+            if PipelinePhase.PREPROCESSING in phases:
+                if result.raw_loaded is None:
+                    raise RuntimeError("PREPROCESSING requires LOADING to run first")
+                result.preprocessed = self._cached(
+                    f"{PipelinePhase.PREPROCESSING}:{dataset_id.value}",
+                    keys.get(PipelinePhase.PREPROCESSING),
+                    lambda: self._execute_preprocessing(dataset_id, result.raw_loaded),
+                )
 
         # FEATURE ENGINEERING (placeholder)
         if PipelinePhase.FEATURE_ENGINEERING in phases:
             logger.warning("FEATURE_ENGINEERING phase selected but not implemented yet.")
 
-        # CALIBRATION (placeholder)
+        # CALIBRATION
         if PipelinePhase.CALIBRATION in phases:
-            logger.warning("CALIBRATION phase selected but not implemented yet.")
+            if self._calibration is None:
+                raise RuntimeError("CALIBRATION requires a calibration_engine")
+            if result.preprocessed is None:
+                raise RuntimeError("CALIBRATION requires PREPROCESSING to run first")
+            result.calibrated = self._cached(
+                f"{PipelinePhase.CALIBRATION}:{dataset_id.value}",
+                keys.get(PipelinePhase.CALIBRATION),
+                lambda: self._execute_calibration(dataset_id, result.preprocessed),
+            )
 
         # ANOMALY DETECTION (placeholder)
         if PipelinePhase.ANOMALY_DETECTION in phases:
@@ -130,3 +323,37 @@ class PipelineOrchestrator:
         )
 
         return result
+
+    # ---------------------------------------------------------
+    #                MULTI-DATASET EXECUTION
+    # ---------------------------------------------------------
+    def run_many(
+        self,
+        dataset_ids: Sequence[DatasetId],
+        phases: Optional[list[str]] = None,
+        lazy: bool = False,
+        streaming: bool = False,
+        tasks: Sequence[DagTask] = (),
+        max_workers: int = 1,
+        raise_on_error: bool = True,
+    ) -> Dict[Union[DatasetId, str], Any]:
+        # run() for every dataset as one node of a task graph, plus extra tasks that
+        # depend on datasets by their value (e.g. a calibration task with
+        # depends_on=("lubw_minute_data", "airup_sont_a_minute") receives both
+        # PipelineResults); independent nodes run concurrently on max_workers
+        # threads and every dataset is processed once however many tasks use it
+        # results: PipelineResult per DatasetId, task results per task name;
+        # failures are kept in last_errors
+        dag = PipelineDag()
+        for dataset_id in dataset_ids:
+            dag.add(DagTask(dataset_id.value, partial(self.run, dataset_id, phases, lazy, streaming)))
+        for task in tasks:
+            dag.add(task)
+
+        by_value = {dataset_id.value: dataset_id for dataset_id in dataset_ids}
+        try:
+            results = dag.execute(max_workers=max_workers, raise_on_error=raise_on_error)
+        finally:
+            self.last_errors = {by_value.get(name, name): exc for name, exc in dag.last_errors.items()}
+
+        return {by_value.get(name, name): value for name, value in results.items()}
@@ -1,61 +1,79 @@
+from typing import FrozenSet, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import polars as pl
 import logging
-from .base_preprocessor import BasePreprocessor
-from core.preprocessing.utils.time_utils import parse_timestamp
+from .base_preprocessor import BasePreprocessor, Frame
+from core.preprocessing.utils.time_utils import epoch_to_datetime
 
 logger = logging.getLogger(__name__)
 
 
 class AirUpSensorPreprocessor(BasePreprocessor):
 
-    def _select_columns(self, df: pl.DataFrame) -> pl.DataFrame:
-        keep_exact = {
-            "pm1", "pm25", "pm10",
-            "sht_humid", "sht_temp",
-            "CO", "NO", "NO2", "O3",
-            "timestamp_hr", "timestamp_gps", "timestamp",
-            "lat", "lon", "alt",
-        }
-        selected = [c for c in df.columns if c in keep_exact]
+    # raw AirUp columns used downstream, everything else (RAW_OPC_*, RAW_ADC_*, ...) is dropped
+    KEEP_COLUMNS = frozenset({
+        "pm1", "pm25", "pm10",
+        "sht_humid", "sht_temp",
+        "CO", "NO", "NO2", "O3",
+        "timestamp_hr", "timestamp_gps", "timestamp",
+        "lat", "lon", "alt",
+    })
+
+    def __init__(
+        self,
+        timezone: Optional[str] = None,
+    ) -> None:
+        # zone for timestamp_gps wall clock times: None = system local time
+        # (the datetime.fromtimestamp behaviour), "UTC" or an IANA name like "Europe/Berlin"
+        super().__init__()
+        if timezone is not None and timezone != "UTC":
+            try:
+                ZoneInfo(timezone)
+            except (ZoneInfoNotFoundError, ValueError) as exc:
+                raise ValueError(f"Unknown timezone '{timezone}'") from exc
+        self._timezone = timezone
+
+    def input_columns(self) -> Optional[FrozenSet[str]]:
+        return self.KEEP_COLUMNS
+
+    def _select_columns(self, df: Frame) -> Frame:
+        selected = [c for c in self._columns(df) if c in self.KEEP_COLUMNS]
         return df.select(selected)
 
-    def _resolve_timestamps(self, df: pl.DataFrame) -> pl.DataFrame:
-        # correct handling: epoch seconds -> local naive datetime
-        if "timestamp_gps" in df.columns:
+    def _resolve_timestamps(self, df: Frame) -> Frame:
+        # epoch seconds -> naive wall clock datetime in the configured zone
+        if "timestamp_gps" in self._columns(df):
             return df.with_columns(
-                (
-                    pl.col("timestamp_gps")
-                    .cast(pl.Float64)
-                    .map_elements(lambda s: __import__("datetime").datetime.fromtimestamp(s))
-                ).alias("timestamp")
+                epoch_to_datetime(pl.col("timestamp_gps"), "s", self._timezone)
+                .alias("timestamp")
             )
 
         # HR timestamps -> parse and keep naive
-        if "timestamp_hr" in df.columns:
+        if "timestamp_hr" in self._columns(df):
             return df.with_columns(
-                parse_timestamp(pl.col("timestamp_hr").cast(pl.Utf8))
-                .alias("timestamp")
+                self._parse_timestamp(df, "timestamp_hr").alias("timestamp")
             )
 
         # raw timestamp -> parse
-        if "timestamp" in df.columns:
+        if "timestamp" in self._columns(df):
             return df.with_columns(
-                parse_timestamp(pl.col("timestamp").cast(pl.Utf8))
-                .alias("timestamp")
+                self._parse_timestamp(df, "timestamp").alias("timestamp")
             )
 
         return df
 
-    def _normalize_units(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _normalize_units(self, df: Frame) -> Frame:
         rename_map = {
             "sht_humid": "humidity",
             "sht_temp": "temperature",
         }
-        return df.rename({k: v for k, v in rename_map.items() if k in df.columns})
+        return df.rename({k: v for k, v in rename_map.items() if k in self._columns(df)})
+
+    def _validate_ranges(self, df: Frame) -> Frame:
+        columns = self._columns(df)
 
-    def _validate_ranges(self, df: pl.DataFrame) -> pl.DataFrame:
         for col in ["NO", "NO2", "O3", "CO"]:
-            if col in df.columns:
+            if col in columns:
                 logger.warning(
                     "Column '%s' in AirUp dataset is marked as DO NOT USE per hackathon specification. "
                     "Setting values to null.",
@@ -63,12 +81,12 @@ class AirUpSensorPreprocessor(BasePreprocessor):
                 )
                 df = df.with_columns(pl.lit(None).alias(col))
 
-        if "humidity" in df.columns:
+        if "humidity" in columns:
             df = df.filter(
                 (pl.col("humidity") >= 0) & (pl.col("humidity") <= 100)
             )
 
-        if "temperature" in df.columns:
+        if "temperature" in columns:
             df = df.filter(
                 (pl.col("temperature") > -50) & (pl.col("temperature") < 80)
             )
@@ -1,13 +1,20 @@
 import logging
-from typing import Callable, List
+from typing import Callable, Dict, FrozenSet, List, Optional, Union
 import polars as pl
+from core import instrumentation
 from core.interfaces.IDataPreprocessor import IDataPreprocessor
+from core.preprocessing.utils.time_utils import parse_timestamp_column
 
 logger = logging.getLogger(__name__)
 
+# steps run on eager frames and on lazy plans alike
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
 class BasePreprocessor(IDataPreprocessor):
     def __init__(self) -> None:
-        self._steps: List[Callable[[pl.DataFrame], pl.DataFrame]] = [
+        # detected timestamp format per column, checked against every new frame
+        self._timestamp_formats: Dict[str, Optional[str]] = {}
+        self._steps: List[Callable[[Frame], Frame]] = [
             self._select_columns,
             self._resolve_timestamps,
             self._normalize_units,
@@ -16,58 +23,79 @@ class BasePreprocessor(IDataPreprocessor):
             self._finalize,
         ]
 
-    def get_steps(self) -> List[Callable[[pl.DataFrame], pl.DataFrame]]:
+    def get_steps(self) -> List[Callable[[Frame], Frame]]:
         return list(self._steps)
 
-    def preprocess(self, df: pl.DataFrame) -> pl.DataFrame:
+    def input_columns(self) -> Optional[FrozenSet[str]]:
+        # raw columns this preprocessor reads, None means it may need every column
+        # loaders do not query this themselves, pass it as their columns= projection
+        return None
+
+    @staticmethod
+    def _columns(df: Frame) -> List[str]:
+        # column names without materializing a lazy plan
+        return df.collect_schema().names()
+
+    def _parse_timestamp(self, df: Frame, column: str) -> pl.Expr:
+        # single-format parse expression for column, format detected on first use
+        return parse_timestamp_column(df, column, self._timestamp_formats)
+
+    def preprocess(self, df: Frame) -> Frame:
+        # a LazyFrame input only extends the plan, the caller decides when to collect
         if df is None:
             raise ValueError("Input dataframe cannot be None")
 
+        frame_type = pl.LazyFrame if isinstance(df, pl.LazyFrame) else pl.DataFrame
         current = df
 
         for step in self._steps:
             step_name = step.__name__
             logger.debug("Entering step '%s'", step_name)
 
-            next_df = step(current)
+            with instrumentation.span(f"{type(self).__name__}.{step_name}", "preprocess", current) as span:
+                next_df = step(current)
+                span.output(next_df)
 
             if next_df is None:
                 raise RuntimeError(
                     f"Preprocessing step '{step_name}' returned None. "
-                    "Each step must return a polars DataFrame."
+                    f"Each step must return a polars {frame_type.__name__}."
                 )
 
-            if not isinstance(next_df, pl.DataFrame):
+            if not isinstance(next_df, frame_type):
                 raise TypeError(
-                    f"Step '{step_name}' must return a pl.DataFrame, "
+                    f"Step '{step_name}' must return a pl.{frame_type.__name__}, "
                     f"but returned {type(next_df)}"
                 )
 
-            logger.debug(
-                "Exiting step '%s' (rows=%s, cols=%s)",
-                step_name,
-                next_df.height,
-                next_df.width,
-            )
+            if frame_type is pl.DataFrame:
+                logger.debug(
+                    "Exiting step '%s' (rows=%s, cols=%s)",
+                    step_name,
+                    next_df.height,
+                    next_df.width,
+                )
+            else:
+                logger.debug("Exiting step '%s' (lazy)", step_name)
 
             current = next_df
 
         return current
 
-    def _select_columns(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _select_columns(self, df: Frame) -> Frame:
         return df
 
-    def _resolve_timestamps(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _resolve_timestamps(self, df: Frame) -> Frame:
         return df
 
-    def _normalize_units(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _normalize_units(self, df: Frame) -> Frame:
         return df
 
-    def _validate_ranges(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _validate_ranges(self, df: Frame) -> Frame:
         return df
 
-    def _handle_missing(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _handle_missing(self, df: Frame) -> Frame:
         return df
 
-    def _finalize(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _finalize(self, df: Frame) -> Frame:
         return df
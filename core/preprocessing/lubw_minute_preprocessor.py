@@ -1,59 +1,59 @@
+from typing import List, Mapping, Optional
 import polars as pl
-from .base_preprocessor import BasePreprocessor
-from core.preprocessing.utils.time_utils import parse_timestamp
+from .base_preprocessor import BasePreprocessor, Frame
+from .range_rules import RangeRule, range_filter
+
+# columns that hold no measurement values
+_NON_VALUE_COLUMNS = ("timestamp", "datetime", "Hour", "flag")
 
 
 class LUBWMinutePreprocessor(BasePreprocessor):
 
-    def _resolve_timestamps(self, df: pl.DataFrame) -> pl.DataFrame:
+    def __init__(
+        self,
+        range_rules: Optional[Mapping[str, RangeRule]] = None,
+        default_rule: RangeRule = RangeRule(),
+    ) -> None:
+        # range_rules per value column, columns without a rule use default_rule
+        # (non-negative and not null)
+        super().__init__()
+        self._range_rules = dict(range_rules or {})
+        self._default_rule = default_rule
+
+    def _value_columns(self, df: Frame) -> List[str]:
+        return [c for c in self._columns(df) if c not in _NON_VALUE_COLUMNS]
+
+    def _resolve_timestamps(self, df: Frame) -> Frame:
         # prefer standard timestamp column
-        if "timestamp" in df.columns:
+        if "timestamp" in self._columns(df):
             return df.with_columns(
-                parse_timestamp(pl.col("timestamp")).alias("timestamp")
+                self._parse_timestamp(df, "timestamp").alias("timestamp")
             )
 
         # LUBW minute dataset uses 'datetime'
-        if "datetime" in df.columns:
+        if "datetime" in self._columns(df):
             return df.with_columns(
-                pl.col("datetime")
-                .str.strptime(pl.Datetime, strict=False)
-                .alias("timestamp")
+                self._parse_timestamp(df, "datetime").alias("timestamp")
             )
 
         # fallback: synthetic hour column
-        if "Hour" in df.columns:
+        if "Hour" in self._columns(df):
             return df.with_columns(
-                parse_timestamp(pl.col("Hour")).alias("timestamp")
+                self._parse_timestamp(df, "Hour").alias("timestamp")
             )
 
         return df
 
-    def _normalize_units(self, df: pl.DataFrame) -> pl.DataFrame:
-        # ensure all numeric env columns are numeric
-        numeric_cols = [
-            c for c in df.columns
-            if c not in ("timestamp", "datetime", "Hour", "flag")
-        ]
-
-        for col in numeric_cols:
-            df = df.with_columns(pl.col(col).cast(pl.Float64, strict=False))
-
-        return df
-
-    def _validate_ranges(self, df: pl.DataFrame) -> pl.DataFrame:
-        numeric_cols = [
-            c for c in df.columns
-            if c not in ("timestamp", "datetime", "flag")
-        ]
-
-        return (
-            df
-            .with_columns([
-                pl.col(numeric_cols).cast(pl.Float64, strict=False)
-            ])
-            .filter(
-                pl.all_horizontal(
-                    [pl.col(c).is_not_null() & (pl.col(c) >= 0) for c in numeric_cols]
-                )
-            )
-        )
+    def _normalize_units(self, df: Frame) -> Frame:
+        # ensure all numeric env columns are numeric, in one batched cast
+        value_cols = self._value_columns(df)
+        if not value_cols:
+            return df
+        return df.with_columns(pl.col(value_cols).cast(pl.Float64, strict=False))
+
+    def _validate_ranges(self, df: Frame) -> Frame:
+        # one filter over all value columns, values are already Float64
+        value_cols = self._value_columns(df)
+        if not value_cols:
+            return df
+        return df.filter(range_filter(value_cols, self._range_rules, self._default_rule))
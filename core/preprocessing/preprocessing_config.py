@@ -2,6 +2,15 @@ from core.loaders.dataset_ids import DatasetId
 from .synthetic_air_quality_preprocessor import SyntheticAirQualityPreprocessor
 from .lubw_minute_preprocessor import LUBWMinutePreprocessor
 from .airup_sensor_preprocessor import AirUpSensorPreprocessor
+from .range_rules import RangeRule
+
+# plausible ranges of LUBW minute values, all other value columns must be non-negative
+LUBW_RANGE_RULES = {
+    "TEMP": RangeRule(min=-50.0, max=60.0),
+    "RLF": RangeRule(min=0.0, max=100.0),
+    "WIR": RangeRule(min=0.0, max=360.0),
+}
+
 
 PREPROCESSOR_REGISTRY = {
     DatasetId.AIR_QUALITY_REFERENCE: SyntheticAirQualityPreprocessor(),
@@ -12,7 +21,9 @@ PREPROCESSOR_REGISTRY = {
     DatasetId.WEATHER_RAW: SyntheticAirQualityPreprocessor(),
     DatasetId.WEATHER_CALIBRATED: SyntheticAirQualityPreprocessor(),
 
-    DatasetId.LUBW_MINUTE: LUBWMinutePreprocessor(),
+    DatasetId.LUBW_MINUTE: LUBWMinutePreprocessor(
+        range_rules=LUBW_RANGE_RULES,
+    ),
 
     DatasetId.AIRUP_SONT_A: AirUpSensorPreprocessor(),
     DatasetId.AIRUP_SONT_C: AirUpSensorPreprocessor(),
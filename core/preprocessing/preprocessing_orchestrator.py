@@ -6,7 +6,11 @@ class PreprocessingOrchestrator:
     def __init__(self, registry: dict[DatasetId, IDataPreprocessor]) -> None:
         self._registry = registry
 
-    def preprocess(self, dataset_id: DatasetId, df: pl.DataFrame) -> pl.DataFrame:
+    def preprocess(
+        self,
+        dataset_id: DatasetId,
+        df: pl.DataFrame | pl.LazyFrame,
+    ) -> pl.DataFrame | pl.LazyFrame:
         if dataset_id not in self._registry:
             raise ValueError(f"No preprocessor registered for dataset {dataset_id}")
 
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence
+import polars as pl
+
+
+@dataclass(frozen=True)
+class RangeRule:
+    # plausible value range of one column, bounds are inclusive, None = unbounded
+    min: Optional[float] = 0.0
+    max: Optional[float] = None
+    nullable: bool = False  # keep rows where the value is missing
+
+    def valid(self, column: str) -> pl.Expr:
+        # boolean expression that is True for rows passing the rule
+        col = pl.col(column)
+        bounds = []
+        if self.min is not None:
+            bounds.append(col >= self.min)
+        if self.max is not None:
+            bounds.append(col <= self.max)
+
+        in_range = pl.all_horizontal(bounds) if bounds else pl.lit(True)
+
+        if self.nullable:
+            return col.is_null() | in_range
+        return col.is_not_null() & in_range
+
+
+def range_filter(
+    columns: Sequence[str],
+    rules: Mapping[str, RangeRule],
+    default: RangeRule = RangeRule(),
+) -> pl.Expr:
+    # single predicate over all columns, columns without a rule use default
+    return pl.all_horizontal([rules.get(c, default).valid(c) for c in columns])
@@ -0,0 +1,93 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Union
+import polars as pl
+from core.interfaces.IDataPreprocessor import IDataPreprocessor
+
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+# aggregation name -> expression over one column, nulls are skipped
+AGGREGATIONS: Dict[str, Callable[[pl.Expr], pl.Expr]] = {
+    "mean": lambda c: c.mean(),
+    "median": lambda c: c.median(),
+    "min": lambda c: c.min(),
+    "max": lambda c: c.max(),
+    "std": lambda c: c.std(),
+    "sum": lambda c: c.sum(),
+    "count": lambda c: c.count(),
+    "first": lambda c: c.first(),
+    "last": lambda c: c.last(),
+}
+
+# rows per bucket, always added so consumers can judge bucket coverage
+COUNT_COLUMN = "n_samples"
+
+
+@dataclass(frozen=True)
+class Resampler(IDataPreprocessor):
+    # time bucketed downsampling with group_by_dynamic, e.g. minute data -> "10m"/"1h"/"1d"
+    #
+    # buckets are [start, start + every) labelled by their start; numeric columns get
+    # default_aggregations unless listed in aggregations; a column with a single
+    # aggregation keeps its name, several give <col>_<agg>; non-numeric columns
+    # other than the keys are dropped
+    every: str
+    aggregations: Mapping[str, Sequence[str]] = field(default_factory=dict)
+    default_aggregations: Sequence[str] = ("mean",)
+    timestamp: str = "timestamp"
+    group_by: Sequence[str] = ()
+
+    def __post_init__(self) -> None:
+        for aggs in [self.default_aggregations, *self.aggregations.values()]:
+            unknown = set(aggs) - set(AGGREGATIONS)
+            if unknown:
+                raise ValueError(f"Unknown aggregations: {sorted(unknown)}")
+            if not aggs:
+                raise ValueError("Every column needs at least one aggregation")
+
+    @property
+    def key(self) -> str:
+        # stable identity of the resampling spec, used to key stored rollups
+        aggregations = sorted((col, tuple(aggs)) for col, aggs in self.aggregations.items())
+        return repr((self.every, aggregations, tuple(self.default_aggregations), self.timestamp, tuple(self.group_by)))
+
+    def _expressions(self, schema: pl.Schema) -> List[pl.Expr]:
+        keys = {self.timestamp, *self.group_by}
+        exprs = []
+        for name, dtype in schema.items():
+            if name in keys:
+                continue
+            if name in self.aggregations:
+                aggs = self.aggregations[name]
+            elif dtype.is_numeric():
+                aggs = self.default_aggregations
+            else:
+                continue
+            for agg in aggs:
+                alias = name if len(aggs) == 1 else f"{name}_{agg}"
+                exprs.append(AGGREGATIONS[agg](pl.col(name)).alias(alias))
+        return exprs
+
+    def preprocess(self, df: Frame) -> Frame:
+        return self.resample(df)
+
+    def resample(self, df: Frame) -> Frame:
+        schema = df.collect_schema()
+        if self.timestamp not in schema:
+            raise ValueError(f"DataFrame must contain a '{self.timestamp}' column")
+        if not schema[self.timestamp].is_temporal():
+            raise TypeError(f"Column '{self.timestamp}' must be a datetime, got {schema[self.timestamp]}")
+        for col in [*self.group_by, *self.aggregations]:
+            if col not in schema:
+                raise ValueError(f"Column '{col}' not in DataFrame")
+
+        ts = pl.col(self.timestamp)
+        group_by = list(self.group_by) or None
+
+        # group_by_dynamic needs sorted time (within groups); rows without a
+        # timestamp cannot be bucketed
+        return (
+            df.filter(ts.is_not_null())
+            .sort([*self.group_by, self.timestamp])
+            .group_by_dynamic(self.timestamp, every=self.every, closed="left", label="left", group_by=group_by)
+            .agg([pl.len().alias(COUNT_COLUMN), *self._expressions(schema)])
+        )
@@ -0,0 +1,101 @@
+from pathlib import Path
+import hashlib
+import logging
+import os
+from typing import Callable, Iterable, List, Optional
+import polars as pl
+
+from core.loaders.dataset_ids import DatasetId
+from .resampler import Resampler
+
+logger = logging.getLogger(__name__)
+
+# bump when the rollup layout or semantics change
+ROLLUP_FORMAT_VERSION = 1
+
+ROLLUP_DIR = "rollups"
+
+
+def rollup_key(resampler: Resampler, source: str, variant: Iterable[str] = ()) -> str:
+    # identity of a rollup: resampling spec, the loader's source fingerprint
+    # (IDataLoader.source_fingerprint: files, dataset config and projection) and
+    # any caller supplied variant (e.g. the preprocessor used)
+    payload = repr((ROLLUP_FORMAT_VERSION, resampler.key, source, tuple(variant)))
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+class RollupStore:
+    # pre-aggregated multi-resolution rollups as Arrow IPC files
+    #
+    # layout: <root>/<dataset_id>/rollups/<every>.<key>.arrow
+    # with root = the DatasetCache root the rollups sit next to the cached source
+    # files and DatasetCache.clear(dataset_id) removes them as well; a changed
+    # source file, dataset config, projection or resampling spec changes the key, older files of the same
+    # resolution are replaced on the next build
+
+    def __init__(self, root: Path) -> None:
+        self._root = Path(root)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def directory(self, dataset_id: DatasetId) -> Path:
+        return self._root / dataset_id.value / ROLLUP_DIR
+
+    def entry(self, dataset_id: DatasetId, resampler: Resampler, key: str) -> Path:
+        return self.directory(dataset_id) / f"{resampler.every}.{key[:16]}.arrow"
+
+    def scan(
+        self,
+        dataset_id: DatasetId,
+        resampler: Resampler,
+        source: str,
+        build: Callable[[], pl.DataFrame],
+        variant: Iterable[str] = (),
+    ) -> pl.LazyFrame:
+        # memory-mapped scan of the rollup; build (the resampled frame) only runs on a miss
+        entry = self.entry(dataset_id, resampler, rollup_key(resampler, source, variant))
+
+        if entry.exists():
+            logger.debug("Rollup hit for '%s' at %s", dataset_id.value, resampler.every)
+            return pl.scan_ipc(entry)
+
+        logger.info("Building %s rollup for dataset '%s'", resampler.every, dataset_id.value)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        for stale in entry.parent.glob(f"{resampler.every}.*.arrow"):
+            stale.unlink(missing_ok=True)
+
+        df = build()
+
+        # write-then-rename so concurrent readers never see a partial file
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        df.write_ipc(tmp, compression="uncompressed")
+        os.replace(tmp, entry)
+
+        return pl.scan_ipc(entry)
+
+    def resolutions(self, dataset_id: DatasetId) -> List[str]:
+        # resolutions with a stored rollup (possibly outdated)
+        directory = self.directory(dataset_id)
+        if not directory.exists():
+            return []
+        return sorted({path.name.split(".", 1)[0] for path in directory.glob("*.arrow")})
+
+    def clear(self, dataset_id: Optional[DatasetId] = None) -> None:
+        # remove the rollups of one dataset or of all datasets
+        if dataset_id is not None:
+            directories = [self.directory(dataset_id)]
+        elif self._root.exists():
+            directories = [d / ROLLUP_DIR for d in self._root.iterdir() if d.is_dir()]
+        else:
+            directories = []
+
+        for directory in directories:
+            if not directory.exists():
+                continue
+            for path in directory.iterdir():
+                path.unlink()
+            directory.rmdir()
+            logger.info("Cleared rollups at '%s'", directory)
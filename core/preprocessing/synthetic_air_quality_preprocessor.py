@@ -1,15 +1,14 @@
 import polars as pl
-from .base_preprocessor import BasePreprocessor
-from core.preprocessing.utils.time_utils import parse_timestamp
+from .base_preprocessor import BasePreprocessor, Frame
 
 class SyntheticAirQualityPreprocessor(BasePreprocessor):
 
-    def _select_columns(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _select_columns(self, df: Frame) -> Frame:
         return df
 
-    def _resolve_timestamps(self, df: pl.DataFrame) -> pl.DataFrame:
-        if "timestamp" in df.columns:
+    def _resolve_timestamps(self, df: Frame) -> Frame:
+        if "timestamp" in self._columns(df):
             return df.with_columns(
-                parse_timestamp(pl.col("timestamp")).alias("timestamp")
+                self._parse_timestamp(df, "timestamp").alias("timestamp")
             )
         return df
@@ -1,28 +1,270 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import polars as pl
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
-def parse_timestamp(expr: pl.Expr) -> pl.Expr:
-    # attempt string → datetime parsing
-    parsed_str = (
-        expr.str.strptime(pl.Datetime, strict=False)
-        .alias("ts_from_str")
+# microseconds per epoch unit
+_EPOCH_SCALE = {"s": 1_000_000, "ms": 1_000, "us": 1}
+
+_ONE_US = timedelta(microseconds=1)
+
+# explicit formats tried by detect_timestamp_format, first one parsing the whole sample wins
+TIMESTAMP_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S%.f",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S%.f",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%Y-%m-%d",
+    "%d.%m.%Y",
+)
+
+# non-strftime formats: numeric epochs and columns that are already datetimes
+EPOCH_FORMATS = {"epoch_s": "s", "epoch_ms": "ms", "epoch_us": "us"}
+DATETIME_FORMAT = "datetime"
+
+# rows sampled per column for format detection
+DEFAULT_SAMPLE_SIZE = 1_000
+
+# utc offsets only change on quarter-hour boundaries
+_OFFSET_BUCKET_US = 15 * 60 * 1_000_000
+
+
+def _local_offsets(epoch_us: pl.Series) -> pl.Series:
+    # utc offset (us) of the system local zone for every epoch value, as
+    # datetime.fromtimestamp applies it; one python call per distinct 15 min bucket
+    buckets = epoch_us // _OFFSET_BUCKET_US
+    uniques = buckets.drop_nulls().unique()
+    offsets = [
+        datetime.fromtimestamp(b * _OFFSET_BUCKET_US / 1_000_000, tz=dt_timezone.utc)
+        .astimezone()
+        .utcoffset()
+        // _ONE_US
+        for b in uniques
+    ]
+    return buckets.replace_strict(uniques, offsets, return_dtype=pl.Int64)
+
+
+def _system_zone() -> Optional[str]:
+    # IANA name of the system local zone from TZ or the /etc/localtime link,
+    # None when it cannot be resolved (e.g. a POSIX TZ rule like "CET-1CEST")
+    name = os.environ.get("TZ")
+    if name is None:
+        target = os.path.realpath("/etc/localtime")
+        name = target.split("zoneinfo/", 1)[1] if "zoneinfo/" in target else None
+    if not name:
+        return None
+    name = name.lstrip(":")
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+    return name
+
+
+def epoch_to_datetime(
+    expr: pl.Expr,
+    unit: str = "s",
+    timezone: Optional[str] = None,
+) -> pl.Expr:
+    # vectorized epoch -> naive datetime(us) wall clock time
+    # timezone None: system local time, same values as datetime.fromtimestamp
+    # timezone "UTC" or an IANA name (e.g. "Europe/Berlin"): wall clock time in that zone
+    if unit not in _EPOCH_SCALE:
+        raise ValueError(f"Unknown epoch unit '{unit}', expected one of {sorted(_EPOCH_SCALE)}")
+
+    epoch_us = (expr.cast(pl.Float64) * _EPOCH_SCALE[unit]).round().cast(pl.Int64)
+
+    if timezone is None:
+        # a resolvable system zone converts natively, only an unnamed one needs the
+        # python offset lookup (elementwise, so streaming plans keep streaming)
+        timezone = _system_zone()
+        if timezone is None:
+            offsets = epoch_us.map_batches(_local_offsets, return_dtype=pl.Int64, is_elementwise=True)
+            return pl.from_epoch(epoch_us + offsets, time_unit="us")
+
+    utc = pl.from_epoch(epoch_us, time_unit="us")
+    if timezone == "UTC":
+        return utc
+
+    return (
+        utc.dt.replace_time_zone("UTC")
+        .dt.convert_time_zone(timezone)
+        .dt.replace_time_zone(None)
     )
 
-    # numeric epoch detection (seconds or ms)
-    numeric = expr.cast(pl.Float64, strict=False)
+# epoch unit by magnitude: seconds < 1e11 <= milliseconds < 1e14 <= microseconds
+_EPOCH_MS_FROM = 1e11
+_EPOCH_US_FROM = 1e14
+
+
+def _epoch_format(values: pl.Series) -> str:
+    largest = values.abs().max()
+    if largest < _EPOCH_MS_FROM:
+        return "epoch_s"
+    if largest < _EPOCH_US_FROM:
+        return "epoch_ms"
+    return "epoch_us"
+
+
+def _fits(sample: pl.Series, fmt: Optional[str]) -> bool:
+    # True when every value of the non-null sample parses with fmt
+    if fmt is None:
+        return False
+    if fmt == DATETIME_FORMAT:
+        return sample.dtype.is_temporal()
+    if fmt in EPOCH_FORMATS:
+        if sample.dtype.is_temporal():
+            return False
+        numeric = sample.cast(pl.Float64, strict=False)
+        return numeric.null_count() == 0 and (sample.len() == 0 or _epoch_format(numeric) == fmt)
+    if sample.dtype != pl.String:
+        return False
+    try:
+        sample.str.strptime(pl.Datetime, fmt, strict=True)
+    except pl.exceptions.PolarsError:
+        return False
+    return True
+
 
-    # safely convert numeric epoch → datetime(ms)
-    # epoch_seconds < 10^11 ; epoch_milliseconds ≥ 10^11
-    epoch_ms = (numeric.round() * 1_000).cast(pl.Datetime("ms"), strict=False)
-    epoch_s = (numeric.round()).cast(pl.Datetime("ms"), strict=False)
+def detect_timestamp_format(
+    values: pl.Series,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> Optional[str]:
+    # pick one explicit format for a timestamp column from a sample of its values
+    # returns a strftime format, an EPOCH_FORMATS key, DATETIME_FORMAT,
+    # or None when no single format fits (parse_timestamp then infers the format)
+    if values.dtype.is_temporal():
+        return DATETIME_FORMAT
 
+    sample = values.drop_nulls().head(sample_size)
+    if sample.len() == 0:
+        return None
+
+    if sample.dtype.is_numeric():
+        return _epoch_format(sample.cast(pl.Float64))
+
+    if sample.dtype != pl.String:
+        return None
+
+    numeric = sample.cast(pl.Float64, strict=False)
+    if numeric.null_count() == 0:
+        return _epoch_format(numeric)
+
+    return next((fmt for fmt in TIMESTAMP_FORMATS if _fits(sample, fmt)), None)
+
+
+def _sample(df: Union[pl.DataFrame, pl.LazyFrame], column: str, sample_size: int) -> pl.Series:
+    # first sample_size non-null values, on a LazyFrame only those are collected
+    if isinstance(df, pl.LazyFrame):
+        return (
+            df.select(pl.col(column))
+            .drop_nulls()
+            .head(sample_size)
+            .collect()
+            .to_series()
+        )
+    return df.get_column(column).drop_nulls().head(sample_size)
+
+
+def resolve_timestamp_format(
+    df: Union[pl.DataFrame, pl.LazyFrame],
+    column: str,
+    formats: Dict[str, Optional[str]],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> Optional[str]:
+    # format of column from the formats cache, detected and stored on first use
+    # a cached format is checked against the sample of every new frame and
+    # detected again when it does not fit, e.g. a file written by other firmware
+    values = _sample(df, column, sample_size)
+
+    cached = formats.get(column)
+    if cached is not None:
+        if _fits(values, cached):
+            return cached
+        logger.warning(
+            "Cached timestamp format '%s' does not fit column '%s' anymore, detecting again",
+            cached,
+            column,
+        )
+
+    fmt = detect_timestamp_format(values, sample_size)
+    if fmt is None:
+        logger.warning(
+            "No single timestamp format fits column '%s', falling back to format inference",
+            column,
+        )
+    else:
+        logger.debug("Detected timestamp format '%s' for column '%s'", fmt, column)
+
+    formats[column] = fmt
+    return fmt
+
+
+def parse_timestamp(expr: pl.Expr, format: Optional[str] = None) -> pl.Expr:
+    # format from detect_timestamp_format: one vectorized parse, unparsable rows become null
+    # epoch formats yield naive UTC datetimes
+    if format == DATETIME_FORMAT:
+        return expr.cast(pl.Datetime)
+
+    if format in EPOCH_FORMATS:
+        numeric = expr.cast(pl.Float64, strict=False)
+        return epoch_to_datetime(numeric, EPOCH_FORMATS[format], "UTC")
+
+    if format is not None:
+        return expr.str.strptime(pl.Datetime, format, strict=False)
+
+    # no format known: numeric strings are epochs with the unit picked per row by
+    # the same magnitude rule as _epoch_format; strptime infers the format of the
+    # remaining strings (numeric ones are masked, the inference would fail on them)
+    numeric = expr.cast(pl.Float64, strict=False)
+    magnitude = numeric.abs()
     parsed_num = (
-        pl.when(numeric.is_not_null() & (numeric > 10_000_000_000))
-        .then(epoch_ms)
-        .otherwise(epoch_s)
+        pl.when(magnitude < _EPOCH_MS_FROM).then(epoch_to_datetime(numeric, "s", "UTC"))
+        .when(magnitude < _EPOCH_US_FROM).then(epoch_to_datetime(numeric, "ms", "UTC"))
+        .otherwise(epoch_to_datetime(numeric, "us", "UTC"))
     )
+    parsed_str = pl.when(numeric.is_null()).then(expr).str.strptime(pl.Datetime, strict=False)
 
-    # priority: string → epoch
     return parsed_str.fill_null(parsed_num)
+
+
+def parse_timestamp_column(
+    df: Union[pl.DataFrame, pl.LazyFrame],
+    column: str,
+    formats: Dict[str, Optional[str]],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> pl.Expr:
+    # parse expression for column with the cached or detected format
+    #
+    # on a DataFrame the column is parsed right away: values the explicit format
+    # turns into null are parsed again with format inference and a warning is
+    # logged, so rows outside the sample never silently lose their timestamp;
+    # the result is returned as a literal to not parse twice
+    # on a LazyFrame only the sample check of resolve_timestamp_format applies
+    fmt = resolve_timestamp_format(df, column, formats, sample_size)
+    expr = parse_timestamp(pl.col(column), fmt)
+    if fmt is None or isinstance(df, pl.LazyFrame):
+        return expr
+
+    raw = df.get_column(column)
+    parsed = df.select(expr).to_series()
+    new_nulls = parsed.null_count() - raw.null_count()
+    if new_nulls > 0:
+        logger.warning(
+            "%d values of column '%s' do not match timestamp format '%s', parsing them with format inference",
+            new_nulls,
+            column,
+            fmt,
+        )
+        inferred = df.select(parse_timestamp(pl.col(column))).to_series().cast(parsed.dtype)
+        parsed = parsed.fill_null(inferred)
+
+    return pl.lit(parsed)
@@ -0,0 +1,556 @@
+# vectorized synthetic Heilbronn datasets at configurable scale
+#
+# produces the files DATASET_REGISTRY points to below a base path, so
+# CsvDatasetLoader(base_path) / AirUpDatasetLoader(base_path) read them as is:
+#   - air quality, noise and weather per station, raw (sensor) and calibrated (reference)
+#   - AirUp minute logs, one file per day in the raw logger column layout
+#   - the LUBW minute CSV
+# the reference value table is real data and is not generated
+#
+# usage: python -m core.synthetic.heilbronn_generator --base-path /tmp/syn [--stations 10]
+#        [--start 2021-01-01] [--end 2024-01-01] [--every 1h] [--minute-every 1m] [--seed 0]
+import argparse
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+import polars as pl
+
+from core.loaders.dataset_config import DATASET_REGISTRY, DatasetConfig
+from core.loaders.dataset_ids import DatasetId
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# marks rows of raw datasets where a spike, flatline or dropout was injected
+ANOMALY_COLUMN = "injected_anomaly"
+
+# column layout of the AirUp minute logs, in file order
+AIRUP_COLUMNS = (
+    "pm1", "pm25", "pm10", "opc_flow", "opc_humid", "opc_temp",
+    *(f"RAW_OPC_Bin {i}" for i in range(24)),
+    "RAW_OPC_Bin1 MToF", "RAW_OPC_Bin3 MToF", "RAW_OPC_Bin5 MToF", "RAW_OPC_Bin7 MToF",
+    "RAW_OPC_Sampling Period", "RAW_OPC_SFR", "RAW_OPC_Temperature", "RAW_OPC_Relative humidity",
+    "RAW_OPC_PM1", "RAW_OPC_PM2.5", "RAW_OPC_PM10",
+    "RAW_OPC_Reject count Glitch", "RAW_OPC_Reject count LongTOF", "RAW_OPC_Reject count Ratio",
+    "RAW_OPC_Reject Count OutOfRange", "RAW_OPC_Fan rev count", "RAW_OPC_Laser status", "RAW_OPC_Checksum",
+    "sht_humid", "sht_temp", "CO", "NO", "NO2", "O3",
+    "RAW_ADC_CO_W", "RAW_ADC_CO_A", "RAW_ADC_NO_W", "RAW_ADC_NO_A",
+    "RAW_ADC_NO2_W", "RAW_ADC_NO2_A", "RAW_ADC_O3_W", "RAW_ADC_O3_A",
+    "heater_temp", "heater", "heater_set", "lat", "lon", "alt", "rssi",
+    "timestamp", "timestamp_hr", "timestamp_gps",
+)
+
+# sensor letter per AirUp dataset, the loader globs airup_sont_<x>_avg_every_minute_data.log.*
+AIRUP_SENSORS = {DatasetId.AIRUP_SONT_A: "a", DatasetId.AIRUP_SONT_C: "c"}
+
+_HEILBRONN = (49.1427, 9.2109, 158.0)
+
+# raw readings saturate here, drift and noise never push them beyond
+_UPPER_LIMITS = {"humidity": 100.0, "wind_direction": 360.0}
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# random streams, one per purpose so adding a column never shifts another one
+_STREAM_REGIME, _STREAM_STATIONS, _STREAM_CHUNK = 0, 1, 2
+
+# regime channels: slowly varying day-to-day weather shared by all stations
+_STAGNATION, _TEMPERATURE, _PRESSURE, _WIND = range(4)
+
+
+def _seconds(every: str) -> int:
+    match = re.fullmatch(r"(\d+)([smhd])", every)
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f"Unsupported frequency '{every}', expected e.g. '30s', '1m', '1h', '1d'")
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def _epoch(day: date) -> int:
+    return (day - date(1970, 1, 1)).days * 86400
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    # stations x years x frequency of the synthetic CSVs (air quality, noise, weather)
+    stations: int = 3
+    start: date = date(2021, 1, 1)
+    end: date = date(2024, 1, 1)  # exclusive
+    every: str = "1h"
+    # AirUp and LUBW minute data cover the comparison campaign
+    campaign_start: date = date(2024, 11, 15)
+    campaign_end: date = date(2025, 2, 6)  # exclusive
+    minute_every: str = "1m"
+    # AirUp sensor directories, each written as sont_<letter>; only "a" and "c" are registered
+    airup_sensors: Sequence[str] = ("a", "c")
+    gps_fix_rate: float = 0.9
+    # relative sensor gain drift, standard deviation per year and column
+    drift_per_year: float = 0.05
+    # share of raw samples per column hit by an injected anomaly
+    anomaly_rate: float = 0.001
+    flatline_samples: int = 12
+    chunk_days: int = 31
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        _seconds(self.every)
+        _seconds(self.minute_every)
+        if self.stations < 1:
+            raise ValueError("stations must be >= 1")
+        if self.start >= self.end or self.campaign_start >= self.campaign_end:
+            raise ValueError("start must be before end")
+        if not 0.0 <= self.anomaly_rate < 1.0 or not 0.0 <= self.gps_fix_rate <= 1.0:
+            raise ValueError("anomaly_rate and gps_fix_rate must be fractions")
+        if self.chunk_days < 1 or self.flatline_samples < 1:
+            raise ValueError("chunk_days and flatline_samples must be >= 1")
+
+
+@dataclass
+class _Clock:
+    # time features of one chunk, arrays of shape (T, 1) broadcast against stations
+    epoch: np.ndarray
+    hour: np.ndarray
+    weekend: np.ndarray
+    winter: np.ndarray  # +1 mid January, -1 mid July
+    afternoon: np.ndarray  # +1 at 15:00, -1 at 03:00
+    years: np.ndarray  # since the start of the series, drives sensor drift
+
+    @classmethod
+    def of(cls, epoch: np.ndarray, origin: int) -> "_Clock":
+        day = epoch / 86400.0
+        hour = (epoch % 86400) / 3600.0
+        col = lambda a: a[:, None]
+        return cls(
+            epoch=epoch,
+            hour=col(hour),
+            weekend=col((np.floor(day) + 3) % 7 >= 5),  # 1970-01-01 was a Thursday
+            winter=col(np.cos(2 * np.pi * (day - 14.5) / 365.2425)),
+            afternoon=col(np.sin(2 * np.pi * (hour - 9.0) / 24.0)),
+            years=col((epoch - origin) / (365.2425 * 86400)),
+        )
+
+
+@dataclass
+class _Table:
+    # one generated chunk: per column an array of shape (T, S)
+    clock: _Clock
+    stations: List[str]
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+class HeilbronnDataGenerator:
+    # deterministic for a given SyntheticScale: the same seed gives the same files,
+    # raw and calibrated datasets share the underlying signal
+    #
+    # everything is generated in chunks of chunk_days (AirUp: one day per file)
+    # with numpy array operations over time x stations, so memory is bounded by
+    # the chunk and not by the total volume
+
+    def __init__(self, scale: SyntheticScale = SyntheticScale()) -> None:
+        self._scale = scale
+        first = min(scale.start, scale.campaign_start)
+        last = max(scale.end, scale.campaign_end)
+        self._regime_origin = _epoch(first) - 86400
+        n_days = (last - first).days + 3
+        # smooth day-to-day weather: random daily knots, linearly interpolated
+        self._regime_knots = self._rng(_STREAM_REGIME).standard_normal((4, n_days))
+
+        self._csv: Dict[DatasetId, Tuple[str, Callable[[_Table, np.random.Generator], None], bool]] = {
+            DatasetId.AIR_QUALITY_RAW: ("AQ", self._air_quality, True),
+            DatasetId.AIR_QUALITY_CALIBRATED: ("AQ", self._air_quality, False),
+            DatasetId.NOISE_RAW: ("NS", self._noise, True),
+            DatasetId.NOISE_CALIBRATED: ("NS", self._noise, False),
+            DatasetId.WEATHER_RAW: ("WX", self._weather, True),
+            DatasetId.WEATHER_CALIBRATED: ("WX", self._weather, False),
+        }
+
+    @property
+    def scale(self) -> SyntheticScale:
+        return self._scale
+
+    def dataset_ids(self) -> List[DatasetId]:
+        # registered datasets this scale produces
+        airup = [d for d, sensor in AIRUP_SENSORS.items() if sensor in self._scale.airup_sensors]
+        return [*self._csv, DatasetId.LUBW_MINUTE, *airup]
+
+    def _rng(self, *stream: int) -> np.random.Generator:
+        return np.random.default_rng([self._scale.seed, *stream])
+
+    def _regime(self, clock: _Clock, channel: int) -> np.ndarray:
+        days = (clock.epoch - self._regime_origin) / 86400.0
+        knots = self._regime_knots[channel]
+        return np.interp(days, np.arange(knots.size), knots)[:, None]
+
+    # ---------------------------------------------------------
+    #                        SIGNALS
+    # ---------------------------------------------------------
+    def _traffic(self, clock: _Clock) -> np.ndarray:
+        # morning and evening rush hour, weaker on weekends
+        h = clock.hour
+        rush = 1.0 + 0.7 * np.exp(-((h - 8.0) ** 2) / 3.0) + 0.5 * np.exp(-((h - 17.5) ** 2) / 4.0)
+        night = 0.55 + 0.45 / (1.0 + np.exp(-(h - 5.5) * 2.0)) - 0.3 / (1.0 + np.exp(-(h - 22.0) * 2.0))
+        return rush * night * np.where(clock.weekend, 0.7, 1.0)
+
+    def _air_quality(self, table: _Table, rng: np.random.Generator) -> None:
+        clock, n = table.clock, len(table.stations)
+        station = self._rng(_STREAM_STATIONS, 1)
+        urban = station.uniform(0.7, 1.4, n)  # traffic exposure per station
+        pm_share = station.uniform(0.6, 0.72, n)
+
+        stagnation = np.exp(0.35 * self._regime(clock, _STAGNATION))
+        traffic = self._traffic(clock)
+        noise = lambda sd: np.exp(rng.normal(0.0, sd, traffic.shape[:1] + (n,)))
+
+        no2 = 24.0 * urban * traffic * (1.0 + 0.25 * clock.winter) * stagnation * noise(0.15)
+        pm10 = 17.0 * (1.0 + 0.35 * clock.winter) * (0.8 + 0.2 * traffic * urban) * stagnation * noise(0.12)
+        pm25 = pm10 * pm_share * noise(0.05)
+        photo = np.clip(1.0 + 0.6 * clock.afternoon, 0.2, None) * (1.0 - 0.35 * clock.winter)
+        o3 = np.clip(55.0 * photo / stagnation - 0.4 * no2, 2.0, None) * noise(0.1)
+
+        table.columns.update(no2=no2, o3=o3, pm10=pm10, pm25=pm25)
+
+    def _noise(self, table: _Table, rng: np.random.Generator) -> None:
+        clock, n = table.clock, len(table.stations)
+        offset = self._rng(_STREAM_STATIONS, 2).uniform(-4.0, 6.0, n)
+        shape = clock.epoch.shape + (n,)
+
+        laeq = 38.0 + offset + 22.0 * np.log1p(self._traffic(clock)) + rng.normal(0.0, 2.0, shape)
+        lamax = laeq + rng.gamma(4.0, 2.5, shape)
+        table.columns.update(laeq_db=laeq, lamax_db=lamax)
+
+    def _weather(self, table: _Table, rng: np.random.Generator) -> None:
+        clock, n = table.clock, len(table.stations)
+        heat_island = self._rng(_STREAM_STATIONS, 3).uniform(0.0, 1.5, n)
+        shape = clock.epoch.shape + (n,)
+
+        temperature = (
+            11.0 - 9.5 * clock.winter + (4.0 - 1.5 * clock.winter) * clock.afternoon
+            + 3.0 * self._regime(clock, _TEMPERATURE) + heat_island + rng.normal(0.0, 0.4, shape)
+        )
+        humidity = np.clip(
+            76.0 + 8.0 * clock.winter - 14.0 * clock.afternoon - 1.2 * (temperature - 11.0)
+            + rng.normal(0.0, 3.0, shape),
+            15.0, 100.0,
+        )
+        pressure = 1016.0 + 7.0 * self._regime(clock, _PRESSURE) + rng.normal(0.0, 0.3, shape)
+        wind = self._regime(clock, _WIND)
+        wind_speed = np.abs(2.6 + 1.4 * wind - 0.8 * self._regime(clock, _STAGNATION) + rng.normal(0.0, 0.7, shape))
+        wind_direction = (235.0 + 55.0 * wind + rng.normal(0.0, 35.0, shape)) % 360.0
+        # rain mostly on humid, low pressure hours
+        p_rain = 0.02 + 0.12 / (1.0 + np.exp(-(humidity - 88.0) / 3.0)) * (pressure < 1016.0)
+        precipitation = np.where(rng.random(shape) < p_rain, rng.exponential(0.8, shape), 0.0)
+
+        table.columns.update(
+            temperature=temperature,
+            humidity=humidity,
+            pressure_hpa=pressure,
+            wind_speed=wind_speed,
+            wind_direction=wind_direction,
+            precipitation_mm=precipitation,
+        )
+
+    # ---------------------------------------------------------
+    #                    SENSOR ARTEFACTS
+    # ---------------------------------------------------------
+    def _sensor(self, table: _Table, rng: np.random.Generator, stream: int) -> np.ndarray:
+        # reference values -> raw sensor readings: per station and column gain drift
+        # over time, relative measurement noise, then spikes, flatlines and dropouts
+        scale, n = self._scale, len(table.stations)
+        drift_rng = self._rng(_STREAM_STATIONS, 100 + stream)
+        injected = np.zeros(table.clock.epoch.shape + (n,), dtype=bool)
+
+        for name, values in table.columns.items():
+            gain = 1.0 + drift_rng.normal(0.0, scale.drift_per_year, n) * table.clock.years
+            reading = values * (gain + rng.normal(0.0, 0.03, values.shape))
+            if name in _UPPER_LIMITS:
+                reading = np.minimum(reading, _UPPER_LIMITS[name])
+            table.columns[name], mask = _inject(reading, rng, scale.anomaly_rate, scale.flatline_samples)
+            injected |= mask
+
+        return injected
+
+    # ---------------------------------------------------------
+    #                       CHUNKING
+    # ---------------------------------------------------------
+    def _windows(self, start: date, end: date, every: str, days: int) -> Iterator[Tuple[int, np.ndarray]]:
+        step = _seconds(every)
+        first, stop = _epoch(start), _epoch(end)
+        for i, lo in enumerate(range(first, stop, days * 86400)):
+            hi = min(lo + days * 86400, stop)
+            # align to the global grid so chunk borders never shift the sampling
+            begin = first + -(-(lo - first) // step) * step
+            yield i, np.arange(begin, hi, step, dtype=np.int64)
+
+    def chunks(self, dataset_id: DatasetId) -> Iterator[pl.DataFrame]:
+        # dataset_id as a sequence of frames in time order, in the file's column layout;
+        # date/time columns are Datetime here and TIMESTAMP_FORMAT strings on disk
+        if dataset_id in self._csv:
+            yield from self._csv_chunks(dataset_id)
+        elif dataset_id == DatasetId.LUBW_MINUTE:
+            yield from self._lubw_chunks()
+        elif dataset_id in AIRUP_SENSORS:
+            for _, df in self._airup_days(AIRUP_SENSORS[dataset_id]):
+                yield df
+        else:
+            raise ValueError(f"No synthetic generator for dataset_id={dataset_id.value}")
+
+    def frame(self, dataset_id: DatasetId) -> pl.DataFrame:
+        # the whole dataset in memory, for small scales and tests
+        return pl.concat(list(self.chunks(dataset_id)), how="vertical")
+
+    def _csv_chunks(self, dataset_id: DatasetId) -> Iterator[pl.DataFrame]:
+        prefix, signal, raw = self._csv[dataset_id]
+        scale = self._scale
+        stations = [f"HN-{prefix}-{i + 1:03d}" for i in range(scale.stations)]
+        key = "sensor_id" if prefix == "NS" else "station_id"
+        stream = {"AQ": 1, "NS": 2, "WX": 3}[prefix]
+        origin = _epoch(scale.start)
+
+        for i, epoch in self._windows(scale.start, scale.end, scale.every, scale.chunk_days):
+            table = _Table(_Clock.of(epoch, origin), stations)
+            # the signal stream does not depend on raw, so both variants share it
+            signal(table, self._rng(_STREAM_CHUNK, stream, i))
+            injected = self._sensor(table, self._rng(_STREAM_CHUNK, stream, i, 1), stream) if raw else None
+            yield _long_frame(table, key, injected)
+
+    def _lubw_chunks(self) -> Iterator[pl.DataFrame]:
+        # reference station: same models as the synthetic CSVs, one station, no drift
+        scale = self._scale
+        origin = _epoch(scale.campaign_start)
+        windows = self._windows(scale.campaign_start, scale.campaign_end, scale.minute_every, scale.chunk_days)
+
+        for i, epoch in windows:
+            table = _Table(_Clock.of(epoch, origin), ["LUBW"])
+            self._air_quality(table, self._rng(_STREAM_CHUNK, 10, i))
+            self._weather(table, self._rng(_STREAM_CHUNK, 11, i))
+            c = {name: values[:, 0].round(2) for name, values in table.columns.items()}
+            yield pl.DataFrame({
+                "datetime": _datetimes(epoch),
+                "NO2": c["no2"],
+                "O3": c["o3"],
+                "PM10": c["pm10"],
+                "PM2p5": c["pm25"],
+                "TEMP": c["temperature"],
+                "RLF": c["humidity"],
+                "p-Luft": c["pressure_hpa"],
+                "NSCH": c["precipitation_mm"],
+                "WIR": c["wind_direction"],
+                "WIV": c["wind_speed"],
+            })
+
+    def _airup_days(self, sensor: str) -> Iterator[Tuple[date, pl.DataFrame]]:
+        # one frame per calendar day like the logger's daily files
+        scale = self._scale
+        stream = 20 + ord(sensor)
+        origin = _epoch(scale.campaign_start)
+
+        for i, epoch in self._windows(scale.campaign_start, scale.campaign_end, scale.minute_every, 1):
+            rng = self._rng(_STREAM_CHUNK, stream, i)
+            table = _Table(_Clock.of(epoch, origin), [sensor])
+            self._air_quality(table, rng)
+            self._weather(table, rng)
+            self._sensor(table, rng, stream)
+            day = date.fromordinal(date(1970, 1, 1).toordinal() + int(epoch[0]) // 86400)
+            yield day, _airup_frame(table, rng, scale.gps_fix_rate)
+
+    # ---------------------------------------------------------
+    #                        WRITING
+    # ---------------------------------------------------------
+    def write(
+        self,
+        base_path: Path,
+        dataset_ids: Optional[Iterable[DatasetId]] = None,
+        registry: Mapping[DatasetId, DatasetConfig] = DATASET_REGISTRY,
+        overwrite: bool = False,
+    ) -> Dict[DatasetId, Path]:
+        # writes the datasets to base_path / config.relative_path and returns those paths
+        # existing targets are only replaced with overwrite=True, so pointing base_path
+        # at the project root never silently clobbers the real campaign data
+        base_path = Path(base_path)
+        written = {}
+        for dataset_id in dataset_ids or self.dataset_ids():
+            target = base_path / registry[dataset_id].relative_path
+            if target.exists() and not overwrite:
+                raise FileExistsError(f"{target} exists, pass overwrite=True to replace it")
+
+            logger.info("Writing synthetic dataset '%s' to '%s'", dataset_id.value, target)
+            if dataset_id in AIRUP_SENSORS:
+                self._write_airup(target, AIRUP_SENSORS[dataset_id])
+            else:
+                _write_csv(target, self.chunks(dataset_id))
+            written[dataset_id] = target
+
+        # extra AirUp sensors have no DatasetId, they go next to sont_a
+        for sensor in self._scale.airup_sensors:
+            if sensor in AIRUP_SENSORS.values() or dataset_ids is not None:
+                continue
+            target = base_path / registry[DatasetId.AIRUP_SONT_A].relative_path.parent / f"sont_{sensor}"
+            if target.exists() and not overwrite:
+                raise FileExistsError(f"{target} exists, pass overwrite=True to replace it")
+            self._write_airup(target, sensor)
+
+        return written
+
+    def _write_airup(self, directory: Path, sensor: str) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        for stale in directory.glob(f"airup_sont_{sensor}_avg_every_minute_data.log.*"):
+            stale.unlink()
+        for day, df in self._airup_days(sensor):
+            path = directory / f"airup_sont_{sensor}_avg_every_minute_data.log.{day.isoformat()}"
+            df.write_csv(path, datetime_format=TIMESTAMP_FORMAT)
+
+
+def _inject(values: np.ndarray, rng: np.random.Generator, rate: float, flatline: int) -> Tuple[np.ndarray, np.ndarray]:
+    # spikes (x3..x8), flatlines (value held for `flatline` samples) and dropouts (NaN),
+    # each a third of rate; returns the new values and the mask of touched samples
+    if rate == 0.0:
+        return values, np.zeros(values.shape, dtype=bool)
+
+    draw = rng.random(values.shape)
+    spike = draw < rate / 3
+    dropout = (draw >= rate / 3) & (draw < 2 * rate / 3)
+    start = (draw >= 2 * rate / 3) & (draw < 2 * rate / 3 + rate / (3 * flatline))
+
+    # index of the latest flatline start at or before each sample, -1 if none
+    rows = np.arange(values.shape[0])[:, None]
+    held = np.maximum.accumulate(np.where(start, rows, -1), axis=0)
+    flat = (held >= 0) & (rows - held < flatline)
+
+    out = np.where(spike, values * rng.uniform(3.0, 8.0, values.shape), values)
+    out = np.where(flat, np.take_along_axis(out, np.maximum(held, 0), axis=0), out)
+    out = np.where(dropout, np.nan, out)
+    return out, spike | flat | dropout
+
+
+def _datetimes(epoch: np.ndarray) -> pl.Series:
+    # formatting happens in write_csv, strftime per chunk would dominate the run time
+    return pl.from_epoch(pl.Series(epoch), "s")
+
+
+def _long_frame(table: _Table, key: str, injected: Optional[np.ndarray]) -> pl.DataFrame:
+    # (T, S) arrays -> rows ordered by timestamp, then station
+    n_times, n_stations = table.clock.epoch.size, len(table.stations)
+    data = {
+        "timestamp": _datetimes(np.repeat(table.clock.epoch, n_stations)),
+        key: pl.Series(table.stations).gather(np.tile(np.arange(n_stations), n_times)),
+    }
+    for name, values in table.columns.items():
+        data[name] = pl.Series(name, values.ravel().round(3), nan_to_null=True)
+    if injected is not None:
+        data[ANOMALY_COLUMN] = injected.ravel()
+    return pl.DataFrame(data)
+
+
+def _airup_frame(table: _Table, rng: np.random.Generator, gps_fix_rate: float) -> pl.DataFrame:
+    # logger layout: processed values plus raw OPC/ADC channels and GPS fields
+    epoch = table.clock.epoch
+    n = epoch.size
+    c = {name: values[:, 0] for name, values in table.columns.items()}
+    fix = rng.random(n) < gps_fix_rate
+    lat, lon, alt = _HEILBRONN
+    stamp = epoch + rng.uniform(0.2, 0.4, n)
+
+    def jitter(center: float, sd: float) -> np.ndarray:
+        return (center + rng.normal(0.0, sd, n)).round(2)
+
+    pm = c["pm25"] * 0.85
+    bins = np.abs(pm[:, None] * np.geomspace(1.5, 0.001, 24) + rng.normal(0.0, 0.05, (n, 24))).round(2)
+    data: Dict[str, object] = {
+        "pm1": pm.round(2),
+        "pm25": c["pm25"].round(2),
+        "pm10": c["pm10"].round(2),
+        "opc_flow": jitter(5.0, 0.15),
+        "opc_humid": np.clip(c["humidity"] - 12.0, 0.0, 100.0).round(2),
+        "opc_temp": (c["temperature"] + 9.0).round(2),
+        **{f"RAW_OPC_Bin {i}": bins[:, i] for i in range(24)},
+        **{f"RAW_OPC_Bin{i} MToF": np.abs(jitter(6.0, 3.0)) for i in (1, 3, 5, 7)},
+        "RAW_OPC_Sampling Period": jitter(0.48, 0.01),
+        "RAW_OPC_SFR": jitter(5.0, 0.15),
+        "RAW_OPC_Temperature": (c["temperature"] + 9.0).round(2),
+        "RAW_OPC_Relative humidity": np.clip(c["humidity"] - 12.0, 0.0, 100.0).round(2),
+        "RAW_OPC_PM1": pm.round(2),
+        "RAW_OPC_PM2.5": c["pm25"].round(2),
+        "RAW_OPC_PM10": c["pm10"].round(2),
+        "RAW_OPC_Reject count Glitch": rng.poisson(2.0, n).astype(float),
+        "RAW_OPC_Reject count LongTOF": np.zeros(n),
+        "RAW_OPC_Reject count Ratio": rng.poisson(12.0, n).astype(float),
+        "RAW_OPC_Reject Count OutOfRange": rng.poisson(0.1, n).astype(float),
+        "RAW_OPC_Fan rev count": np.zeros(n),
+        "RAW_OPC_Laser status": jitter(615.0, 4.0),
+        "RAW_OPC_Checksum": rng.uniform(0.0, 65535.0, n).round(2),
+        "sht_humid": c["humidity"].round(2),
+        "sht_temp": c["temperature"].round(2),
+        # uncalibrated electrochemical cells, nulled by the AirUp preprocessor
+        "CO": jitter(-160.0, 60.0),
+        "NO": jitter(-15.0, 4.0),
+        "NO2": jitter(-5.0, 3.0),
+        "O3": jitter(-9.0, 3.0),
+        **{f"RAW_ADC_{gas}_{e}": jitter(base, 10.0) for gas, base in
+           (("CO", 370.0), ("NO", 295.0), ("NO2", 225.0), ("O3", 228.0)) for e in ("W", "A")},
+        "heater_temp": jitter(23.5 + 15.0 * float(c["temperature"].mean() < 5.0), 0.5),
+        "heater": np.zeros(n),
+        "heater_set": np.full(n, 22.3),
+        "lat": np.where(fix, lat, 0.0),
+        "lon": np.where(fix, lon, 0.0),
+        "alt": np.where(fix, alt, 0.0),
+        "rssi": np.where(fix, jitter(16.0, 3.0), 0.0),
+        "timestamp": stamp,
+        "timestamp_hr": _datetimes(epoch),
+        # epoch of the fix, "unknown" without one (read as null via null_values)
+        "timestamp_gps": pl.Series(np.floor(stamp)).cast(pl.String).zip_with(
+            pl.Series(fix), pl.Series(["unknown"] * n)
+        ),
+    }
+    # injected dropouts become empty fields
+    return pl.DataFrame(data).with_columns(pl.col(pl.Float64).fill_nan(None)).select(AIRUP_COLUMNS)
+
+
+def _write_csv(target: Path, chunks: Iterator[pl.DataFrame]) -> None:
+    # streamed chunk by chunk, write-then-rename so readers never see a partial file
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.tmp")
+    with tmp.open("wb") as handle:
+        for i, chunk in enumerate(chunks):
+            chunk.write_csv(handle, include_header=i == 0, datetime_format=TIMESTAMP_FORMAT)
+    tmp.replace(target)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic Heilbronn datasets below a base path")
+    parser.add_argument("--base-path", type=Path, required=True)
+    parser.add_argument("--stations", type=int, default=3)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2021, 1, 1))
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2024, 1, 1))
+    parser.add_argument("--every", default="1h")
+    parser.add_argument("--campaign-start", type=date.fromisoformat, default=date(2024, 11, 15))
+    parser.add_argument("--campaign-end", type=date.fromisoformat, default=date(2025, 2, 6))
+    parser.add_argument("--minute-every", default="1m")
+    parser.add_argument("--airup-sensors", default="a,c", help="comma separated sensor letters")
+    parser.add_argument("--anomaly-rate", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dataset", action="append", choices=[d.name for d in DatasetId], help="repeatable, default: all")
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+    scale = SyntheticScale(
+        stations=args.stations,
+        start=args.start,
+        end=args.end,
+        every=args.every,
+        campaign_start=args.campaign_start,
+        campaign_end=args.campaign_end,
+        minute_every=args.minute_every,
+        airup_sensors=tuple(s.strip() for s in args.airup_sensors.split(",") if s.strip()),
+        anomaly_rate=args.anomaly_rate,
+        seed=args.seed,
+    )
+    dataset_ids = [DatasetId[name] for name in args.dataset] if args.dataset else None
+    HeilbronnDataGenerator(scale).write(args.base_path, dataset_ids, overwrite=args.overwrite)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+import polars as pl
+import pytest
+from core.alignment.TimeAligner import TimeAligner
+
+
+def _minutes(*offsets_s):
+    start = datetime(2024, 11, 20, 8, 0)
+    return [start + timedelta(seconds=s) for s in offsets_s]
+
+
+@pytest.fixture
+def reference():
+    return pl.DataFrame({
+        "timestamp": _minutes(0, 60, 120, 180),
+        "PM10": [10.0, 11.0, 12.0, 13.0],
+        "NO2": [20.0, 21.0, 22.0, 23.0],
+    })
+
+
+def test_single_sensor_nearest_within_tolerance(reference):
+    sensor = pl.DataFrame({
+        "timestamp": _minutes(65, 5, 500),
+        "pm10": [1.1, 1.0, 9.9],
+    })
+    out = TimeAligner(tolerance="10s").align(sensor, reference, reference_columns=["PM10"])
+
+    assert out.columns == ["timestamp", "pm10", "timestamp_ref", "PM10_ref"]
+    # sorted by time, the 500s row has no reference within 10s
+    assert out["pm10"].to_list() == [1.0, 1.1, 9.9]
+    assert out["PM10_ref"].to_list() == [10.0, 11.0, None]
+    assert out["timestamp_ref"].to_list() == _minutes(0, 60) + [None]
+
+
+def test_backward_strategy_never_looks_ahead(reference):
+    sensor = pl.DataFrame({"timestamp": _minutes(55), "pm10": [1.0]})
+    out = TimeAligner(tolerance="1m", strategy="backward").align(sensor, reference)
+
+    assert out["PM10_ref"].to_list() == [10.0]
+    assert out["NO2_ref"].to_list() == [20.0]
+
+
+def test_several_sensors_in_one_pass(reference):
+    sensors = {
+        "sont_a": pl.DataFrame({"timestamp": _minutes(121, 1), "pm10": [3.0, 1.0]}),
+        "sont_c": pl.DataFrame({"timestamp": _minutes(59), "pm10": [2.0]}),
+    }
+    out = TimeAligner(tolerance="5s").align(sensors, reference, ["PM10"])
+
+    assert out["sensor"].to_list() == ["sont_a", "sont_a", "sont_c"]
+    assert out["pm10"].to_list() == [1.0, 3.0, 2.0]
+    assert out["PM10_ref"].to_list() == [10.0, 12.0, 11.0]
+
+
+def test_grid_resampling_averages_both_sides(reference):
+    sensor = pl.DataFrame({
+        "timestamp": _minutes(0, 30, 60, 90, 150),
+        "pm10": [1.0, 3.0, 5.0, 7.0, 9.0],
+    })
+    out = TimeAligner(grid="2m", tolerance=None).align(sensor, reference, ["PM10"])
+
+    assert out["timestamp"].to_list() == _minutes(0, 120)
+    assert out["pm10"].to_list() == [4.0, 9.0]
+    assert out["PM10_ref"].to_list() == [10.5, 12.5]
+
+
+def test_lazy_inputs_give_lazy_output_and_null_timestamps_are_dropped(reference):
+    sensor = pl.DataFrame({
+        "timestamp": [None, *_minutes(60)],
+        "pm10": [0.0, 1.0],
+    }, schema={"timestamp": pl.Datetime("ns"), "pm10": pl.Float64})
+    out = TimeAligner().align(sensor.lazy(), reference)
+
+    assert isinstance(out, pl.LazyFrame)
+    collected = out.collect()
+    assert collected["pm10"].to_list() == [1.0]
+    assert collected["PM10_ref"].to_list() == [11.0]
+
+
+def test_validation(reference):
+    with pytest.raises(ValueError):
+        TimeAligner(strategy="closest")
+    with pytest.raises(TypeError):
+        TimeAligner().align(pl.DataFrame({"timestamp": ["2024-11-20"], "pm10": [1.0]}), reference)
+    with pytest.raises(ValueError):
+        TimeAligner().align(pl.DataFrame({"timestamp": _minutes(0)}), reference, ["PM25"])
@@ -1,5 +1,8 @@
 import polars as pl
+import pytest
 from core.anomalies.AnomalyOrchestrator import AnomalyOrchestrator
+from core.anomalies.IsolationForestDetector import IsolationForestDetector
+from core.anomalies.ZScoreDetector import ZScoreDetector
 from core.interfaces.IAnomalyDetector import IAnomalyDetector
 
 class DummyDetector(IAnomalyDetector):
@@ -28,3 +31,67 @@ def test_run_detection_returns_df_with_flag():
     df = pl.DataFrame({"x":[1]})
     out = orch.run_detection(df, threshold=0.1)
     assert "is_anomaly" in out.columns
+
+
+def _two_sensor_frame():
+    # sensor a sits around 10, sensor b around 100; rows are interleaved
+    return pl.DataFrame({
+        "sensor_id": ["a", "b"] * 6,
+        "x": [10.0, 100.0, 11.0, 101.0, 9.0, 99.0, 10.5, 100.5, 9.5, 99.5, 10.0, 100.0],
+    })
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_partitioned_fit_uses_one_detector_per_key(n_jobs):
+    orch = AnomalyOrchestrator(ZScoreDetector(), partition_by="sensor_id", n_jobs=n_jobs)
+    orch.fit_on_reference(_two_sensor_frame(), ["x"])
+
+    detectors = orch.partition_detectors
+    assert set(detectors) == {("a",), ("b",)}
+    assert detectors[("a",)] is not detectors[("b",)]
+    assert orch.detector.fit_metadata == {}
+
+
+def test_partitioned_detection_routes_rows_and_keeps_order():
+    orch = AnomalyOrchestrator(ZScoreDetector(), partition_by="sensor_id")
+    orch.fit_on_reference(_two_sensor_frame(), ["x"])
+
+    # 100 is normal for b but anomalous for a, and the other way round
+    target = pl.DataFrame({"sensor_id": ["a", "b", "a", "b", "c"], "x": [100.0, 100.0, 10.0, 10.0, 5.0]})
+    out = orch.run_detection(target, threshold=3.0)
+
+    assert out["sensor_id"].to_list() == target["sensor_id"].to_list()
+    assert out["x"].to_list() == target["x"].to_list()
+    assert out["is_anomaly"].to_list() == [True, False, False, True, None]
+    assert out["anomaly_score"][4] is None
+
+
+def test_partitioned_detection_keeps_a_row_index_column_of_the_input():
+    orch = AnomalyOrchestrator(ZScoreDetector(), partition_by="sensor_id")
+    orch.fit_on_reference(_two_sensor_frame(), ["x"])
+
+    # an input column with the internal index name is neither overwritten nor dropped
+    target = pl.DataFrame({"sensor_id": ["b", "a", "b"], "x": [100.0, 10.0, 10.0], "__row_nr": ["r0", "r1", "r2"]})
+    out = orch.run_detection(target, threshold=3.0)
+
+    assert out["__row_nr"].to_list() == ["r0", "r1", "r2"]
+    assert out["sensor_id"].to_list() == ["b", "a", "b"]
+    assert "__row_nr_" not in out.columns
+
+
+def test_partitioned_detection_requires_fit():
+    orch = AnomalyOrchestrator(ZScoreDetector(), partition_by="sensor_id")
+    with pytest.raises(RuntimeError):
+        orch.run_detection(_two_sensor_frame(), threshold=3.0)
+
+
+def test_partitioned_fit_in_process_pool():
+    orch = AnomalyOrchestrator(
+        IsolationForestDetector(n_estimators=10), partition_by=["sensor_id"], n_jobs=2, executor="process"
+    )
+    orch.fit_on_reference(_two_sensor_frame(), ["x"])
+
+    out = orch.run_detection(_two_sensor_frame(), threshold=0.5)
+    assert out.height == 12
+    assert out["anomaly_score"].null_count() == 0
+    assert all(d.fit_metadata["n_samples"] == 6 for d in orch.partition_detectors.values())
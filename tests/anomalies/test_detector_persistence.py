@@ -0,0 +1,99 @@
+import pickle
+import polars as pl
+import pytest
+from core.anomalies.AnomalyOrchestrator import AnomalyOrchestrator
+from core.anomalies.DetectorRegistry import DetectorRegistry
+from core.anomalies.IsolationForestDetector import IsolationForestDetector
+from core.anomalies.OnlineZScoreDetector import OnlineZScoreDetector
+from core.anomalies.ZScoreDetector import ZScoreDetector
+
+
+@pytest.fixture
+def reference():
+    return pl.DataFrame({
+        "pm10": [10.0, 11.0, 12.0, 11.5, 10.5, 12.5, 11.0, 10.0],
+        "no2": [20, 22, 21, 23, 20, 22, 21, 24],
+    })
+
+
+@pytest.fixture
+def target():
+    return pl.DataFrame({"pm10": [11.0, 40.0, 10.5], "no2": [21, 60, 22]})
+
+
+@pytest.mark.parametrize("detector", [
+    ZScoreDetector(),
+    OnlineZScoreDetector(mode="ewm", alpha=0.3),
+    IsolationForestDetector(n_estimators=20),
+])
+def test_save_load_round_trip_scores_identically(tmp_path, reference, target, detector):
+    detector.fit(reference, ["pm10", "no2"])
+    path = tmp_path / "model.pkl"
+    detector.save(path)
+
+    loaded = type(detector).load(path)
+
+    assert loaded.score(target)["anomaly_score"].to_list() == detector.score(target)["anomaly_score"].to_list()
+    assert loaded.fit_metadata["n_samples"] == reference.height
+    assert loaded.fit_metadata["feature_schema"] == {"pm10": "Float64", "no2": "Int64"}
+
+
+def test_save_requires_fit(tmp_path):
+    with pytest.raises(RuntimeError):
+        ZScoreDetector().save(tmp_path / "model.pkl")
+
+
+def test_load_rejects_other_detector_class(tmp_path, reference):
+    detector = ZScoreDetector()
+    detector.fit(reference, ["pm10"])
+    detector.save(tmp_path / "model.pkl")
+
+    with pytest.raises(TypeError):
+        IsolationForestDetector.load(tmp_path / "model.pkl")
+
+
+def test_load_rejects_unknown_format_version(tmp_path, reference):
+    detector = ZScoreDetector()
+    detector.fit(reference, ["pm10"])
+    path = tmp_path / "model.pkl"
+    detector.save(path)
+
+    payload = pickle.loads(path.read_bytes())
+    payload["format_version"] = 999
+    path.write_bytes(pickle.dumps(payload))
+
+    with pytest.raises(ValueError, match="format version"):
+        ZScoreDetector.load(path)
+
+
+def test_registry_versions_and_latest(tmp_path, reference):
+    registry = DetectorRegistry(tmp_path / "models")
+    first = ZScoreDetector()
+    first.fit(reference, ["pm10"])
+    second = ZScoreDetector()
+    second.fit(reference, ["pm10", "no2"])
+
+    assert registry.register("sont_a", first) == 1
+    assert registry.register("sont_a", second) == 2
+
+    assert registry.versions("sont_a") == [1, 2]
+    assert registry.names() == ["sont_a"]
+    assert registry.load("sont_a").fit_metadata["feature_schema"].keys() == {"pm10", "no2"}
+    assert list(registry.load("sont_a", version=1).fit_metadata["feature_schema"]) == ["pm10"]
+
+    with pytest.raises(FileNotFoundError):
+        registry.load("sont_c")
+    with pytest.raises(ValueError):
+        registry.load("../escape")
+
+
+def test_orchestrator_detects_from_registry_without_fitting(tmp_path, reference, target):
+    registry = DetectorRegistry(tmp_path)
+    trainer = AnomalyOrchestrator(ZScoreDetector())
+    trainer.fit_on_reference(reference, ["pm10", "no2"])
+    trainer.save_to_registry(registry, "zscore")
+
+    worker = AnomalyOrchestrator.from_registry(registry, "zscore")
+    out = worker.run_detection(target, threshold=3.0)
+
+    assert out["is_anomaly"].to_list() == [False, True, False]
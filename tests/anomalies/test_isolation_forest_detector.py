@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import polars as pl
 from core.anomalies.IsolationForestDetector import IsolationForestDetector
 
@@ -32,3 +33,100 @@ def test_detect_adds_is_anomaly():
     det.fit(df, ["a"])
     out = det.detect(df, threshold=0.5)
     assert "is_anomaly" in out.columns
+
+def test_chunked_scoring_matches_single_pass():
+    rng = np.random.default_rng(0)
+    df = pl.DataFrame({"a": rng.normal(size=1_000), "b": rng.normal(size=1_000)})
+
+    single = IsolationForestDetector(n_estimators=20)
+    single.fit(df, ["a", "b"])
+    expected = single.score(df)["anomaly_score"]
+
+    for n_jobs in (1, 3):
+        chunked = IsolationForestDetector(n_estimators=20, chunk_size=128, n_jobs=n_jobs)
+        chunked.fit(df, ["a", "b"])
+        out = chunked.score(df.lazy())
+        assert out["anomaly_score"].equals(expected)
+        assert out["anomaly_score"].min() == 0.0 and out["anomaly_score"].max() == 1.0
+
+def test_lazy_input_is_scored_in_batches_without_collecting(monkeypatch):
+    rng = np.random.default_rng(0)
+    df = pl.DataFrame({"a": rng.normal(size=1_000), "b": rng.normal(size=1_000)})
+
+    for normalization in ("fit", "batch"):
+        det = IsolationForestDetector(n_estimators=20, chunk_size=300, normalization=normalization)
+        det.fit(df, ["a", "b"])
+        expected = det.score(df)
+
+        with monkeypatch.context() as m:
+            def collect(*args, **kwargs):
+                raise AssertionError("lazy input was collected as a whole")
+            m.setattr(pl.LazyFrame, "collect", collect)
+            out = det.score(df.lazy())
+            if normalization == "fit":
+                heights = [batch.height for batch in det.score_batches(df.lazy())]
+
+        assert out.equals(expected)
+    assert heights == [300, 300, 300, 100]
+
+def test_invalid_chunk_settings():
+    with pytest.raises(ValueError):
+        IsolationForestDetector(chunk_size=0)
+    with pytest.raises(ValueError):
+        IsolationForestDetector(n_jobs=0)
+
+def test_fit_normalization_is_independent_of_batch():
+    rng = np.random.default_rng(1)
+    train = pl.DataFrame({"a": rng.normal(size=500)})
+    target = pl.DataFrame({"a": [0.0, 0.5, 8.0]})
+
+    det = IsolationForestDetector(n_estimators=20)
+    det.fit(train, ["a"])
+
+    full = det.score(target)["anomaly_score"].to_list()
+    one_by_one = [det.score(target.slice(i, 1))["anomaly_score"][0] for i in range(target.height)]
+
+    assert full == one_by_one
+    assert all(0.0 <= v <= 1.0 for v in full)
+    assert full[2] == max(full)
+
+def test_batch_normalization_keeps_per_frame_min_max():
+    rng = np.random.default_rng(1)
+    train = pl.DataFrame({"a": rng.normal(size=500)})
+    target = pl.DataFrame({"a": [0.0, 0.5, 8.0]})
+
+    det = IsolationForestDetector(n_estimators=20, normalization="batch")
+    det.fit(train, ["a"])
+    scores = det.score(target)["anomaly_score"]
+
+    assert scores.min() == 0.0 and scores.max() == 1.0
+    assert det.score(target.slice(0, 1))["anomaly_score"].to_list() == [0.0]
+
+def test_unknown_normalization():
+    with pytest.raises(ValueError):
+        IsolationForestDetector(normalization="quantile")
+
+
+def test_null_features_raise_by_default():
+    det = IsolationForestDetector(n_estimators=10)
+    with pytest.raises(ValueError):
+        det.fit(pl.DataFrame({"x": [1.0, None, 3.0]}), ["x"])
+
+
+def test_dropped_rows_get_null_scores():
+    det = IsolationForestDetector(n_estimators=10, nulls="drop")
+    det.fit(pl.DataFrame({"x": [1.0, 2.0, None, 3.0, 2.5]}), ["x"])
+
+    out = det.score(pl.DataFrame({"x": [2.0, float("nan"), None, 2.5]}))
+    assert out["anomaly_score"].is_null().to_list() == [False, True, True, False]
+
+
+def test_spilled_fit_matches_in_memory_fit(tmp_path):
+    df = pl.DataFrame({"a": np.arange(50, dtype=float), "b": np.arange(50) % 7})
+    in_memory = IsolationForestDetector(n_estimators=10)
+    spilled = IsolationForestDetector(n_estimators=10, spill_dir=tmp_path)
+    in_memory.fit(df, ["a", "b"])
+    spilled.fit(df, ["a", "b"])
+
+    assert spilled.score(df)["anomaly_score"].to_list() == in_memory.score(df)["anomaly_score"].to_list()
+    assert list(tmp_path.iterdir()) == []
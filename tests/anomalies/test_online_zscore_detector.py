@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+import numpy as np
+import polars as pl
+import pytest
+from core.anomalies.OnlineZScoreDetector import OnlineZScoreDetector
+from core.anomalies.ZScoreDetector import ZScoreDetector
+
+
+def _minutes(values, start=datetime(2024, 11, 13)):
+    return pl.DataFrame({
+        "timestamp": [start + timedelta(minutes=i) for i in range(len(values))],
+        "a": values,
+    })
+
+
+def test_cumulative_updates_match_full_fit():
+    values = np.random.default_rng(0).normal(5.0, 2.0, size=1_000)
+    df = _minutes(values)
+
+    online = OnlineZScoreDetector()
+    online.fit(df.slice(0, 100), ["a"])
+    for offset in range(100, 1_000, 37):
+        online.update(df.slice(offset, 37))
+
+    full = ZScoreDetector()
+    full.fit(df, ["a"])
+
+    assert online._stats["a"] == pytest.approx(full._stats["a"], rel=1e-12)
+
+
+def test_ewm_matches_row_by_row_recursion():
+    values = [1.0, 2.0, 4.0, 3.0, 10.0, 2.5]
+    alpha = 0.3
+
+    online = OnlineZScoreDetector(mode="ewm", alpha=alpha)
+    online.fit(_minutes(values[:2]), ["a"])
+    online.update(_minutes(values[2:]))
+
+    mean, var = values[0], 0.0
+    for x in values[1:]:
+        d = x - mean
+        mean += alpha * d
+        var = (1 - alpha) * (var + alpha * d * d)
+
+    assert online._stats["a"] == pytest.approx((mean, var ** 0.5))
+
+
+def test_window_forgets_old_rows():
+    online = OnlineZScoreDetector(mode="window", window="1h")
+    online.fit(_minutes([100.0] * 60), ["a"])
+
+    # the next hour replaces the first one completely
+    online.update(_minutes([1.0, 2.0, 3.0] * 20, start=datetime(2024, 11, 13, 1)))
+
+    assert online._stats["a"][0] == pytest.approx(2.0)
+    assert online._buffer.height == 60
+
+
+def test_score_and_update_scores_against_previous_state():
+    online = OnlineZScoreDetector()
+    online.fit(_minutes([1.0, 2.0, 3.0, 2.0]), ["a"])
+    before = dict(online._stats)
+
+    out = online.score_and_update(_minutes([50.0]))
+
+    assert out["anomaly_score"][0] == pytest.approx(abs(50.0 - before["a"][0]) / before["a"][1])
+    assert online._stats["a"][0] > before["a"][0]
+
+
+def test_invalid_configurations():
+    with pytest.raises(ValueError):
+        OnlineZScoreDetector(mode="median")
+    with pytest.raises(ValueError):
+        OnlineZScoreDetector(mode="ewm")
+    with pytest.raises(ValueError):
+        OnlineZScoreDetector(mode="window", window="1 week")
+    with pytest.raises(RuntimeError):
+        OnlineZScoreDetector().update(_minutes([1.0]))
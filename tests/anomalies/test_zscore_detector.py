@@ -37,3 +37,19 @@ def test_detect_flags_anomalies():
     out = det.detect(df, threshold=2.0)
     assert "is_anomaly" in out.columns
     assert out["is_anomaly"][1] is True
+
+def test_score_without_z_columns_matches_default():
+    df = pl.DataFrame({"a": [1.0, 2.0, 3.0, 10.0], "b": [5, None, 7, 6]})
+
+    full = ZScoreDetector()
+    full.fit(df, ["a", "b"])
+    lean = ZScoreDetector(keep_z_columns=False)
+    lean.fit(df, ["a", "b"])
+
+    expected = full.score(df)
+    out = lean.score(df)
+
+    assert out.columns == ["a", "b", "anomaly_score"]
+    assert out["anomaly_score"].equals(expected["anomaly_score"])
+    # a missing feature is skipped, not propagated
+    assert out["anomaly_score"][1] == pytest.approx(abs(expected["z_a"][1]))
@@ -0,0 +1,93 @@
+import numpy as np
+import polars as pl
+import pytest
+from core.calibration.CalibrationEngine import CalibrationEngine, CalibrationSpec
+from core.calibration.LinearCalibrationModel import LinearCalibrationModel
+from core.calibration.RobustCalibrationModel import RobustCalibrationModel
+
+
+@pytest.fixture
+def pairs():
+    # reference = 2 * sensor - 0.5 * humidity + 3, plus a little noise
+    rng = np.random.default_rng(0)
+    n = 500
+    sensor = rng.uniform(5, 50, n)
+    humidity = rng.uniform(20, 90, n)
+    reference = 2.0 * sensor - 0.5 * humidity + 3.0 + rng.normal(0, 0.1, n)
+    return pl.DataFrame({"pm10": sensor, "humidity": humidity, "pm10_ref": reference})
+
+
+def test_linear_model_recovers_coefficients(pairs):
+    model = LinearCalibrationModel()
+    model.fit(pairs, "pm10_ref", ["pm10", "humidity"])
+
+    assert model.coefficients["pm10"] == pytest.approx(2.0, abs=0.01)
+    assert model.coefficients["humidity"] == pytest.approx(-0.5, abs=0.01)
+    assert model.intercept == pytest.approx(3.0, abs=0.1)
+
+
+def test_robust_model_ignores_spikes(pairs):
+    spiked = pairs.with_columns(
+        pl.when(pl.int_range(pl.len()) % 25 == 0).then(pl.col("pm10_ref") + 500).otherwise(pl.col("pm10_ref"))
+    )
+    linear = LinearCalibrationModel()
+    robust = RobustCalibrationModel()
+    linear.fit(spiked, "pm10_ref", ["pm10", "humidity"])
+    robust.fit(spiked, "pm10_ref", ["pm10", "humidity"])
+
+    assert robust.intercept == pytest.approx(3.0, abs=0.5)
+    assert abs(linear.intercept - 3.0) > 5
+
+
+def test_engine_fits_per_pollutant_and_applies_lazily(pairs):
+    pairs = pairs.with_columns(no2=pl.col("pm10") * 0.5, no2_ref=pl.col("pm10") + 1.0)
+    engine = CalibrationEngine([
+        CalibrationSpec("pm10", "pm10_ref", covariates=("humidity",)),
+        CalibrationSpec("no2", "no2_ref", model="robust", output_column="no2_cal"),
+    ])
+    engine.fit(pairs)
+
+    history = pl.DataFrame({"pm10": [10.0, None], "humidity": [50.0, 50.0], "no2": [4.0, 6.0]})
+    out = engine.apply(history.lazy()).collect()
+
+    assert out["pm10_calibrated"][0] == pytest.approx(2.0 * 10 - 0.5 * 50 + 3.0, abs=0.1)
+    assert out["pm10_calibrated"][1] is None
+    assert out["no2_cal"].to_list() == pytest.approx([9.0, 13.0], abs=1e-6)
+    assert engine.fit_metadata["pm10_calibrated"]["r2"] > 0.99
+    assert engine.fit_metadata["no2_cal"]["n_samples"] == pairs.height
+
+
+def test_gbm_model_runs_through_map_batches(pairs):
+    engine = CalibrationEngine([
+        CalibrationSpec("pm10", "pm10_ref", covariates=("humidity",), model="gbm", model_params={"max_iter": 50}),
+    ])
+    engine.fit(pairs)
+
+    out = engine.apply(pairs.drop("pm10_ref").with_columns(pl.lit(None, dtype=pl.Float64).alias("humidity")))
+    assert out["pm10_calibrated"].null_count() == pairs.height
+
+    out = engine.apply(pairs)
+    assert engine.fit_metadata["pm10_calibrated"]["r2"] > 0.9
+    assert out["pm10_calibrated"].null_count() == 0
+
+
+def test_save_load_round_trip(tmp_path, pairs):
+    engine = CalibrationEngine([CalibrationSpec("pm10", "pm10_ref", covariates=("humidity",))])
+    engine.fit(pairs)
+    engine.save(tmp_path / "calibration.pkl")
+
+    loaded = CalibrationEngine.load(tmp_path / "calibration.pkl")
+    assert loaded.apply(pairs).equals(engine.apply(pairs))
+
+
+def test_engine_validation(pairs):
+    with pytest.raises(ValueError):
+        CalibrationEngine([CalibrationSpec("pm10", "pm10_ref", model="svm")])
+    with pytest.raises(ValueError):
+        CalibrationEngine([CalibrationSpec("pm10", "a"), CalibrationSpec("pm10", "b")])
+
+    engine = CalibrationEngine([CalibrationSpec("pm10", "missing_ref")])
+    with pytest.raises(RuntimeError):
+        engine.apply(pairs)
+    with pytest.raises(ValueError):
+        engine.fit(pairs)
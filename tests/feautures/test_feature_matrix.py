@@ -0,0 +1,64 @@
+import numpy as np
+import polars as pl
+import pytest
+from core.features.FeatureMatrix import FeatureMatrix
+
+
+def _frame():
+    return pl.DataFrame({
+        "pm10": [1.0, None, 3.0, float("nan")],
+        "no2": [10, 20, 30, 40],
+    })
+
+
+def test_single_float64_column_is_zero_copy():
+    df = pl.DataFrame({"x": [1.0, 2.0, 3.0]})
+    matrix = FeatureMatrix.from_frame(df, ["x"])
+
+    assert matrix.values.shape == (3, 1)
+    assert np.shares_memory(matrix.values, df["x"].to_numpy())
+
+
+def test_mixed_columns_are_cast_into_requested_dtype():
+    df = pl.DataFrame({"a": [1, 2], "b": [0.5, 1.5]}, schema={"a": pl.Int32, "b": pl.Float64})
+    matrix = FeatureMatrix.from_frame(df, ["b", "a"], dtype=np.float32)
+
+    assert matrix.values.dtype == np.float32
+    assert matrix.values.tolist() == [[0.5, 1.0], [1.5, 2.0]]
+    assert matrix.columns == ("b", "a")
+    assert matrix.row_mask is None
+
+
+def test_nulls_raise_by_default():
+    with pytest.raises(ValueError, match="pm10"):
+        FeatureMatrix.from_frame(_frame(), ["pm10", "no2"])
+
+
+def test_nulls_drop_reports_kept_rows():
+    matrix = FeatureMatrix.from_frame(_frame(), ["pm10", "no2"], nulls="drop")
+
+    assert matrix.row_mask.tolist() == [True, False, True, False]
+    assert matrix.values.tolist() == [[1.0, 10.0], [3.0, 30.0]]
+
+
+def test_nulls_fill():
+    matrix = FeatureMatrix.from_frame(_frame(), ["pm10"], nulls="fill", fill_value=-1.0)
+
+    assert matrix.values[:, 0].tolist() == [1.0, -1.0, 3.0, -1.0]
+
+
+def test_spill_to_memory_mapped_npy(tmp_path):
+    path = tmp_path / "features.npy"
+    df = pl.DataFrame({"a": [1.0, 2.0, 3.0], "b": [4, 5, 6]})
+    matrix = FeatureMatrix.from_frame(df, ["a", "b"], spill_path=path)
+
+    assert isinstance(matrix.values, np.memmap)
+    assert np.load(path).tolist() == [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+
+
+def test_rejects_non_numeric_and_unknown_policy():
+    df = pl.DataFrame({"s": ["a"], "x": [1.0]})
+    with pytest.raises(TypeError):
+        FeatureMatrix.from_frame(df, ["s"])
+    with pytest.raises(ValueError):
+        FeatureMatrix.from_frame(df, ["x"], nulls="ignore")
@@ -0,0 +1,89 @@
+from datetime import datetime
+import polars as pl
+import pytest
+from core.features.FeaturePlan import Diff, FeaturePlan, Lag, Rolling, TimeParts
+from core.features.RollingFeatureEngineer import RollingFeatureEngineer
+from core.features.TimeFeatureEngineer import TimeFeatureEngineer
+
+
+def _frame():
+    return pl.DataFrame({
+        "timestamp": [
+            "2023-01-01 00:00:00",
+            "2023-01-01 00:00:00",
+            "2023-01-01 01:00:00",
+            "2023-01-01 01:00:00",
+            "2023-01-01 02:00:00",
+        ],
+        "station_id": ["A", "B", "A", "B", "A"],
+        "value": [1.0, 10.0, 3.0, 30.0, 6.0],
+    })
+
+
+def test_plan_matches_engineers_run_back_to_back():
+    df = _frame()
+
+    chained = RollingFeatureEngineer().add_rolling_features(
+        TimeFeatureEngineer().add_time_features(df), ["value"], ["2h"]
+    )
+    planned = FeaturePlan([TimeParts(), Rolling(["value"], ["2h"])]).apply(df)
+
+    assert planned.equals(chained)
+    assert planned.schema["timestamp"] == pl.Datetime
+
+
+def test_lags_and_diffs_per_group():
+    plan = FeaturePlan(
+        [Lag(["value"], periods=[1]), Diff(["value"]), TimeParts(parts=["hour"])],
+        group_by="station_id",
+    )
+    out = plan.apply(_frame())
+
+    assert out["value_lag_1"].to_list() == [None, None, 1.0, 10.0, 3.0]
+    assert out["value_diff_1"].to_list() == [None, None, 2.0, 20.0, 3.0]
+    assert out["hour"].to_list() == [0, 0, 1, 1, 2]
+
+
+def test_order_dependent_plan_rejects_unsorted_frames():
+    df = _frame().reverse()
+
+    with pytest.raises(ValueError):
+        FeaturePlan([Lag(["value"])]).apply(df)
+
+    # rolling windows do not depend on row order
+    out = FeaturePlan([Rolling(["value"], ["1h"], stats=["mean"])]).apply(df)
+    assert "value_roll_mean_1h" in out.columns
+
+
+def test_datetime_timestamp_is_not_reparsed_and_lazy_input():
+    df = pl.DataFrame({
+        "timestamp": [datetime(2023, 7, 10, 15), datetime(2023, 7, 15, 9)],
+        "value": [1.0, 2.0],
+    })
+    plan = FeaturePlan([TimeParts(parts=["day_of_week", "is_weekend", "season"])])
+
+    out = plan.apply(df.lazy()).collect()
+
+    assert out["timestamp"].to_list() == df["timestamp"].to_list()
+    assert out["day_of_week"].to_list() == [0, 5]
+    assert out["is_weekend"].to_list() == [False, True]
+    assert out["season"].to_list() == [2, 2]
+
+
+def test_engineer_keeps_format_and_parses_rows_outside_the_sample():
+    engineer = TimeFeatureEngineer()
+    # the detection sample only sees the first format
+    df = pl.DataFrame({"timestamp": ["2023-01-01 00:00:00"] * 1_000 + ["2023-01-01 05:00:00.250"]})
+
+    out = engineer.add_time_features(df)
+
+    assert out["timestamp"].null_count() == 0
+    assert out["hour"][-1] == 5
+    assert engineer._timestamp_formats == {"timestamp": "%Y-%m-%d %H:%M:%S"}
+
+
+def test_unknown_specs_are_rejected():
+    with pytest.raises(ValueError):
+        FeaturePlan([TimeParts(parts=["minute_of_moon"])])
+    with pytest.raises(ValueError):
+        FeaturePlan([Rolling(["value"], ["1h"], stats=["median"])])
@@ -1,3 +1,5 @@
+from datetime import datetime
+import pytest
 import polars as pl
 from core.features.RollingFeatureEngineer import RollingFeatureEngineer
 
@@ -61,3 +63,49 @@ def test_multiple_feature_columns():
     assert "b_roll_mean_1h" in out.columns
     assert "a_roll_std_1h" in out.columns
     assert "b_roll_std_1h" in out.columns
+
+
+def test_rolling_std_and_unsorted_input():
+    df = pl.DataFrame({
+        "timestamp": [
+            datetime(2023, 1, 1, 2),
+            datetime(2023, 1, 1, 0),
+            datetime(2023, 1, 1, 1),
+        ],
+        "value": [30.0, 10.0, 20.0],
+    })
+
+    out = RollingFeatureEngineer().add_rolling_features(df, ["value"], ["2h"])
+
+    # rows keep their order, each window is (t - 2h, t]
+    assert out["value_roll_mean_2h"].to_list() == [25.0, 10.0, 15.0]
+    assert out["value_roll_std_2h"].round(3).to_list() == [7.071, None, 7.071]
+
+
+def test_rolling_group_by_station():
+    df = pl.DataFrame({
+        "timestamp": ["2023-01-01 00:00:00", "2023-01-01 00:00:00", "2023-01-01 01:00:00", "2023-01-01 01:00:00"],
+        "station_id": ["A", "B", "A", "B"],
+        "value": [1.0, 100.0, 3.0, 300.0],
+    })
+
+    out = RollingFeatureEngineer().add_rolling_features(
+        df, ["value"], ["2h"], group_by="station_id"
+    )
+
+    assert out["value_roll_mean_2h"].to_list() == [1.0, 100.0, 2.0, 200.0]
+
+
+def test_rolling_on_lazy_frame_and_non_numeric_rejected():
+    df = pl.DataFrame({
+        "timestamp": ["2023-01-01 00:00:00", "2023-01-01 01:00:00"],
+        "value": [1.0, 3.0],
+        "label": ["x", "y"],
+    })
+    fe = RollingFeatureEngineer()
+
+    lazy = fe.add_rolling_features(df.lazy(), ["value"], ["1d"])
+    assert lazy.collect()["value_roll_mean_1d"].to_list() == [1.0, 2.0]
+
+    with pytest.raises(TypeError):
+        fe.add_rolling_features(df, ["label"], ["1h"])
@@ -1,7 +1,9 @@
 import polars as pl
+import pytest
 from pathlib import Path
 from core.loaders.airup_dataset_loader import AirUpDatasetLoader
 from core.loaders.dataset_ids import DatasetId
+from core.preprocessing.airup_sensor_preprocessor import AirUpSensorPreprocessor
 
 
 def test_airup_loader_loads_and_concatenates_multiple_files(tmp_path: Path, patched_registry):
@@ -36,3 +38,62 @@ def test_airup_loader_loads_and_concatenates_multiple_files(tmp_path: Path, patc
     assert set(df.columns) >= {"pm1", "pm25", "pm10", "humidity", "temperature", "timestamp_hr"}
     assert df["pm1"].to_list() == [1.0, 1.1]
     assert df["humidity"].to_list() == [40, 41]
+
+
+def test_airup_loader_applies_column_projection(tmp_path: Path, patched_registry):
+    data_dir = tmp_path / "sont_a"
+    data_dir.mkdir()
+
+    header = "pm1,pm25,pm10,sht_humid,sht_temp,CO,NO,NO2,O3,RAW_OPC_Bin 0,timestamp_hr\n"
+    row = "1.0,2.0,3.0,40,20,1,2,3,4,0.7,2024-11-13 08:00:00\n"
+    (data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13").write_text(header + row)
+
+    patched_registry[DatasetId.AIRUP_SONT_A] = patched_registry[DatasetId.AIRUP_SONT_A].__class__(
+        dataset_id=DatasetId.AIRUP_SONT_A,
+        relative_path=data_dir.relative_to(tmp_path),
+        parse_dates=[],
+        rename_columns={"sht_humid": "humidity", "sht_temp": "temperature"},
+        required_columns=["timestamp_hr", "pm1", "humidity"],
+        dtypes=None,
+    )
+
+    keep = AirUpSensorPreprocessor().input_columns()
+    loader = AirUpDatasetLoader(tmp_path, registry=patched_registry, columns=keep)
+
+    df = loader.load_dataset(DatasetId.AIRUP_SONT_A)
+    assert "RAW_OPC_Bin 0" not in df.columns
+    assert "humidity" in df.columns
+
+    # explicit projection per call overrides the constructor projection
+    narrow = loader.load_dataset(DatasetId.AIRUP_SONT_A, columns=["pm1", "sht_humid", "timestamp_hr"])
+    assert narrow.columns == ["pm1", "humidity", "timestamp_hr"]
+
+    # projecting away a required column is reported as missing
+    with pytest.raises(ValueError):
+        loader.load_dataset(DatasetId.AIRUP_SONT_A, columns=["pm1"])
+
+
+def test_airup_scan_dataset_is_lazy_and_matches_load(tmp_path: Path, patched_registry):
+    data_dir = tmp_path / "sont_a"
+    data_dir.mkdir()
+
+    header = "pm1,sht_humid,sht_temp,timestamp_hr\n"
+    (data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13").write_text(
+        header + "1.0,40,20,2024-11-13 08:00:00\n"
+    )
+
+    patched_registry[DatasetId.AIRUP_SONT_A] = patched_registry[DatasetId.AIRUP_SONT_A].__class__(
+        dataset_id=DatasetId.AIRUP_SONT_A,
+        relative_path=data_dir.relative_to(tmp_path),
+        parse_dates=[],
+        rename_columns={"sht_humid": "humidity", "sht_temp": "temperature"},
+        required_columns=["timestamp_hr", "pm1", "humidity"],
+        dtypes={"humidity": pl.Float64},
+    )
+
+    loader = AirUpDatasetLoader(tmp_path, registry=patched_registry)
+    lf = loader.scan_dataset(DatasetId.AIRUP_SONT_A)
+
+    assert isinstance(lf, pl.LazyFrame)
+    assert lf.collect_schema()["humidity"] == pl.Float64
+    assert lf.collect().equals(loader.load_dataset(DatasetId.AIRUP_SONT_A))
@@ -0,0 +1,154 @@
+import polars as pl
+import pytest
+from pathlib import Path
+from core.loaders.airup_dataset_loader import AirUpDatasetLoader
+from core.loaders.airup_incremental_loader import IncrementalAirUpDatasetLoader
+from core.loaders.dataset_ids import DatasetId
+
+HEADER = "pm1,pm25,pm10,sht_humid,sht_temp,CO,NO,NO2,O3,timestamp_hr\n"
+
+
+def _row(pm1: float, ts: str) -> str:
+    return f"{pm1},2.0,3.0,40,20,1,2,3,4,{ts}\n"
+
+
+@pytest.fixture
+def airup_setup(tmp_path: Path, patched_registry):
+    data_dir = tmp_path / "sont_a"
+    data_dir.mkdir()
+
+    patched_registry[DatasetId.AIRUP_SONT_A] = patched_registry[DatasetId.AIRUP_SONT_A].__class__(
+        dataset_id=DatasetId.AIRUP_SONT_A,
+        relative_path=data_dir.relative_to(tmp_path),
+        parse_dates=[],
+        rename_columns={"sht_humid": "humidity", "sht_temp": "temperature"},
+        required_columns=["timestamp_hr", "pm1", "humidity", "temperature"],
+        dtypes=None,
+    )
+
+    loader = IncrementalAirUpDatasetLoader(
+        tmp_path,
+        store_path=tmp_path / "store",
+        registry=patched_registry,
+    )
+    return data_dir, loader, patched_registry
+
+
+def test_ingest_reads_only_appended_lines(airup_setup):
+    data_dir, loader, _ = airup_setup
+    day1 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13"
+
+    # last line is still being written
+    day1.write_text(HEADER + _row(1.0, "2024-11-13 08:00:00") + "1.1,2.0,3")
+
+    delta = loader.ingest(DatasetId.AIRUP_SONT_A)
+    assert delta["pm1"].to_list() == [1.0]
+    assert "humidity" in delta.columns
+
+    # the partial line is completed and another line appended
+    day1.write_text(
+        HEADER
+        + _row(1.0, "2024-11-13 08:00:00")
+        + _row(1.1, "2024-11-13 08:01:00")
+        + _row(1.2, "2024-11-13 08:02:00")
+    )
+    delta = loader.ingest(DatasetId.AIRUP_SONT_A)
+    assert delta["pm1"].to_list() == [1.1, 1.2]
+
+    # a new day file is picked up, unchanged files are skipped
+    day2 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-14"
+    day2.write_text(HEADER + _row(2.0, "2024-11-14 00:00:00"))
+    delta = loader.ingest(DatasetId.AIRUP_SONT_A)
+    assert delta["pm1"].to_list() == [2.0]
+
+    # nothing new
+    assert loader.ingest(DatasetId.AIRUP_SONT_A).height == 0
+
+
+def test_load_dataset_matches_full_loader(airup_setup, tmp_path: Path):
+    data_dir, loader, registry = airup_setup
+    day1 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13"
+    day1.write_text(HEADER + _row(1.0, "2024-11-13 08:00:00"))
+    loader.ingest(DatasetId.AIRUP_SONT_A)
+
+    with day1.open("a") as handle:
+        handle.write(_row(1.1, "2024-11-13 08:01:00"))
+
+    incremental = loader.load_dataset(DatasetId.AIRUP_SONT_A)
+    full = AirUpDatasetLoader(tmp_path, registry=registry).load_dataset(DatasetId.AIRUP_SONT_A)
+
+    assert incremental.equals(full)
+
+    # state survives a new loader instance
+    fresh = IncrementalAirUpDatasetLoader(tmp_path, store_path=tmp_path / "store", registry=registry)
+    assert fresh.ingest(DatasetId.AIRUP_SONT_A).height == 0
+    assert fresh.load_dataset(DatasetId.AIRUP_SONT_A).height == 2
+
+
+def test_truncated_file_requires_reset(airup_setup):
+    data_dir, loader, _ = airup_setup
+    day1 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13"
+    day1.write_text(HEADER + _row(1.0, "2024-11-13 08:00:00") + _row(1.1, "2024-11-13 08:01:00"))
+    loader.ingest(DatasetId.AIRUP_SONT_A)
+
+    day1.write_text(HEADER)
+    with pytest.raises(RuntimeError):
+        loader.ingest(DatasetId.AIRUP_SONT_A)
+
+    loader.reset(DatasetId.AIRUP_SONT_A)
+    day1.write_text(HEADER + _row(3.0, "2024-11-13 09:00:00"))
+    assert loader.load_dataset(DatasetId.AIRUP_SONT_A)["pm1"].to_list() == [3.0]
+
+
+def test_store_schema_does_not_depend_on_ingest_split(airup_setup, tmp_path: Path):
+    data_dir, loader, registry = airup_setup
+    registry[DatasetId.AIRUP_SONT_A] = registry[DatasetId.AIRUP_SONT_A].__class__(
+        dataset_id=DatasetId.AIRUP_SONT_A,
+        relative_path=data_dir.relative_to(tmp_path),
+        parse_dates=[],
+        rename_columns={"sht_humid": "humidity", "sht_temp": "temperature"},
+        required_columns=["pm1", "humidity", "temperature"],
+        dtypes=None,
+        null_values=["unknown"],
+    )
+    day1 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13"
+
+    # first delta has no gps fix, timestamp_gps is all null
+    day1.write_text("pm1,timestamp_gps,sht_humid,sht_temp\n1,unknown,40,20\n")
+    loader.ingest(DatasetId.AIRUP_SONT_A)
+
+    with day1.open("a") as handle:
+        handle.write("1.5,1731484800,40.5,20\n")
+
+    incremental = loader.load_dataset(DatasetId.AIRUP_SONT_A)
+    full = AirUpDatasetLoader(tmp_path, registry=registry).load_dataset(DatasetId.AIRUP_SONT_A)
+
+    assert incremental.schema["timestamp_gps"] == pl.Int64
+    assert incremental.equals(full)
+
+
+def test_rewritten_file_requires_reset(airup_setup):
+    data_dir, loader, _ = airup_setup
+    day1 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13"
+    day1.write_text(HEADER + _row(1.0, "2024-11-13 08:00:00"))
+    loader.ingest(DatasetId.AIRUP_SONT_A)
+
+    # same header, different rows, larger size
+    day1.write_text(HEADER + _row(7.0, "2024-11-13 10:00:00") + _row(7.1, "2024-11-13 10:01:00"))
+    with pytest.raises(RuntimeError):
+        loader.ingest(DatasetId.AIRUP_SONT_A)
+
+
+def test_projection_is_applied_to_deltas(airup_setup, tmp_path: Path):
+    data_dir, _, registry = airup_setup
+    loader = IncrementalAirUpDatasetLoader(
+        tmp_path,
+        store_path=tmp_path / "projected",
+        registry=registry,
+        columns=["pm1", "sht_humid", "sht_temp", "timestamp_hr"],
+    )
+    day1 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13"
+    day1.write_text(HEADER + _row(1.0, "2024-11-13 08:00:00"))
+
+    delta = loader.ingest(DatasetId.AIRUP_SONT_A)
+    assert delta.columns == ["pm1", "humidity", "temperature", "timestamp_hr"]
@@ -0,0 +1,145 @@
+import os
+import polars as pl
+from pathlib import Path
+from core.loaders.airup_dataset_loader import AirUpDatasetLoader
+from core.loaders.csv_dataset_loader import CsvDatasetLoader
+from core.loaders.dataset_cache import DatasetCache, config_key, fingerprint_file
+from core.loaders.dataset_ids import DatasetId
+
+HEADER = "pm1,pm25,pm10,sht_humid,sht_temp,CO,NO,NO2,O3,timestamp_hr\n"
+
+
+def _airup_registry(patched_registry, data_dir: Path, tmp_path: Path):
+    patched_registry[DatasetId.AIRUP_SONT_A] = patched_registry[DatasetId.AIRUP_SONT_A].__class__(
+        dataset_id=DatasetId.AIRUP_SONT_A,
+        relative_path=data_dir.relative_to(tmp_path),
+        parse_dates=[],
+        rename_columns={"sht_humid": "humidity", "sht_temp": "temperature"},
+        required_columns=["timestamp_hr", "pm1", "humidity", "temperature"],
+        dtypes=None,
+    )
+    return patched_registry
+
+
+def test_fingerprint_changes_with_content(tmp_path: Path):
+    f = tmp_path / "a.csv"
+    f.write_text("x\n1\n")
+    before = fingerprint_file(f, hash_contents=True)
+    f.write_text("x\n2\n")
+    assert fingerprint_file(f, hash_contents=True) != before
+
+
+def test_config_key_depends_on_variant(patched_registry):
+    config = patched_registry[DatasetId.AIRUP_SONT_A]
+    assert config_key(config) == config_key(config)
+    assert config_key(config) != config_key(config, ["pm1"])
+
+
+def test_airup_cache_invalidates_per_file(tmp_path: Path, patched_registry):
+    data_dir = tmp_path / "sont_a"
+    data_dir.mkdir()
+    day1 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13"
+    day1.write_text(HEADER + "1.0,2.0,3.0,40,20,1,2,3,4,2024-11-13 08:00:00\n")
+
+    registry = _airup_registry(patched_registry, data_dir, tmp_path)
+    cache = DatasetCache(tmp_path / "cache")
+    loader = AirUpDatasetLoader(tmp_path, registry=registry, cache=cache)
+
+    first = loader.load_dataset(DatasetId.AIRUP_SONT_A)
+    entries = list((tmp_path / "cache").rglob("*.arrow"))
+    assert len(entries) == 1
+    day1_entry = entries[0]
+    day1_mtime = day1_entry.stat().st_mtime_ns
+
+    # cache hit returns the same frame
+    assert loader.load_dataset(DatasetId.AIRUP_SONT_A).equals(first)
+
+    # appending a new daily file only parses that file
+    day2 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-14"
+    day2.write_text(HEADER + "1.1,2.1,3.1,41,21,1,2,3,4,2024-11-14 08:00:00\n")
+
+    df = loader.load_dataset(DatasetId.AIRUP_SONT_A)
+    assert df["pm1"].to_list() == [1.0, 1.1]
+    assert len(list((tmp_path / "cache").rglob("*.arrow"))) == 2
+    assert day1_entry.stat().st_mtime_ns == day1_mtime
+
+    # rewriting a file replaces only its own entry
+    day2.write_text(HEADER + "9.9,2.1,3.1,41,21,1,2,3,4,2024-11-14 08:00:00\n")
+    os.utime(day2, ns=(day2.stat().st_atime_ns, day2.stat().st_mtime_ns + 1_000_000_000))
+
+    df = loader.load_dataset(DatasetId.AIRUP_SONT_A)
+    assert df["pm1"].to_list() == [1.0, 9.9]
+    assert len(list((tmp_path / "cache").rglob("*.arrow"))) == 2
+
+
+def test_csv_loader_with_cache_matches_uncached(tmp_path: Path, patched_registry):
+    test_file = tmp_path / "file.csv"
+    test_file.write_text(
+        "timestamp,station_id,value\n"
+        "2020-01-01 00:00:00,1,10\n"
+        "2020-01-01 01:00:00,1,12\n"
+    )
+
+    patched_registry[DatasetId.AIR_QUALITY_RAW] = patched_registry[DatasetId.AIR_QUALITY_RAW].__class__(
+        dataset_id=DatasetId.AIR_QUALITY_RAW,
+        relative_path=test_file.relative_to(tmp_path),
+        parse_dates=["timestamp"],
+        rename_columns={"timestamp": "timestamp", "station_id": "station_id"},
+        required_columns=["timestamp", "station_id"],
+        dtypes=None,
+    )
+
+    cache = DatasetCache(tmp_path / "cache")
+    cached_loader = CsvDatasetLoader(tmp_path, registry=patched_registry, cache=cache)
+    plain_loader = CsvDatasetLoader(tmp_path, registry=patched_registry)
+
+    expected = plain_loader.load_dataset(DatasetId.AIR_QUALITY_RAW)
+    assert cached_loader.load_dataset(DatasetId.AIR_QUALITY_RAW).equals(expected)
+    assert cached_loader.load_dataset(DatasetId.AIR_QUALITY_RAW).equals(expected)
+    assert expected["timestamp"].dtype == pl.Datetime
+
+    cache.clear(DatasetId.AIR_QUALITY_RAW)
+    assert not list((tmp_path / "cache").rglob("*.arrow"))
+
+
+def test_warm_cache_does_not_scan_raw_files(tmp_path: Path, patched_registry, monkeypatch):
+    data_dir = tmp_path / "sont_a"
+    data_dir.mkdir()
+    (data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13").write_text(
+        HEADER + "1.0,2.0,3.0,40,20,1,2,3,4,2024-11-13 08:00:00\n"
+    )
+
+    registry = _airup_registry(patched_registry, data_dir, tmp_path)
+    loader = AirUpDatasetLoader(
+        tmp_path,
+        registry=registry,
+        columns=["pm1", "sht_humid", "sht_temp", "timestamp_hr"],
+        cache=DatasetCache(tmp_path / "cache"),
+    )
+    expected = loader.load_dataset(DatasetId.AIRUP_SONT_A)
+
+    def fail_scan(*args, **kwargs):
+        raise AssertionError("raw csv scanned on a warm cache")
+
+    monkeypatch.setattr(pl, "scan_csv", fail_scan)
+    assert loader.load_dataset(DatasetId.AIRUP_SONT_A).equals(expected)
+
+
+def test_entries_of_deleted_files_are_pruned(tmp_path: Path, patched_registry):
+    data_dir = tmp_path / "sont_a"
+    data_dir.mkdir()
+    day1 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13"
+    day2 = data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-14"
+    day1.write_text(HEADER + "1.0,2.0,3.0,40,20,1,2,3,4,2024-11-13 08:00:00\n")
+    day2.write_text(HEADER + "1.1,2.1,3.1,41,21,1,2,3,4,2024-11-14 08:00:00\n")
+
+    registry = _airup_registry(patched_registry, data_dir, tmp_path)
+    loader = AirUpDatasetLoader(tmp_path, registry=registry, cache=DatasetCache(tmp_path / "cache"))
+    loader.load_dataset(DatasetId.AIRUP_SONT_A)
+    assert len(list((tmp_path / "cache").rglob("*.arrow"))) == 2
+
+    day1.unlink()
+    assert loader.load_dataset(DatasetId.AIRUP_SONT_A)["pm1"].to_list() == [1.1]
+
+    entries = list((tmp_path / "cache").rglob("*.arrow"))
+    assert [e.name.startswith(day2.name) for e in entries] == [True]
@@ -0,0 +1,101 @@
+import threading
+import time
+import polars as pl
+import pytest
+from pathlib import Path
+
+from core.interfaces.IDataLoader import IDataLoader
+from core.loaders.csv_dataset_loader import CsvDatasetLoader
+from core.loaders.loader_orchestrator import LoaderOrchestrator
+from core.loaders.dataset_ids import DatasetId
+
+
+class SlowLoader(IDataLoader):
+    # sleeps to make overlap observable, fails for configured ids
+    def __init__(self, delay: float, failing=()):
+        self._delay = delay
+        self._failing = set(failing)
+        self.threads = set()
+
+    def load_dataset(self, dataset_id):
+        self.threads.add(threading.get_ident())
+        time.sleep(self._delay)
+        if dataset_id in self._failing:
+            raise FileNotFoundError(dataset_id.value)
+        return pl.DataFrame({"id": [dataset_id.value]})
+
+
+IDS = [DatasetId.LUBW_MINUTE, DatasetId.AIRUP_SONT_A, DatasetId.AIRUP_SONT_C]
+
+
+def test_load_all_concurrent_keeps_input_order():
+    loader = SlowLoader(delay=0.2)
+    orch = LoaderOrchestrator(default_loader=loader)
+
+    result = orch.load_all(IDS, max_workers=3)
+
+    assert list(result.keys()) == IDS
+    assert [df["id"][0] for df in result.values()] == [i.value for i in IDS]
+    assert len(loader.threads) == 3
+
+
+def test_load_all_isolates_failures():
+    loader = SlowLoader(delay=0.0, failing=[DatasetId.AIRUP_SONT_A])
+    orch = LoaderOrchestrator(default_loader=loader)
+
+    result = orch.load_all(IDS, max_workers=3, raise_on_error=False)
+    assert list(result.keys()) == [DatasetId.LUBW_MINUTE, DatasetId.AIRUP_SONT_C]
+    assert isinstance(orch.last_errors[DatasetId.AIRUP_SONT_A], FileNotFoundError)
+
+    with pytest.raises(FileNotFoundError):
+        orch.load_all(IDS, max_workers=3)
+
+
+def test_load_all_sequential_fails_fast():
+    loader = SlowLoader(delay=0.0, failing=[DatasetId.LUBW_MINUTE])
+    calls = []
+    original = loader.load_dataset
+    loader.load_dataset = lambda ds_id: calls.append(ds_id) or original(ds_id)
+    orch = LoaderOrchestrator(default_loader=loader)
+
+    with pytest.raises(FileNotFoundError):
+        orch.load_all(IDS)
+
+    # the first failure stops loading and is recorded before raising
+    assert calls == [DatasetId.LUBW_MINUTE]
+    assert list(orch.last_errors) == [DatasetId.LUBW_MINUTE]
+
+    result = orch.load_all(IDS, raise_on_error=False)
+    assert calls == [DatasetId.LUBW_MINUTE] + IDS
+    assert list(result) == IDS[1:]
+
+
+def test_load_all_rejects_unknown_backend():
+    orch = LoaderOrchestrator(default_loader=SlowLoader(delay=0.0))
+    with pytest.raises(ValueError):
+        orch.load_all(IDS, max_workers=2, backend="gpu")
+
+
+def test_load_all_process_backend(tmp_path: Path, patched_registry):
+    test_file = tmp_path / "file.csv"
+    test_file.write_text("timestamp,station_id,value\n2020-01-01 00:00:00,1,10\n")
+
+    for ds_id in (DatasetId.AIR_QUALITY_RAW, DatasetId.WEATHER_RAW):
+        patched_registry[ds_id] = patched_registry[ds_id].__class__(
+            dataset_id=ds_id,
+            relative_path=test_file.relative_to(tmp_path),
+            parse_dates=["timestamp"],
+            rename_columns={},
+            required_columns=["timestamp", "station_id"],
+            dtypes=None,
+        )
+
+    orch = LoaderOrchestrator(default_loader=CsvDatasetLoader(tmp_path, registry=patched_registry))
+    result = orch.load_all(
+        [DatasetId.WEATHER_RAW, DatasetId.AIR_QUALITY_RAW],
+        max_workers=2,
+        backend="process",
+    )
+
+    assert list(result.keys()) == [DatasetId.WEATHER_RAW, DatasetId.AIR_QUALITY_RAW]
+    assert all(df.height == 1 for df in result.values())
@@ -0,0 +1,165 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import time
+from pathlib import Path
+import polars as pl
+import pytest
+from core.loaders.airup_dataset_loader import AirUpDatasetLoader
+from core.loaders.dataset_ids import DatasetId
+from core.loaders.loader_orchestrator import LoaderOrchestrator
+from core.pipeline.phase_cache import PhaseCache, preprocessor_fingerprint
+from core.pipeline.pipeline_orchestrator import PipelineOrchestrator, PipelinePhase
+from core.preprocessing.airup_sensor_preprocessor import AirUpSensorPreprocessor
+
+HEADER = "pm1,pm25,pm10,sht_humid,sht_temp,CO,NO,NO2,O3,timestamp_hr\n"
+PHASES = [PipelinePhase.LOADING, PipelinePhase.PREPROCESSING]
+
+
+class CountingLoader(AirUpDatasetLoader):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scans = 0
+
+    def scan_dataset(self, dataset_id, columns=None):
+        self.scans += 1
+        return super().scan_dataset(dataset_id, columns)
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, patched_registry):
+    data_dir = tmp_path / "sont_a"
+    data_dir.mkdir()
+    (data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13").write_text(
+        HEADER
+        + "1.0,2.0,3.0,40,20,1,2,3,4,2024-11-13 08:00:00\n"
+        + "1.1,2.1,3.1,140,21,1,2,3,4,2024-11-13 08:01:00\n"
+    )
+    patched_registry[DatasetId.AIRUP_SONT_A] = patched_registry[DatasetId.AIRUP_SONT_A].__class__(
+        dataset_id=DatasetId.AIRUP_SONT_A,
+        relative_path=data_dir.relative_to(tmp_path),
+        parse_dates=[],
+        rename_columns={},
+        required_columns=["timestamp_hr", "pm10"],
+        dtypes=None,
+    )
+    return data_dir
+
+
+def _pipeline(tmp_path, registry, preprocessor=None):
+    loader = CountingLoader(tmp_path, registry=registry)
+    pipeline = PipelineOrchestrator(
+        LoaderOrchestrator(default_loader=loader),
+        preprocessor_registry={DatasetId.AIRUP_SONT_A: preprocessor or AirUpSensorPreprocessor()},
+        phase_cache=PhaseCache(tmp_path / "phases"),
+    )
+    return pipeline, loader
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_second_run_is_served_from_cache(tmp_path, patched_registry, data_dir, lazy):
+    pipeline, loader = _pipeline(tmp_path, patched_registry)
+
+    first = pipeline.run(DatasetId.AIRUP_SONT_A, phases=PHASES, lazy=lazy)
+    second = pipeline.run(DatasetId.AIRUP_SONT_A, phases=PHASES, lazy=lazy)
+
+    assert loader.scans == 1
+    assert second.preprocessed.equals(first.preprocessed)
+    if not lazy:
+        assert second.raw_loaded.equals(first.raw_loaded)
+
+
+def test_changed_source_or_preprocessor_misses(tmp_path, patched_registry, data_dir):
+    pipeline, loader = _pipeline(tmp_path, patched_registry)
+    pipeline.run(DatasetId.AIRUP_SONT_A, phases=PHASES, lazy=True)
+
+    (data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-14").write_text(
+        HEADER + "1.2,2.2,3.2,42,22,1,2,3,4,2024-11-14 08:00:00\n"
+    )
+    out = pipeline.run(DatasetId.AIRUP_SONT_A, phases=PHASES, lazy=True)
+    assert loader.scans == 2
+    assert out.preprocessed.height == 2
+
+    berlin, loader = _pipeline(tmp_path, patched_registry, AirUpSensorPreprocessor(timezone="Europe/Berlin"))
+    berlin.run(DatasetId.AIRUP_SONT_A, phases=PHASES, lazy=True)
+    assert loader.scans == 1
+
+
+def test_preprocessor_fingerprint_tracks_settings():
+    assert preprocessor_fingerprint(AirUpSensorPreprocessor()) == preprocessor_fingerprint(AirUpSensorPreprocessor())
+    assert preprocessor_fingerprint(AirUpSensorPreprocessor()) != preprocessor_fingerprint(
+        AirUpSensorPreprocessor(timezone="UTC")
+    )
+
+
+class Threshold:
+    # default repr, which holds the memory address
+    def __init__(self, value):
+        self.value = value
+
+
+class ThresholdPreprocessor(AirUpSensorPreprocessor):
+    def __init__(self, value):
+        super().__init__()
+        self._threshold = Threshold(value)
+
+
+def test_preprocessor_fingerprint_ignores_object_addresses():
+    assert preprocessor_fingerprint(ThresholdPreprocessor(1)) == preprocessor_fingerprint(ThresholdPreprocessor(1))
+    assert preprocessor_fingerprint(ThresholdPreprocessor(1)) != preprocessor_fingerprint(ThresholdPreprocessor(2))
+
+
+def test_preprocessor_fingerprint_tracks_system_timezone(monkeypatch):
+    pre = AirUpSensorPreprocessor()
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    utc = preprocessor_fingerprint(pre)
+
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    try:
+        assert preprocessor_fingerprint(pre) != utc
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    df = pl.DataFrame({"x": list(range(1000))})
+    probe = PhaseCache(tmp_path / "probe")
+    probe.put("probe", df)
+    entry_size = probe.size_bytes()
+
+    cache = PhaseCache(tmp_path / "lru", max_bytes=2 * entry_size)
+    cache.put("a", df)
+    cache.put("b", df)
+    # make "a" the most recently used entry
+    os.utime(cache.root / "b.arrow", ns=(1, 1))
+    assert cache.get("a") is not None
+
+    cache.put("c", df)
+
+    assert cache.get("b") is None
+    assert cache.get("a").equals(df)
+    assert cache.get("c").equals(df)
+    assert cache.size_bytes() <= 2 * entry_size
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_oversized_results_are_not_cached(tmp_path):
+    cache = PhaseCache(tmp_path, max_bytes=10)
+    cache.put("big", pl.DataFrame({"x": list(range(1000))}))
+    assert cache.get("big") is None
+
+
+def test_hit_and_miss_counters_are_thread_safe(tmp_path):
+    cache = PhaseCache(tmp_path / "cache")
+    cache.put("a", pl.DataFrame({"x": [1]}))
+
+    def lookups(_):
+        for key in ("a", "missing") * 50:
+            cache.get(key)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lookups, range(8)))
+
+    assert (cache.hits, cache.misses) == (400, 400)
@@ -0,0 +1,46 @@
+import polars as pl
+import pytest
+from core.calibration.CalibrationEngine import CalibrationEngine, CalibrationSpec
+from core.interfaces.IDataPreprocessor import IDataPreprocessor
+from core.loaders.dataset_ids import DatasetId
+from core.pipeline.pipeline_orchestrator import PipelineOrchestrator, PipelinePhase
+
+
+class StaticLoader:
+    def __init__(self, df):
+        self._df = df
+
+    def load(self, dataset_id):
+        return self._df
+
+
+class IdentityPreprocessor(IDataPreprocessor):
+    def preprocess(self, df):
+        return df
+
+
+def _pipeline(engine=None):
+    df = pl.DataFrame({"pm10": [1.0, 2.0, 3.0]})
+    return PipelineOrchestrator(
+        StaticLoader(df),
+        preprocessor_registry={DatasetId.AIRUP_SONT_A: IdentityPreprocessor()},
+        calibration_engine=engine,
+    )
+
+
+PHASES = [PipelinePhase.LOADING, PipelinePhase.PREPROCESSING, PipelinePhase.CALIBRATION]
+
+
+def test_calibration_phase_adds_calibrated_columns():
+    engine = CalibrationEngine([CalibrationSpec("pm10", "pm10_ref")])
+    engine.fit(pl.DataFrame({"pm10": [1.0, 2.0, 3.0], "pm10_ref": [3.0, 5.0, 7.0]}))
+
+    result = _pipeline(engine).run(DatasetId.AIRUP_SONT_A, phases=PHASES)
+
+    assert result.calibrated["pm10_calibrated"].to_list() == pytest.approx([3.0, 5.0, 7.0])
+    assert "pm10_calibrated" not in result.preprocessed.columns
+
+
+def test_calibration_phase_requires_engine():
+    with pytest.raises(RuntimeError):
+        _pipeline().run(DatasetId.AIRUP_SONT_A, phases=PHASES)
@@ -0,0 +1,123 @@
+import threading
+import time
+import polars as pl
+import pytest
+from core.interfaces.IDataPreprocessor import IDataPreprocessor
+from core.loaders.dataset_ids import DatasetId
+from core.pipeline.pipeline_dag import DagTask, PipelineDag, UpstreamFailedError
+from core.pipeline.pipeline_orchestrator import PipelineOrchestrator, PipelinePhase
+
+
+def test_order_respects_dependencies_and_detects_cycles():
+    dag = PipelineDag([
+        DagTask("c", lambda a, b: a + b, depends_on=("a", "b")),
+        DagTask("a", lambda: 1),
+        DagTask("b", lambda a: a + 1, depends_on=("a",)),
+    ])
+    assert dag.order() == ["a", "b", "c"]
+    assert dag.execute() == {"a": 1, "b": 2, "c": 3}
+
+    with pytest.raises(ValueError, match="cycle"):
+        PipelineDag([DagTask("x", lambda y: y, ("y",)), DagTask("y", lambda x: x, ("x",))]).order()
+    with pytest.raises(ValueError, match="unknown"):
+        PipelineDag([DagTask("x", lambda y: y, ("y",))]).order()
+    with pytest.raises(ValueError, match="Duplicate"):
+        PipelineDag([DagTask("x", lambda: 1), DagTask("x", lambda: 2)])
+
+
+def test_shared_upstream_runs_once_and_branches_overlap():
+    calls = []
+    barrier = threading.Barrier(2, timeout=5)
+
+    def shared():
+        calls.append("shared")
+        return 1
+
+    def branch(value):
+        # both branches must be running at the same time to pass the barrier
+        barrier.wait()
+        return value
+
+    dag = PipelineDag([
+        DagTask("shared", shared),
+        DagTask("left", branch, ("shared",)),
+        DagTask("right", branch, ("shared",)),
+        DagTask("join", lambda left, right: left + right, ("left", "right")),
+    ])
+    assert dag.execute(max_workers=2)["join"] == 2
+    assert calls == ["shared"]
+
+
+def test_failure_skips_dependents_but_not_independent_branches():
+    def boom():
+        raise OSError("disk gone")
+
+    dag = PipelineDag([
+        DagTask("bad", boom),
+        DagTask("after_bad", lambda x: x, ("bad",)),
+        DagTask("good", lambda: "ok"),
+    ])
+    results = dag.execute(max_workers=2, raise_on_error=False)
+
+    assert results == {"good": "ok"}
+    assert isinstance(dag.last_errors["bad"], OSError)
+    assert isinstance(dag.last_errors["after_bad"], UpstreamFailedError)
+
+    with pytest.raises(OSError):
+        dag.execute()
+
+
+class FrameLoader:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.loads = []
+
+    def load(self, dataset_id):
+        self.loads.append(dataset_id)
+        time.sleep(self.delay)
+        return pl.DataFrame({"value": [1.0, 2.0]})
+
+
+class IdentityPreprocessor(IDataPreprocessor):
+    def preprocess(self, df):
+        return df
+
+
+def test_run_many_with_cross_dataset_task():
+    loader = FrameLoader()
+    pipeline = PipelineOrchestrator(
+        loader,
+        preprocessor_registry={
+            DatasetId.LUBW_MINUTE: IdentityPreprocessor(),
+            DatasetId.AIRUP_SONT_A: IdentityPreprocessor(),
+        },
+    )
+    pair = DagTask(
+        "pair",
+        lambda lubw, sont_a: lubw.preprocessed.height + sont_a.preprocessed.height,
+        depends_on=(DatasetId.LUBW_MINUTE.value, DatasetId.AIRUP_SONT_A.value),
+    )
+
+    results = pipeline.run_many(
+        [DatasetId.LUBW_MINUTE, DatasetId.AIRUP_SONT_A],
+        phases=[PipelinePhase.LOADING, PipelinePhase.PREPROCESSING],
+        tasks=[pair],
+        max_workers=2,
+    )
+
+    assert results["pair"] == 4
+    assert results[DatasetId.LUBW_MINUTE].preprocessed["value"].to_list() == [1.0, 2.0]
+    assert sorted(loader.loads) == sorted([DatasetId.LUBW_MINUTE, DatasetId.AIRUP_SONT_A])
+    assert pipeline.last_errors == {}
+
+
+def test_run_many_reports_failures_per_dataset():
+    pipeline = PipelineOrchestrator(FrameLoader(), preprocessor_registry={})
+    results = pipeline.run_many(
+        [DatasetId.LUBW_MINUTE],
+        phases=[PipelinePhase.LOADING, PipelinePhase.PREPROCESSING],
+        raise_on_error=False,
+    )
+
+    assert results == {}
+    assert isinstance(pipeline.last_errors[DatasetId.LUBW_MINUTE], ValueError)
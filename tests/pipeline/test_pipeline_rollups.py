@@ -0,0 +1,109 @@
+from dataclasses import replace
+from pathlib import Path
+import polars as pl
+import pytest
+from core.loaders.airup_dataset_loader import AirUpDatasetLoader
+from core.loaders.dataset_ids import DatasetId
+from core.loaders.loader_orchestrator import LoaderOrchestrator
+from core.pipeline.pipeline_orchestrator import PipelineOrchestrator
+from core.preprocessing.airup_sensor_preprocessor import AirUpSensorPreprocessor
+from core.preprocessing.resampler import Resampler
+from core.preprocessing.rollup_store import RollupStore
+
+HEADER = "pm1,pm25,pm10,sht_humid,sht_temp,CO,NO,NO2,O3,timestamp_hr\n"
+
+
+class CountingLoader(AirUpDatasetLoader):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scans = 0
+
+    def scan_dataset(self, dataset_id, columns=None):
+        self.scans += 1
+        return super().scan_dataset(dataset_id, columns)
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, patched_registry):
+    data_dir = tmp_path / "sont_a"
+    data_dir.mkdir()
+    (data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-13").write_text(
+        HEADER
+        + "1.0,2.0,3.0,40,20,1,2,3,4,2024-11-13 08:00:00\n"
+        + "1.0,2.0,5.0,40,20,1,2,3,4,2024-11-13 08:09:00\n"
+        + "1.0,2.0,7.0,40,20,1,2,3,4,2024-11-13 08:10:00\n"
+    )
+    patched_registry[DatasetId.AIRUP_SONT_A] = patched_registry[DatasetId.AIRUP_SONT_A].__class__(
+        dataset_id=DatasetId.AIRUP_SONT_A,
+        relative_path=data_dir.relative_to(tmp_path),
+        parse_dates=[],
+        rename_columns={},
+        required_columns=["timestamp_hr", "pm10"],
+        dtypes=None,
+    )
+    return data_dir
+
+
+def _pipeline(tmp_path, registry, store):
+    loader = CountingLoader(tmp_path, registry=registry)
+    pipeline = PipelineOrchestrator(
+        LoaderOrchestrator(default_loader=loader),
+        preprocessor_registry={DatasetId.AIRUP_SONT_A: AirUpSensorPreprocessor()},
+        rollup_store=store,
+    )
+    return pipeline, loader
+
+
+RESAMPLERS = [Resampler("10m"), Resampler("1h")]
+
+
+def test_rollups_are_built_once_and_then_read(tmp_path, patched_registry, data_dir):
+    store = RollupStore(tmp_path / "cache")
+    pipeline, loader = _pipeline(tmp_path, patched_registry, store)
+
+    first = pipeline.rollups(DatasetId.AIRUP_SONT_A, RESAMPLERS)
+    assert loader.scans == 1
+    assert first["10m"]["pm10"].to_list() == [4.0, 7.0]
+    assert first["1h"]["pm10"].to_list() == [5.0]
+    assert store.resolutions(DatasetId.AIRUP_SONT_A) == ["10m", "1h"]
+
+    second = pipeline.rollups(DatasetId.AIRUP_SONT_A, RESAMPLERS)
+    assert loader.scans == 1
+    assert second["10m"].equals(first["10m"])
+
+
+def test_changed_source_rebuilds_rollup(tmp_path, patched_registry, data_dir):
+    store = RollupStore(tmp_path / "cache")
+    pipeline, loader = _pipeline(tmp_path, patched_registry, store)
+    pipeline.rollups(DatasetId.AIRUP_SONT_A, [Resampler("1h")])
+
+    (data_dir / "airup_sont_a_avg_every_minute_data.log.2024-11-14").write_text(
+        HEADER + "1.0,2.0,9.0,40,20,1,2,3,4,2024-11-14 08:00:00\n"
+    )
+    out = pipeline.rollups(DatasetId.AIRUP_SONT_A, [Resampler("1h")])
+
+    assert loader.scans == 2
+    assert out["1h"]["pm10"].to_list() == [5.0, 9.0]
+    assert len(list(store.directory(DatasetId.AIRUP_SONT_A).iterdir())) == 1
+
+
+def test_without_store_rollups_are_computed(tmp_path, patched_registry, data_dir):
+    pipeline, loader = _pipeline(tmp_path, patched_registry, None)
+
+    out = pipeline.rollups(DatasetId.AIRUP_SONT_A, RESAMPLERS)
+    assert loader.scans == 1
+    assert out["10m"]["n_samples"].to_list() == [2, 1]
+
+
+def test_changed_dataset_config_rebuilds_rollup(tmp_path, patched_registry, data_dir):
+    store = RollupStore(tmp_path / "cache")
+    pipeline, _ = _pipeline(tmp_path, patched_registry, store)
+    pipeline.rollups(DatasetId.AIRUP_SONT_A, [Resampler("1h")])
+
+    config = patched_registry[DatasetId.AIRUP_SONT_A]
+    patched_registry[DatasetId.AIRUP_SONT_A] = replace(config, dtypes={"pm10": pl.Float32})
+    pipeline, loader = _pipeline(tmp_path, patched_registry, store)
+    pipeline.rollups(DatasetId.AIRUP_SONT_A, [Resampler("1h")])
+
+    assert loader.scans == 1
+    assert len(list(store.directory(DatasetId.AIRUP_SONT_A).iterdir())) == 1
@@ -1,4 +1,7 @@
+from datetime import datetime
+import time
 import polars as pl
+import pytest
 from core.preprocessing.airup_sensor_preprocessor import AirUpSensorPreprocessor
 
 def test_airup_timestamp_handling():
@@ -12,3 +15,70 @@ def test_airup_timestamp_handling():
 
     assert "timestamp" in out.columns
     assert out["timestamp"].dtype == pl.Datetime
+
+
+@pytest.fixture
+def berlin_local_time(monkeypatch):
+    # run with a DST zone as system local time so the local offsets are non-trivial
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+# around the 2024-03-31 spring-forward switch, plus a fractional second and a missing fix
+GPS = [1711843200.0, 1711845000.0, 1711846800.0, 1711846800.25, 1731484800.0, None]
+
+
+def test_gps_default_matches_fromtimestamp(berlin_local_time):
+    out = AirUpSensorPreprocessor().preprocess(pl.DataFrame({"timestamp_gps": GPS}))
+
+    expected = [None if s is None else datetime.fromtimestamp(s) for s in GPS]
+    assert out["timestamp"].to_list() == expected
+
+
+def test_gps_explicit_timezones():
+    df = pl.DataFrame({"timestamp_gps": GPS[:3]})
+
+    utc = AirUpSensorPreprocessor(timezone="UTC").preprocess(df)
+    berlin = AirUpSensorPreprocessor(timezone="Europe/Berlin").preprocess(df)
+
+    assert utc["timestamp"].to_list() == [
+        datetime(2024, 3, 31, 0, 0), datetime(2024, 3, 31, 0, 30), datetime(2024, 3, 31, 1, 0),
+    ]
+    assert berlin["timestamp"].to_list() == [
+        datetime(2024, 3, 31, 1, 0), datetime(2024, 3, 31, 1, 30), datetime(2024, 3, 31, 3, 0),
+    ]
+
+
+def test_gps_conversion_on_lazy_plan(berlin_local_time):
+    df = pl.DataFrame({"timestamp_gps": GPS})
+    pre = AirUpSensorPreprocessor()
+
+    assert pre.preprocess(df.lazy()).collect().equals(pre.preprocess(df))
+
+
+def test_unknown_timezone_is_rejected():
+    with pytest.raises(ValueError):
+        AirUpSensorPreprocessor(timezone="Mars/Olympus")
+
+
+@pytest.fixture
+def posix_rule_local_time(monkeypatch):
+    # a POSIX TZ rule has no IANA name, the offsets then come from the python lookup
+    monkeypatch.setenv("TZ", "CET-1CEST,M3.5.0,M10.5.0/3")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_gps_unnamed_local_zone_matches_fromtimestamp_and_streams(posix_rule_local_time):
+    df = pl.DataFrame({"timestamp_gps": GPS})
+    pre = AirUpSensorPreprocessor()
+
+    expected = [None if s is None else datetime.fromtimestamp(s) for s in GPS]
+    assert pre.preprocess(df)["timestamp"].to_list() == expected
+    streamed = pre.preprocess(df.lazy()).collect(engine="streaming")
+    assert streamed["timestamp"].to_list() == expected
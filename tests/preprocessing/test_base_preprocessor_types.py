@@ -1,4 +1,5 @@
 import polars as pl
+import pytest
 from core.preprocessing.base_preprocessor import BasePreprocessor
 
 def test_all_steps_return_df():
@@ -6,3 +7,17 @@ def test_all_steps_return_df():
     bp = BasePreprocessor()
     out = bp.preprocess(df)
     assert isinstance(out, pl.DataFrame)
+
+
+def test_lazy_input_stays_lazy():
+    lf = pl.DataFrame({"a": [1]}).lazy()
+    out = BasePreprocessor().preprocess(lf)
+    assert isinstance(out, pl.LazyFrame)
+    assert out.collect().equals(lf.collect())
+
+
+def test_step_collecting_a_lazy_plan_is_rejected():
+    bp = BasePreprocessor()
+    bp._steps = [lambda df: df.collect()]
+    with pytest.raises(TypeError):
+        bp.preprocess(pl.DataFrame({"a": [1]}).lazy())
@@ -1,5 +1,8 @@
 import polars as pl
+from core.loaders.dataset_ids import DatasetId
 from core.preprocessing.lubw_minute_preprocessor import LUBWMinutePreprocessor
+from core.preprocessing.preprocessing_config import PREPROCESSOR_REGISTRY
+from core.preprocessing.range_rules import RangeRule
 
 def test_lubw_negative_values_filtered():
     df = pl.DataFrame({
@@ -12,3 +15,38 @@ def test_lubw_negative_values_filtered():
     out = pre.preprocess(df)
 
     assert out.height == 0
+
+
+def test_lubw_range_rules_from_config():
+    df = pl.DataFrame({
+        "timestamp": ["2024-01-01 12:00:00"] * 4,
+        "TEMP": [-5.0, 20.0, 75.0, 1.0],
+        "RLF": [50, 101, 50, 50],
+        "WIV": ["1.5", "2.0", "2.0", None],
+    })
+
+    pre = LUBWMinutePreprocessor(
+        range_rules={
+            "TEMP": RangeRule(min=-50.0, max=60.0),
+            "RLF": RangeRule(min=0.0, max=100.0),
+            "WIV": RangeRule(nullable=True),
+        }
+    )
+    out = pre.preprocess(df)
+
+    # row 2 breaks the RLF max, row 3 the TEMP max; the missing WIV is allowed
+    assert out["TEMP"].to_list() == [-5.0, 1.0]
+    assert out["WIV"].to_list() == [1.5, None]
+    assert out.schema["RLF"] == pl.Float64
+
+
+def test_lubw_registry_keeps_negative_temperatures():
+    df = pl.DataFrame({
+        "timestamp": ["2024-01-01 12:00:00"],
+        "NO2": [10.0],
+        "TEMP": [-3.5],
+    })
+
+    out = PREPROCESSOR_REGISTRY[DatasetId.LUBW_MINUTE].preprocess(df)
+
+    assert out["TEMP"].to_list() == [-3.5]
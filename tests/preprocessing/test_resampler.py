@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+import polars as pl
+import pytest
+from core.preprocessing.resampler import Resampler
+
+
+def _minute_frame():
+    start = datetime(2024, 11, 20, 8, 0)
+    return pl.DataFrame({
+        "timestamp": [None if m is None else start + timedelta(minutes=m) for m in [0, 5, 12, 3, 25, None]],
+        "station": ["A", "A", "A", "B", "B", "B"],
+        "pm10": [1.0, 3.0, 5.0, 10.0, 20.0, 99.0],
+        "status": ["ok"] * 6,
+    }, schema_overrides={"timestamp": pl.Datetime("us")})
+
+
+def test_mean_per_bucket_labelled_by_start():
+    out = Resampler("10m").resample(_minute_frame().drop("station"))
+
+    assert out.columns == ["timestamp", "n_samples", "pm10"]
+    assert out["timestamp"].to_list() == [datetime(2024, 11, 20, 8, m) for m in (0, 10, 20)]
+    assert out["pm10"].to_list() == pytest.approx([14 / 3, 5.0, 20.0])
+    assert out["n_samples"].to_list() == [3, 1, 1]
+
+
+def test_grouped_and_multiple_aggregations_lazy():
+    resampler = Resampler("1h", aggregations={"pm10": ["min", "max"]}, group_by=["station"])
+    out = resampler.resample(_minute_frame().lazy()).collect()
+
+    assert out.columns == ["station", "timestamp", "n_samples", "pm10_min", "pm10_max"]
+    assert out.rows() == [
+        ("A", datetime(2024, 11, 20, 8), 3, 1.0, 5.0),
+        ("B", datetime(2024, 11, 20, 8), 2, 10.0, 20.0),
+    ]
+
+
+def test_key_identifies_the_spec():
+    assert Resampler("1h").key == Resampler("1h").key
+    assert Resampler("1h").key != Resampler("1d").key
+    assert Resampler("1h", aggregations={"pm10": ["max"]}).key != Resampler("1h").key
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        Resampler("1h", default_aggregations=("mode",))
+    with pytest.raises(ValueError):
+        Resampler("1h", aggregations={"pm10": []})
+    with pytest.raises(TypeError):
+        Resampler("1h").resample(pl.DataFrame({"timestamp": ["2024-11-20"], "pm10": [1.0]}))
@@ -0,0 +1,108 @@
+from datetime import datetime
+import polars as pl
+import pytest
+from core.preprocessing.synthetic_air_quality_preprocessor import SyntheticAirQualityPreprocessor
+from core.preprocessing.utils.time_utils import (
+    DATETIME_FORMAT,
+    EPOCH_FORMATS,
+    detect_timestamp_format,
+    parse_timestamp,
+    parse_timestamp_column,
+    resolve_timestamp_format,
+)
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (["2024-11-13 08:00:00", None, "2024-11-13 08:01:00"], "%Y-%m-%d %H:%M:%S"),
+        (["2024-11-13 08:00:00.250", "2024-11-13 08:01:00"], "%Y-%m-%d %H:%M:%S%.f"),
+        (["2024-11-13T08:00:00"], "%Y-%m-%dT%H:%M:%S"),
+        (["13.11.2024 08:00"], "%d.%m.%Y %H:%M"),
+        ([1731484800, 1731484860], "epoch_s"),
+        (["1731484800000"], "epoch_ms"),
+        ([datetime(2024, 11, 13)], DATETIME_FORMAT),
+        (["2024-11-13 08:00:00", "yesterday"], None),
+        ([None, None], None),
+    ],
+)
+def test_detect_timestamp_format(values, expected):
+    assert detect_timestamp_format(pl.Series("ts", values)) == expected
+
+
+def test_parse_timestamp_with_detected_format():
+    df = pl.DataFrame({"ts": ["2024-11-13 08:00:00", "garbage"], "epoch": [1731484800, None]})
+
+    out = df.select(
+        parse_timestamp(pl.col("ts"), "%Y-%m-%d %H:%M:%S"),
+        parse_timestamp(pl.col("epoch"), "epoch_s"),
+    )
+
+    assert out["ts"].to_list() == [datetime(2024, 11, 13, 8), None]
+    assert out["epoch"].to_list() == [datetime(2024, 11, 13, 8), None]
+
+
+def test_resolve_detects_once_and_samples_lazy_frames():
+    formats = {}
+    lf = pl.DataFrame({"ts": [None, "2024-11-13 08:00:00"]}).lazy()
+
+    assert resolve_timestamp_format(lf, "ts", formats) == "%Y-%m-%d %H:%M:%S"
+    assert formats == {"ts": "%Y-%m-%d %H:%M:%S"}
+
+    # cached, kept while it fits the sample of the next frame
+    other = pl.DataFrame({"ts": ["2024-11-14 09:30:00"]})
+    assert resolve_timestamp_format(other, "ts", formats) == "%Y-%m-%d %H:%M:%S"
+
+
+def test_stale_cached_format_is_detected_again(caplog):
+    formats = {"ts": "%Y-%m-%d %H:%M:%S"}
+    df = pl.DataFrame({"ts": [1731484800]})
+
+    assert resolve_timestamp_format(df, "ts", formats) == "epoch_s"
+    assert formats == {"ts": "epoch_s"}
+    assert "does not fit column 'ts' anymore" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["1731484800", "1731488400"],
+        ["1731484800000", "1731488400000"],
+        [1731484800, 1731488400],
+    ],
+)
+def test_epochs_parse_the_same_with_and_without_detected_format(values):
+    df = pl.DataFrame({"ts": values})
+    fmt = detect_timestamp_format(df["ts"])
+    expected = [datetime(2024, 11, 13, 8), datetime(2024, 11, 13, 9)]
+
+    assert fmt in EPOCH_FORMATS
+    assert df.select(parse_timestamp(pl.col("ts"), fmt))["ts"].to_list() == expected
+    if df["ts"].dtype == pl.String:
+        # the inference fallback only applies to strings
+        assert df.select(parse_timestamp(pl.col("ts")))["ts"].to_list() == expected
+
+
+def test_rows_outside_the_detected_format_are_not_nulled(caplog):
+    # the sample only sees the first format, the rest of the column uses another one
+    values = ["2024-11-13 08:00:00"] * 1_000 + ["2024-11-13 09:00:00.500", None]
+    df = pl.DataFrame({"ts": values})
+
+    out = df.select(parse_timestamp_column(df, "ts", {}).alias("ts"))
+
+    assert out["ts"].null_count() == 1
+    assert out["ts"][1_000] == datetime(2024, 11, 13, 9, 0, 0, 500_000)
+    assert "1 values of column 'ts' do not match" in caplog.text
+
+
+def test_preprocessor_keeps_formats_per_instance():
+    pre = SyntheticAirQualityPreprocessor()
+
+    out = pre.preprocess(pl.DataFrame({"timestamp": ["2021-01-01 00:00:00"]}))
+    assert out["timestamp"].to_list() == [datetime(2021, 1, 1)]
+    assert pre._timestamp_formats == {"timestamp": "%Y-%m-%d %H:%M:%S"}
+    assert SyntheticAirQualityPreprocessor()._timestamp_formats == {}
+
+    # a later file in another format still parses
+    out = pre.preprocess(pl.DataFrame({"timestamp": ["01.01.2021 01:00"]}))
+    assert out["timestamp"].to_list() == [datetime(2021, 1, 1, 1)]
@@ -0,0 +1,97 @@
+from dataclasses import replace
+from datetime import date, timedelta
+import polars as pl
+import pytest
+from core.loaders.airup_dataset_loader import AirUpDatasetLoader
+from core.loaders.csv_dataset_loader import CsvDatasetLoader
+from core.loaders.dataset_ids import DatasetId
+from core.preprocessing.preprocessing_config import PREPROCESSOR_REGISTRY
+from core.synthetic.heilbronn_generator import (
+    ANOMALY_COLUMN,
+    HeilbronnDataGenerator,
+    SyntheticScale,
+)
+
+SMALL = SyntheticScale(
+    stations=2,
+    start=date(2021, 1, 1),
+    end=date(2021, 3, 1),
+    campaign_start=date(2024, 11, 15),
+    campaign_end=date(2024, 11, 17),
+    chunk_days=7,
+)
+
+
+def test_rows_cover_stations_times_grid_across_chunks():
+    df = HeilbronnDataGenerator(SMALL).frame(DatasetId.AIR_QUALITY_CALIBRATED)
+
+    assert df.height == 2 * 59 * 24
+    assert df["timestamp"].is_sorted()
+    assert df["timestamp"].unique().sort().diff().drop_nulls().unique().to_list() == [timedelta(hours=1)]
+    assert df["station_id"].unique().sort().to_list() == ["HN-AQ-001", "HN-AQ-002"]
+
+
+def test_same_seed_is_deterministic_and_raw_shares_the_signal():
+    raw = HeilbronnDataGenerator(SMALL).frame(DatasetId.AIR_QUALITY_RAW)
+    again = HeilbronnDataGenerator(SMALL).frame(DatasetId.AIR_QUALITY_RAW)
+    calibrated = HeilbronnDataGenerator(SMALL).frame(DatasetId.AIR_QUALITY_CALIBRATED)
+
+    assert raw.equals(again)
+    assert raw.select("timestamp", "station_id").equals(calibrated.select("timestamp", "station_id"))
+
+    clean = raw.filter(~pl.col(ANOMALY_COLUMN))
+    ratio = (clean["no2"] / calibrated.filter(~raw[ANOMALY_COLUMN])["no2"]).median()
+    assert ratio == pytest.approx(1.0, abs=0.05)
+
+
+def test_anomalies_are_injected_at_the_configured_rate():
+    scale = replace(SMALL, anomaly_rate=0.02)
+    raw = HeilbronnDataGenerator(scale).frame(DatasetId.NOISE_RAW)
+
+    share = raw[ANOMALY_COLUMN].mean()
+    # two columns, each hit at ~2%
+    assert 0.02 < share < 0.06
+    assert raw["laeq_db"].null_count() > 0
+
+
+def test_diurnal_and_seasonal_patterns():
+    scale = SyntheticScale(stations=3, start=date(2021, 1, 1), end=date(2022, 1, 1))
+    aq = HeilbronnDataGenerator(scale).frame(DatasetId.AIR_QUALITY_CALIBRATED)
+    hour = pl.col("timestamp").dt.hour()
+    month = pl.col("timestamp").dt.month()
+
+    assert aq.filter(hour == 8)["no2"].mean() > 1.5 * aq.filter(hour == 3)["no2"].mean()
+    assert aq.filter(month == 1)["pm10"].mean() > aq.filter(month == 7)["pm10"].mean()
+    assert aq.filter(month == 7)["o3"].mean() > aq.filter(month == 1)["o3"].mean()
+
+
+def test_written_files_load_and_preprocess(tmp_path):
+    generator = HeilbronnDataGenerator(SMALL)
+    written = generator.write(tmp_path)
+
+    assert set(written) == set(generator.dataset_ids())
+    csv_loader = CsvDatasetLoader(tmp_path)
+    airup_loader = AirUpDatasetLoader(tmp_path)
+
+    for dataset_id in written:
+        airup = dataset_id in (DatasetId.AIRUP_SONT_A, DatasetId.AIRUP_SONT_C)
+        df = (airup_loader if airup else csv_loader).load_dataset(dataset_id)
+        out = PREPROCESSOR_REGISTRY[dataset_id].preprocess(df)
+        assert out.height > 0
+        assert out["timestamp"].dtype == pl.Datetime
+
+
+def test_write_refuses_to_replace_existing_data(tmp_path):
+    generator = HeilbronnDataGenerator(SMALL)
+    generator.write(tmp_path, [DatasetId.LUBW_MINUTE])
+
+    with pytest.raises(FileExistsError):
+        generator.write(tmp_path, [DatasetId.LUBW_MINUTE])
+    generator.write(tmp_path, [DatasetId.LUBW_MINUTE], overwrite=True)
+
+
+def test_invalid_scale_is_rejected():
+    with pytest.raises(ValueError):
+        SyntheticScale(every="1 hour")
+    with pytest.raises(ValueError):
+        SyntheticScale(start=date(2022, 1, 1), end=date(2021, 1, 1))
@@ -0,0 +1,88 @@
+import json
+import polars as pl
+import pytest
+from core import instrumentation
+from core.loaders.dataset_ids import DatasetId
+from core.pipeline.pipeline_orchestrator import PipelineOrchestrator, PipelinePhase
+from core.preprocessing.base_preprocessor import BasePreprocessor
+
+
+class StaticLoader:
+    def __init__(self, df):
+        self._df = df
+
+    def load(self, dataset_id):
+        return self._df
+
+
+class DropNullsPreprocessor(BasePreprocessor):
+    def _handle_missing(self, df):
+        return df.drop_nulls()
+
+
+DATASET = DatasetId.AIRUP_SONT_A.value
+
+
+def _run():
+    df = pl.DataFrame({"pm10": [1.0, None, 3.0, 4.0]})
+    pipeline = PipelineOrchestrator(
+        StaticLoader(df),
+        preprocessor_registry={DatasetId.AIRUP_SONT_A: DropNullsPreprocessor()},
+    )
+    return pipeline.run(DatasetId.AIRUP_SONT_A, phases=[PipelinePhase.LOADING, PipelinePhase.PREPROCESSING])
+
+
+def test_disabled_spans_are_shared_noops():
+    assert not instrumentation.enabled()
+    assert instrumentation.span("a", "b") is instrumentation.span("c", "d")
+
+
+def test_recording_captures_phases_and_steps():
+    with instrumentation.recording() as report:
+        _run()
+
+    assert not instrumentation.enabled()
+    spans = {(s.category, s.name): s for s in report.spans}
+
+    phase = spans[("phase", f"preprocessing:{DATASET}")]
+    assert phase.rows_out == 3
+    assert phase.depth == 0
+
+    step = spans[("preprocess", "DropNullsPreprocessor._handle_missing")]
+    assert (step.rows_in, step.rows_out) == (4, 3)
+    assert step.bytes_in > step.bytes_out > 0
+    assert step.parent == f"phase:preprocessing:{DATASET}"
+    assert step.depth == 1
+    assert step.wall_s >= 0 and step.cpu_s >= 0
+
+
+def test_report_renders_json_and_table():
+    with instrumentation.recording() as report:
+        _run()
+
+    payload = json.loads(report.to_json())
+    assert len(payload["spans"]) == len(report.spans)
+
+    table = report.table()
+    assert f"phase:loading:{DATASET}" in table
+    assert "  preprocess:DropNullsPreprocessor._finalize" in table
+
+
+def test_spans_are_exported_as_json_lines(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    with instrumentation.recording(export_path=path) as report:
+        _run()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == [s.name for s in report.spans]
+
+
+def test_failed_span_records_error():
+    with instrumentation.recording() as report:
+        with pytest.raises(ValueError):
+            with instrumentation.span("boom", "test"):
+                raise ValueError("bad input")
+
+    (span,) = report.spans
+    assert span.error == "ValueError: bad input"
+    assert "test:boom !" in report.table()